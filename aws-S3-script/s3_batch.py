@@ -0,0 +1,360 @@
+"""Runs a manifest of S3 operations without the interactive menu.
+
+    python s3_batch.py jobs.jsonl --results results.jsonl --workers 16
+
+Each manifest line (JSON object or CSV row) has an "op" - create_bucket,
+upload, list, delete_object or delete_bucket - a "bucket" and, depending
+on the operation, "file", "key", "prefix" or "region". One result per
+operation is written as JSON lines, or CSV when the results file ends in
+.csv. The exit code is 1 if any operation failed.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import zlib
+from typing import (IO, Any, Callable, Dict, Iterator, List, Optional,
+                    Tuple)
+
+from s3_operations import (build_transfer_config, create_s3_connection,
+                           delete_bucket, generate_object_name,
+                           get_file_type, get_metadata_index, iter_objects,
+                           log_operation, print_operation_summary,
+                           record_upload, stop_logging, upload_with_retries)
+
+RESULT_FIELDS = ["line", "id", "op", "bucket", "key", "status", "error",
+                 "bytes", "count", "duration_ms"]
+# Operations queued per worker ahead of the one running; bounds memory
+# while the manifest is read
+QUEUE_DEPTH = 64
+# Operation names in the S3 log; delete_bucket logs itself
+LOGGED_AS = {
+    "create_bucket": "create_bucket",
+    "upload": "upload_file",
+    "list": "list_objects",
+    "delete_object": "delete_object",
+}
+
+
+def open_manifest(path: str) -> IO[str]:
+    if path == "-":
+        return sys.stdin
+    return open(path, newline="", encoding="utf-8")
+
+
+def read_manifest(path: str, manifest_format: Optional[str] = None
+                  ) -> Iterator[Tuple[int, Dict[str, Any], Optional[str]]]:
+    """
+    Streams operations from a JSON-lines or CSV manifest, one line at a
+    time, so manifests of any size can be processed.
+
+    Args:
+        path (str): Manifest file, or "-" for stdin
+        manifest_format (Optional[str]): "jsonl" or "csv"; guessed from the
+            file extension when omitted
+
+    Yields:
+        Tuple[int, Dict[str, Any], Optional[str]]: Line number, the
+            operation and a parse error for lines that could not be read
+    """
+    if manifest_format is None:
+        manifest_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+    f = open_manifest(path)
+    try:
+        if manifest_format == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                entry = {name: value for name, value in row.items()
+                         if name and value not in (None, "")}
+                yield reader.line_num, entry, None
+            return
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, {}, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(entry, dict):
+                yield line_no, {}, "Each line must be a JSON object"
+                continue
+            yield line_no, entry, None
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def require(entry: Dict[str, Any], field: str) -> str:
+    value = entry.get(field)
+    if not value:
+        raise ValueError(f"'{field}' is required for {entry.get('op')}")
+    return str(value)
+
+
+def run_create_bucket(entry: Dict[str, Any], result: Dict[str, Any]) -> None:
+    bucket_name = require(entry, "bucket")
+    s3 = create_s3_connection()
+    region = entry.get("region") or s3.meta.region_name
+    options: Dict[str, Any] = {"Bucket": bucket_name}
+    # us-east-1 is the default location and must not be sent explicitly
+    if region and region != "us-east-1":
+        options["CreateBucketConfiguration"] = {"LocationConstraint": region}
+    s3.create_bucket(**options)
+    get_metadata_index().add_bucket(bucket_name)
+
+
+def run_upload(entry: Dict[str, Any], result: Dict[str, Any],
+               transfer_config, max_retries: int) -> None:
+    bucket_name = require(entry, "bucket")
+    file_path = require(entry, "file")
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    object_name = entry.get("key") or generate_object_name(
+        get_file_type(file_path), file_path)
+    result["key"] = object_name
+    error = upload_with_retries(create_s3_connection(), file_path,
+                                bucket_name, object_name, transfer_config,
+                                max_retries)
+    if error is not None:
+        raise error
+    result["bytes"] = os.path.getsize(file_path)
+    record_upload(bucket_name, object_name, result["bytes"])
+
+
+def run_list(entry: Dict[str, Any], result: Dict[str, Any]) -> None:
+    bucket_name = require(entry, "bucket")
+    prefix = entry.get("prefix", "")
+    totals = {"bytes": 0}
+
+    def counted() -> Iterator[Dict[str, Any]]:
+        for item in iter_objects(bucket_name, prefix, include_metadata=True):
+            totals["bytes"] += item["Size"]
+            yield item
+
+    # The listing refreshes the metadata index as it streams past
+    result["count"] = get_metadata_index().refresh_objects(
+        bucket_name, prefix, counted())
+    result["bytes"] = totals["bytes"]
+
+
+def run_delete_object(entry: Dict[str, Any], result: Dict[str, Any]) -> None:
+    bucket_name = require(entry, "bucket")
+    object_key = require(entry, "key")
+    create_s3_connection().delete_object(Bucket=bucket_name, Key=object_key)
+    get_metadata_index().forget_objects(bucket_name, [object_key])
+
+
+class BatchRunner:
+    """
+    Executes manifest operations on a fixed set of worker threads.
+
+    Every operation on a bucket is routed to the same worker (by a hash of
+    the bucket name), so operations on one bucket run in manifest order
+    while different buckets proceed in parallel. Each worker's queue is
+    bounded, so reading the manifest never gets far ahead of execution.
+    If a worker cannot record a result (e.g. the results file is a closed
+    pipe), the run stops reading the manifest and re-raises that error.
+    """
+
+    def __init__(self, results: IO[str], results_format: str = "jsonl",
+                 workers: int = 8, max_retries: int = 3) -> None:
+        self.workers = workers
+        self.max_retries = max_retries
+        self.transfer_config = build_transfer_config()
+        self.handlers: Dict[str, Callable[..., None]] = {
+            "create_bucket": run_create_bucket,
+            "upload": lambda entry, result: run_upload(
+                entry, result, self.transfer_config, self.max_retries),
+            "list": run_list,
+            "delete_object": run_delete_object,
+            "delete_bucket": lambda entry, result: delete_bucket(
+                require(entry, "bucket")),
+        }
+        self.summary: Dict[str, Any] = {"total": 0, "succeeded": 0,
+                                        "failed": 0}
+        self._results = results
+        self._csv = None
+        if results_format == "csv":
+            self._csv = csv.DictWriter(results, fieldnames=RESULT_FIELDS)
+            self._csv.writeheader()
+        self._lock = threading.Lock()
+        self._error: Optional[Exception] = None
+
+    def execute(self, line_no: int, entry: Dict[str, Any],
+                parse_error: Optional[str]) -> Dict[str, Any]:
+        op = entry.get("op")
+        result: Dict[str, Any] = {
+            "line": line_no, "id": entry.get("id"), "op": op,
+            "bucket": entry.get("bucket"), "key": entry.get("key"),
+            "status": "ok", "error": None, "bytes": None, "count": None}
+        handler = None if parse_error else self.handlers.get(op)
+        started = time.perf_counter()
+        try:
+            if parse_error:
+                raise ValueError(parse_error)
+            if handler is None:
+                raise ValueError(f"Unknown operation: {op!r}")
+            handler(entry, result)
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = f"{type(e).__name__}: {e}"
+            if handler is not None and op in LOGGED_AS:
+                log_operation(LOGGED_AS[op], started, result["bucket"],
+                              result["key"], error=e)
+        else:
+            if op in LOGGED_AS:
+                log_operation(LOGGED_AS[op], started, result["bucket"],
+                              result["key"], result["bytes"])
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000,
+                                      3)
+        return result
+
+    def write_result(self, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self.summary["total"] += 1
+            self.summary["succeeded" if result["status"] == "ok"
+                         else "failed"] += 1
+            if self._csv is not None:
+                self._csv.writerow(result)
+            else:
+                self._results.write(json.dumps(result) + "\n")
+
+    def worker(self, jobs: "queue.Queue") -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            # After a failure the queue is still drained, so the reader
+            # never blocks on it
+            if self._error is not None:
+                continue
+            try:
+                self.write_result(self.execute(*job))
+            except Exception as e:
+                with self._lock:
+                    if self._error is None:
+                        self._error = e
+
+    @staticmethod
+    def put(jobs: "queue.Queue", job: Any, thread: threading.Thread) -> None:
+        while True:
+            try:
+                jobs.put(job, timeout=0.5)
+                return
+            except queue.Full:
+                if not thread.is_alive():
+                    return
+
+    def run(self, operations: Iterator[Tuple[int, Dict[str, Any],
+                                             Optional[str]]]
+            ) -> Dict[str, Any]:
+        """
+        Runs every operation and writes one result per operation.
+
+        Args:
+            operations: Items as yielded by read_manifest
+
+        Returns:
+            Dict[str, Any]: total, succeeded and failed counts, elapsed
+                seconds and operations per second
+
+        Raises:
+            Exception: The first error a worker hit outside an operation,
+                e.g. while writing a result; the remaining manifest is
+                not read
+        """
+        queues = [queue.Queue(maxsize=QUEUE_DEPTH)
+                  for _ in range(self.workers)]
+        threads = [threading.Thread(target=self.worker, args=(jobs,),
+                                    daemon=True) for jobs in queues]
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        try:
+            for line_no, entry, parse_error in operations:
+                if self._error is not None:
+                    break
+                bucket = str(entry.get("bucket", ""))
+                slot = zlib.crc32(bucket.encode("utf-8")) % self.workers
+                self.put(queues[slot], (line_no, entry, parse_error),
+                         threads[slot])
+        finally:
+            for jobs, thread in zip(queues, threads):
+                self.put(jobs, None, thread)
+            for thread in threads:
+                thread.join()
+        if self._error is not None:
+            raise self._error
+        elapsed = time.perf_counter() - started
+        self.summary["elapsed_seconds"] = round(elapsed, 3)
+        self.summary["ops_per_second"] = round(
+            self.summary["total"] / elapsed, 2) if elapsed else 0.0
+        return self.summary
+
+
+def run_manifest(manifest_path: str, results_path: str = "-",
+                 workers: int = 8, manifest_format: Optional[str] = None,
+                 max_retries: int = 3) -> Dict[str, Any]:
+    """
+    Executes a manifest of S3 operations and writes a results file. An
+    optional "id" in a manifest entry is copied to its result.
+
+    Args:
+        manifest_path (str): JSON-lines or CSV manifest, "-" for stdin
+        results_path (str): Results file; ".csv" writes CSV, anything else
+            JSON lines; "-" writes JSON lines to stdout
+        workers (int): Number of worker threads
+        manifest_format (Optional[str]): "jsonl" or "csv" to override the
+            extension-based guess
+        max_retries (int): Retries per upload after the first attempt
+
+    Returns:
+        Dict[str, Any]: Summary as returned by BatchRunner.run
+    """
+    results_format = "csv" if results_path.lower().endswith(".csv") \
+        else "jsonl"
+    results = sys.stdout if results_path == "-" else \
+        open(results_path, "w", newline="", encoding="utf-8")
+    try:
+        runner = BatchRunner(results, results_format, workers, max_retries)
+        return runner.run(read_manifest(manifest_path, manifest_format))
+    finally:
+        if results is not sys.stdout:
+            results.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("manifest", help="manifest file, or - for stdin")
+    parser.add_argument("--results", default="-",
+                        help="results file (.csv or JSON lines), "
+                             "default stdout")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        help="manifest format, default from the extension")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--summary", action="store_true",
+                        help="print per-operation latency to stderr")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    summary = run_manifest(args.manifest, args.results, args.workers,
+                           args.format, args.max_retries)
+    stop_logging()
+    print(json.dumps(summary), file=sys.stderr)
+    if args.summary:
+        with contextlib.redirect_stdout(sys.stderr):
+            print_operation_summary()
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
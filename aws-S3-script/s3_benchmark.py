@@ -0,0 +1,281 @@
+"""Benchmark of the S3 operations against a local S3 stand-in.
+
+Starts moto's server mode (or uses --endpoint-url, e.g. a MinIO instance),
+generates a dataset of .txt files, and for every mode uploads them with
+upload_file, lists the bucket with view_objects, deletes half the objects
+with delete_object and the rest with delete_bucket. Prints (or writes) a
+JSON report with ops/s, MB/s and p50/p95/p99 latencies per operation:
+
+    python s3_benchmark.py --objects 500 --sizes mix:4KB=80,1MB=20 \
+        --concurrency 16 --output s3_bench.json
+
+Modes are <serial|concurrent>-<reused|fresh>: one call at a time or
+--concurrency calls in flight, with the shared client or a new client for
+every call. Pass --baseline with a previous report to fail (exit code 1)
+when an operation loses more than --max-regression of its throughput or
+p95 latency.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import s3_operations
+from s3_operations import (MB, configure_s3_client, create_s3_connection,
+                           delete_bucket, delete_object,
+                           generate_object_name, get_metadata_index,
+                           operation_stats, stop_logging, upload_file,
+                           view_objects)
+
+MODES = ["serial-reused", "concurrent-reused", "serial-fresh",
+         "concurrent-fresh"]
+# Report name of each benchmarked function -> operation name in the log
+OPERATIONS = {
+    "upload_file": "upload_file",
+    "view_objects": "list_objects",
+    "delete_object": "delete_object",
+    "delete_bucket": "delete_bucket",
+}
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": MB, "GB": 1024 * MB}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+def parse_distribution(spec: str) -> Callable[[random.Random], int]:
+    """
+    Parses an object size distribution.
+
+    Args:
+        spec (str): "fixed:64KB", "uniform:1KB-1MB" or a weighted
+            "mix:4KB=80,1MB=15,16MB=5"
+
+    Returns:
+        Callable[[random.Random], int]: Draws one object size in bytes
+
+    Raises:
+        ValueError: If the spec is not understood
+    """
+    kind, _, value = spec.partition(":")
+    if kind == "fixed":
+        size = parse_size(value)
+        return lambda rng: size
+    if kind == "uniform":
+        low, high = (parse_size(part) for part in value.split("-", 1))
+        return lambda rng: rng.randint(low, high)
+    if kind == "mix":
+        sizes, weights = [], []
+        for item in value.split(","):
+            size, _, weight = item.partition("=")
+            sizes.append(parse_size(size))
+            weights.append(float(weight or 1))
+        return lambda rng: rng.choices(sizes, weights)[0]
+    raise ValueError(f"Unknown size distribution: {spec}")
+
+
+def write_dataset(directory: str, count: int,
+                  sizer: Callable[[random.Random], int],
+                  seed: int) -> Tuple[List[str], int]:
+    rng = random.Random(seed)
+    paths = []
+    total = 0
+    for i in range(count):
+        size = sizer(rng)
+        path = os.path.join(directory, f"object-{i:06d}.txt")
+        with open(path, "wb") as f:
+            remaining = size
+            while remaining:
+                chunk = min(remaining, MB)
+                f.write(os.urandom(chunk))
+                remaining -= chunk
+        paths.append(path)
+        total += size
+    return paths, total
+
+
+@contextlib.contextmanager
+def moto_server():
+    """
+    Runs moto's S3 server on a free local port for the duration of the
+    block and yields its endpoint URL.
+    """
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        sys.exit("moto is required for the local stand-in: "
+                 "pip install 'moto[server]', or pass --endpoint-url")
+    # moto serves through werkzeug, which logs every request
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port,
+                                verbose=False)
+    server.start()
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.stop()
+
+
+def run_calls(func: Callable[..., Any], calls: List[Tuple],
+              workers: int) -> None:
+    if workers == 1:
+        for args in calls:
+            func(*args)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(func, *args) for args in calls]:
+            future.result()
+
+
+def run_mode(mode: str, args: argparse.Namespace,
+             files: List[str]) -> Dict[str, Any]:
+    execution, client = mode.split("-")
+    workers = 1 if execution == "serial" else args.concurrency
+    configure_s3_client(reuse_client=client == "reused")
+    bucket_name = f"bench-{mode}-{int(time.time())}-{random.randrange(10**6)}"
+    create_s3_connection().create_bucket(Bucket=bucket_name)
+    get_metadata_index().add_bucket(bucket_name)
+    operation_stats.reset()
+
+    run_calls(upload_file, [(bucket_name, path, "txt", [bucket_name])
+                            for path in files], workers)
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        run_calls(view_objects, [(bucket_name,)] * args.list_repeats,
+                  workers)
+    keys = [generate_object_name("txt", path) for path in files]
+    run_calls(delete_object, [(bucket_name, key)
+                              for key in keys[:len(keys) // 2]], workers)
+    try:
+        delete_bucket(bucket_name, max_workers=workers)
+    except Exception as e:
+        print(f"delete_bucket failed in {mode}: {e}", file=sys.stderr)
+
+    summary = operation_stats.summary()
+    return {name: summary[logged] for name, logged in OPERATIONS.items()
+            if logged in summary}
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any],
+            max_regression: float) -> List[str]:
+    regressions = []
+    for mode, operations in report["results"].items():
+        for name, current in operations.items():
+            previous = baseline.get("results", {}).get(mode, {}).get(name)
+            if not previous:
+                continue
+            floor = previous["ops_per_second"] * (1 - max_regression)
+            if current["ops_per_second"] < floor:
+                regressions.append(
+                    f"{mode}/{name}: {current['ops_per_second']} ops/s "
+                    f"< baseline {previous['ops_per_second']}")
+            ceiling = previous["p95_ms"] * (1 + max_regression)
+            if current["p95_ms"] > ceiling:
+                regressions.append(
+                    f"{mode}/{name}: p95 {current['p95_ms']} ms "
+                    f"> baseline {previous['p95_ms']}")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=200,
+                        help="objects uploaded per mode")
+    parser.add_argument("--sizes", default="fixed:64KB",
+                        help="fixed:SIZE, uniform:MIN-MAX or "
+                             "mix:SIZE=WEIGHT,...")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--list-repeats", type=int, default=5,
+                        help="view_objects calls per mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--endpoint-url",
+                        help="use this S3 endpoint instead of starting moto")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def run_benchmark(args: argparse.Namespace,
+                  sizer: Callable[[random.Random], int],
+                  workdir: str) -> Tuple[Dict[str, Any], int]:
+    # Keep the benchmark's index and log out of the user's files
+    s3_operations.S3_INDEX_PATH = os.path.join(workdir, "s3_index.db")
+    s3_operations.S3_LOG_PATH = os.path.join(workdir, "aws.log")
+    data_dir = os.path.join(workdir, "data")
+    os.makedirs(data_dir)
+    files, total_bytes = write_dataset(data_dir, args.objects, sizer,
+                                       args.seed)
+
+    with contextlib.ExitStack() as stack:
+        endpoint = args.endpoint_url
+        if endpoint is None:
+            for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+                os.environ.setdefault(name, "benchmark")
+            endpoint = stack.enter_context(moto_server())
+        configure_s3_client(endpoint_url=endpoint,
+                            region_name=os.environ.get("AWS_DEFAULT_REGION",
+                                                       "us-east-1"))
+        results = {mode: run_mode(mode, args, files) for mode in args.modes}
+    stop_logging()
+    get_metadata_index().close()
+    return results, total_bytes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    sizer = parse_distribution(args.sizes)
+    workdir = tempfile.mkdtemp(prefix="s3-bench-")
+    try:
+        results, total_bytes = run_benchmark(args, sizer, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "objects": args.objects,
+            "sizes": args.sizes,
+            "dataset_bytes": total_bytes,
+            "concurrency": args.concurrency,
+            "list_repeats": args.list_repeats,
+            "endpoint": args.endpoint_url or "moto",
+            "python": sys.version.split()[0],
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS refreshes (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    PRIMARY KEY (bucket, prefix)
+);
+CREATE TABLE IF NOT EXISTS objects (
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    seen REAL NOT NULL,
+    PRIMARY KEY (bucket, key)
+) WITHOUT ROWID;
+"""
+
+# Pseudo-bucket under which the bucket list's refresh time is recorded
+BUCKET_LIST = ""
+WRITE_BATCH_SIZE = 1000
+
+
+def prefix_bound(prefix: str) -> Optional[str]:
+    """
+    Returns the smallest string greater than every string with the prefix,
+    so prefix lookups can use the primary key as a range.
+
+    Args:
+        prefix (str): Key prefix
+
+    Returns:
+        Optional[str]: Exclusive upper bound, or None for an empty prefix
+    """
+    if not prefix or ord(prefix[-1]) >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class S3MetadataIndex:
+    """
+    Local SQLite index of bucket names and object metadata.
+
+    Listings are trusted for ttl seconds after they were refreshed; a
+    refresh of a prefix also covers every longer prefix inside it. Writes
+    made by this tool are applied to the index directly, so it stays
+    accurate without another listing call.
+    """
+
+    def __init__(self, path: str = "s3_index.db", ttl: float = 300) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _refreshed_at(self, bucket: str, prefix: str) -> Optional[float]:
+        rows = self._conn.execute(
+            "SELECT prefix, refreshed_at FROM refreshes WHERE bucket = ?",
+            (bucket,)).fetchall()
+        times = [at for covered, at in rows if prefix.startswith(covered)]
+        return max(times) if times else None
+
+    def is_fresh(self, bucket: str = BUCKET_LIST, prefix: str = "") -> bool:
+        """
+        Checks whether a listing of bucket/prefix is younger than the TTL.
+
+        Args:
+            bucket (str): Bucket name, or BUCKET_LIST for the bucket list
+            prefix (str): Key prefix
+
+        Returns:
+            bool: True if the index can answer without a listing call
+        """
+        with self._lock:
+            refreshed_at = self._refreshed_at(bucket, prefix)
+        return refreshed_at is not None and \
+            time.time() - refreshed_at < self.ttl
+
+    def bucket_names(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM buckets ORDER BY name").fetchall()
+        return [row[0] for row in rows]
+
+    def replace_buckets(self, names: Iterable[str]) -> None:
+        """
+        Stores a complete bucket listing and marks it fresh.
+
+        Args:
+            names (Iterable[str]): Every bucket name in the account
+        """
+        names = list(names)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM buckets")
+            self._conn.executemany("INSERT INTO buckets (name) VALUES (?)",
+                                   [(name,) for name in names])
+            # Objects of buckets that no longer exist are dropped too
+            self._conn.execute(
+                "DELETE FROM objects WHERE bucket NOT IN "
+                "(SELECT name FROM buckets)")
+            self._conn.execute(
+                "DELETE FROM refreshes WHERE bucket != ? AND bucket NOT IN "
+                "(SELECT name FROM buckets)", (BUCKET_LIST,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refreshes VALUES (?, '', ?)",
+                (BUCKET_LIST, time.time()))
+
+    def add_bucket(self, name: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO buckets (name) VALUES (?)", (name,))
+            # A new bucket is empty, so its (empty) listing is known
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refreshes VALUES (?, '', ?)",
+                (name, time.time()))
+
+    def remove_bucket(self, name: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM buckets WHERE name = ?", (name,))
+            self._conn.execute("DELETE FROM objects WHERE bucket = ?",
+                               (name,))
+            self._conn.execute("DELETE FROM refreshes WHERE bucket = ?",
+                               (name,))
+
+    def _prefix_clause(self, prefix: str) -> tuple:
+        upper = prefix_bound(prefix)
+        if not prefix:
+            return "", ()
+        if upper is None:
+            return " AND key >= ?", (prefix,)
+        return " AND key >= ? AND key < ?", (prefix, upper)
+
+    def refresh_objects(self, bucket: str, prefix: str,
+                        entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replaces the indexed objects under a prefix with a fresh listing.
+        Rows are upserted in batches as the listing streams in; rows not
+        seen in this listing are removed at the end.
+
+        Args:
+            bucket (str): Bucket name
+            prefix (str): Key prefix that was listed ("" for all)
+            entries (Iterable[Dict[str, Any]]): Metadata entries as yielded
+                by iter_objects(include_metadata=True)
+
+        Returns:
+            int: Number of objects indexed
+        """
+        started = time.time()
+        count = 0
+        batch = []
+        query = """
+        INSERT INTO objects (bucket, key, size, etag, last_modified, seen)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (bucket, key) DO UPDATE SET
+            size = excluded.size, etag = excluded.etag,
+            last_modified = excluded.last_modified, seen = excluded.seen
+        """
+        for entry in entries:
+            if entry.get("IsFolder"):
+                continue
+            batch.append((bucket, entry["Key"], entry["Size"], entry["ETag"],
+                          entry["LastModified"].isoformat(), started))
+            count += 1
+            if len(batch) == WRITE_BATCH_SIZE:
+                with self._lock, self._conn:
+                    self._conn.executemany(query, batch)
+                batch = []
+        clause, params = self._prefix_clause(prefix)
+        with self._lock, self._conn:
+            self._conn.executemany(query, batch)
+            self._conn.execute(
+                f"DELETE FROM objects WHERE bucket = ? AND seen < ?{clause}",
+                (bucket, started) + params)
+            # The new listing supersedes refreshes of narrower prefixes
+            self._conn.execute(
+                "DELETE FROM refreshes WHERE bucket = ? AND prefix LIKE ? "
+                "ESCAPE '\\'",
+                (bucket, prefix.replace("\\", "\\\\").replace("%", "\\%")
+                 .replace("_", "\\_") + "%"))
+            self._conn.execute(
+                "INSERT INTO refreshes VALUES (?, ?, ?)",
+                (bucket, prefix, started))
+        return count
+
+    def object_keys(self, bucket: str, prefix: str = "",
+                    limit: Optional[int] = None) -> List[str]:
+        clause, params = self._prefix_clause(prefix)
+        query = (f"SELECT key FROM objects WHERE bucket = ?{clause} "
+                 "ORDER BY key")
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(query, (bucket,) + params).fetchall()
+        return [row[0] for row in rows]
+
+    def get_object(self, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, etag, last_modified FROM objects "
+                "WHERE bucket = ? AND key = ?", (bucket, key)).fetchone()
+        if row is None:
+            return None
+        return {"Key": key, "Size": row[0], "ETag": row[1],
+                "LastModified": row[2]}
+
+    def record_object(self, bucket: str, key: str, size: Optional[int],
+                      etag: Optional[str] = None,
+                      last_modified: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?)",
+                (bucket, key, size, etag, last_modified, time.time()))
+
+    def forget_objects(self, bucket: str, keys: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM objects WHERE bucket = ? AND key = ?",
+                [(bucket, key) for key in keys])
+
+    def forget_prefix(self, bucket: str, prefix: str = "") -> None:
+        clause, params = self._prefix_clause(prefix)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"DELETE FROM objects WHERE bucket = ?{clause}",
+                (bucket,) + params)
+
+    def invalidate(self, bucket: Optional[str] = None) -> None:
+        """
+        Marks listings stale so the next lookup refreshes them.
+
+        Args:
+            bucket (Optional[str]): Bucket to invalidate, BUCKET_LIST for
+                the bucket list, or None for everything
+        """
+        with self._lock, self._conn:
+            if bucket is None:
+                self._conn.execute("DELETE FROM refreshes")
+            else:
+                self._conn.execute("DELETE FROM refreshes WHERE bucket = ?",
+                                   (bucket,))
@@ -1,72 +1,390 @@
+import argparse
+import atexit
 import boto3
 import logging
-from datetime import datetime
+import queue
+import random
+import sys
+from datetime import datetime, timezone
 import os
 import questionary 
-from typing import List, Optional
+import hashlib
+import json
+import mimetypes
+import zlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+from logging.handlers import QueueHandler, QueueListener
+from boto3.s3.transfer import TransferConfig
 from botocore.client import BaseClient
-logging.basicConfig(filename='aws.log',
-                    encoding='utf-8', level=logging.INFO)
+from botocore.config import Config
+from s3_index import S3MetadataIndex
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
-def create_s3_connection() -> BaseClient:
+# Defaults can be overridden through the environment or configure_s3_client()
+S3_CLIENT_OPTIONS: Dict[str, Any] = {
+    "endpoint_url": os.environ.get("S3_ENDPOINT_URL"),
+    "region_name": os.environ.get("AWS_DEFAULT_REGION"),
+    "max_pool_connections": int(
+        os.environ.get("S3_MAX_POOL_CONNECTIONS", "50")),
+    "retries_mode": os.environ.get("S3_RETRIES_MODE", "standard"),
+    "max_attempts": int(os.environ.get("S3_MAX_ATTEMPTS", "5")),
+    "connect_timeout": float(os.environ.get("S3_CONNECT_TIMEOUT", "5")),
+    "read_timeout": float(os.environ.get("S3_READ_TIMEOUT", "60")),
+    "tcp_keepalive": True,
+    # False builds a new client for every call, as the tool used to
+    "reuse_client": os.environ.get("S3_REUSE_CLIENT", "1") != "0",
+}
+
+SUPPORTED_FILE_TYPES = ["txt", "pdf", "doc", "docx"]
+MB = 1024 * 1024
+DELETE_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+OBJECT_PICKER_LIMIT = 1000
+DOWNLOAD_PART_SIZE = 8 * MB
+STREAM_READ_SIZE = MB
+# Content-Encoding and default level of each streaming compression
+COMPRESSIONS = {"gzip": ("gzip", 6), "zstd": ("zstd", 3)}
+# Prefixes generate_object_name writes to, and so the ones sync manages
+SYNC_PREFIXES = ["docs/", "texts/", "pdfs/"]
+
+S3_LOG_PATH = os.environ.get("S3_LOG_PATH", "aws.log")
+S3_INDEX_PATH = os.environ.get("S3_INDEX_PATH", "s3_index.db")
+S3_INDEX_TTL = float(os.environ.get("S3_INDEX_TTL", "300"))
+
+_client_lock = threading.Lock()
+_cached_client: Optional[BaseClient] = None
+_index_lock = threading.Lock()
+_metadata_index: Optional[S3MetadataIndex] = None
+_log_lock = threading.Lock()
+_log_listener: Optional[QueueListener] = None
+logger = logging.getLogger(__name__)
+
+
+def build_client_config(options: Dict[str, Any]) -> Config:
     """
-    Creates and returns an S3 client using boto3.
+    Builds the botocore Config used for S3 clients.
+
+    Args:
+        options (Dict[str, Any]): Client options, see S3_CLIENT_OPTIONS
+
+    Returns:
+        Config: botocore client configuration
+    """
+    return Config(
+        max_pool_connections=options["max_pool_connections"],
+        retries={"mode": options["retries_mode"],
+                 "total_max_attempts": options["max_attempts"]},
+        connect_timeout=options["connect_timeout"],
+        read_timeout=options["read_timeout"],
+        tcp_keepalive=options["tcp_keepalive"],
+    )
+
+
+def create_s3_connection(fresh: bool = False) -> BaseClient:
+    """
+    Returns the process-wide S3 client, creating it on first use.
+    boto3 clients are thread-safe, so the same client (and its pool of
+    keep-alive connections) is shared by every operation and thread.
+
+    Args:
+        fresh (bool): Build a new, uncached client instead
 
     Returns:
         BaseClient: Configured S3 client instance
     """
-    session = boto3.Session()
-    s3 = session.client("s3")
-    return s3
+    global _cached_client
+    fresh = fresh or not S3_CLIENT_OPTIONS["reuse_client"]
+    if not fresh and _cached_client is not None:
+        return _cached_client
+    with _client_lock:
+        if not fresh and _cached_client is not None:
+            return _cached_client
+        session = boto3.Session()
+        s3 = session.client(
+            "s3",
+            endpoint_url=S3_CLIENT_OPTIONS["endpoint_url"],
+            region_name=S3_CLIENT_OPTIONS["region_name"],
+            config=build_client_config(S3_CLIENT_OPTIONS))
+        if not fresh:
+            _cached_client = s3
+        return s3
+
+
+def configure_s3_client(**options: Any) -> None:
+    """
+    Updates S3 client options and drops the cached client so the next
+    call to create_s3_connection() uses them.
+
+    Args:
+        **options: Any key of S3_CLIENT_OPTIONS, e.g. endpoint_url to
+            point the tool at a local S3 stand-in
+
+    Raises:
+        ValueError: If an unknown option is given
+    """
+    global _cached_client
+    unknown = set(options) - set(S3_CLIENT_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown S3 client options: {sorted(unknown)}")
+    with _client_lock:
+        S3_CLIENT_OPTIONS.update(options)
+        _cached_client = None
+
+
+def get_metadata_index() -> S3MetadataIndex:
+    """
+    Returns the process-wide local metadata index, opening it on first use.
+
+    Returns:
+        S3MetadataIndex: Index stored at S3_INDEX_PATH
+    """
+    global _metadata_index
+    with _index_lock:
+        if _metadata_index is None:
+            _metadata_index = S3MetadataIndex(S3_INDEX_PATH, S3_INDEX_TTL)
+        return _metadata_index
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats each log record as one JSON object per line, merging in the
+    structured fields passed through the record's "fields" attribute.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str)
+
+
+def start_logging(path: Optional[str] = None) -> None:
+    """
+    Starts the background log writer. Records are put on an in-memory
+    queue by the calling thread and written to the log file by a
+    QueueListener thread, so S3 calls never wait on file I/O.
+
+    Args:
+        path (Optional[str]): Log file, defaults to S3_LOG_PATH
+    """
+    global _log_listener
+    with _log_lock:
+        if _log_listener is not None:
+            return
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        file_handler = logging.FileHandler(path or S3_LOG_PATH,
+                                           encoding="utf-8", delay=True)
+        file_handler.setFormatter(JsonLinesFormatter())
+        _log_listener = QueueListener(log_queue, file_handler)
+        _log_listener.start()
+        logger.addHandler(QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """
+    Flushes queued log records to disk and stops the background writer.
+    """
+    global _log_listener
+    with _log_lock:
+        if _log_listener is None:
+            return
+        _log_listener.stop()
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        _log_listener = None
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Returns the nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values (List[float]): Values in ascending order
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, -(-len(sorted_values) * pct // 100) - 1)
+    return sorted_values[min(int(rank), len(sorted_values) - 1)]
 
 
-def log_error(action: str, e: Exception) -> None:
+class OperationStats:
+    """
+    Thread-safe per-operation counters and latency samples. At most
+    max_samples durations are kept per operation (reservoir sampling), so
+    long bulk runs use constant memory.
     """
-    Logs errors to aws.log file
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, operation: str, started: float, ended: float,
+               size: Optional[int], failed: bool) -> None:
+        with self._lock:
+            stats = self._operations.setdefault(operation, {
+                "count": 0, "errors": 0, "bytes": 0, "first_start": started,
+                "last_end": ended, "samples": []})
+            stats["count"] += 1
+            stats["errors"] += int(failed)
+            stats["bytes"] += size or 0
+            stats["first_start"] = min(stats["first_start"], started)
+            stats["last_end"] = max(stats["last_end"], ended)
+            samples = stats["samples"]
+            if len(samples) < self.max_samples:
+                samples.append(ended - started)
+            else:
+                slot = random.randrange(stats["count"])
+                if slot < self.max_samples:
+                    samples[slot] = ended - started
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarizes every operation type seen so far.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per operation: count, errors, bytes,
+                ops/s and MB/s over the operation's wall-clock span, and
+                p50/p95/p99 latency in milliseconds
+        """
+        result = {}
+        with self._lock:
+            for operation, stats in sorted(self._operations.items()):
+                span = stats["last_end"] - stats["first_start"]
+                samples = sorted(stats["samples"])
+                result[operation] = {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "bytes": stats["bytes"],
+                    "ops_per_second": round(stats["count"] / span, 2)
+                    if span else 0.0,
+                    "mb_per_second": round(stats["bytes"] / MB / span, 2)
+                    if span else 0.0,
+                    "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                    "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                    "p99_ms": round(percentile(samples, 99) * 1000, 2),
+                }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+
+operation_stats = OperationStats()
+
+
+def log_operation(operation: str, started: float,
+                  bucket: Optional[str] = None, key: Optional[str] = None,
+                  size: Optional[int] = None,
+                  error: Optional[BaseException] = None) -> None:
+    """
+    Records one S3 operation in the statistics and queues a structured
+    JSON-lines record for the log file.
 
     Args:
-        action (str): Description of the action that failed
-        e (Exception): The exception that was raised
+        operation (str): Operation name, e.g. upload_file
+        started (float): time.perf_counter() value when it started
+        bucket (Optional[str]): Bucket the operation acted on
+        key (Optional[str]): Object key or prefix it acted on
+        size (Optional[int]): Bytes transferred
+        error (Optional[BaseException]): The error, if it failed
     """
-    logger = logging.getLogger(__name__)
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    ended = time.perf_counter()
+    operation_stats.record(operation, started, ended, size,
+                           error is not None)
+    start_logging()
+    fields = {
+        "operation": operation,
+        "bucket": bucket,
+        "key": key,
+        "bytes": size,
+        "duration_ms": round((ended - started) * 1000, 3),
+        "status": "error" if error else "ok",
+        "error_class": type(error).__name__ if error else None,
+    }
+    if error is not None:
+        logger.error(str(error), extra={"fields": fields})
+    else:
+        logger.info(operation, extra={"fields": fields})
+
 
-    logger.debug(f'Failed action at {timestamp}')
-    logger.info(f'Attempted {action}')
-    logger.error(f'Error: {e}')
+def print_operation_summary() -> None:
+    """
+    Prints throughput and latency percentiles per operation type.
+    """
+    summary = operation_stats.summary()
+    if not summary:
+        print("No operations recorded yet.")
+        return
+    print(f"{'operation':<18}{'count':>8}{'errors':>8}{'ops/s':>10}"
+          f"{'MB/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for operation, stats in summary.items():
+        print(f"{operation:<18}{stats['count']:>8}{stats['errors']:>8}"
+              f"{stats['ops_per_second']:>10}{stats['mb_per_second']:>9}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+              f"{stats['p99_ms']:>10}")
 
 
-def log_success(action: str) -> None:
+def list_bucket_names(refresh: bool = False) -> List[str]:
     """
-    Logs success to aws.log file
+    Returns bucket names from the metadata index, calling list_buckets
+    only when the indexed list is older than the TTL.
 
     Args:
-        action (str): Description of the action that was completed 
+        refresh (bool): Always fetch a fresh list from S3
+
+    Returns:
+        List[str]: List of bucket names
     """
-    logger = logging.getLogger(__name__)
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    logger.info(f'Successfully completed {action} at {timestamp}')
+    index = get_metadata_index()
+    if not refresh and index.is_fresh():
+        return index.bucket_names()
+    s3 = create_s3_connection()
+    bucket_names = [bucket["Name"] for bucket in s3.list_buckets()["Buckets"]]
+    index.replace_buckets(bucket_names)
+    return bucket_names
 
 
-def view_all_active_buckets() -> List[str]:
+def view_all_active_buckets(refresh: bool = False) -> List[str]:
     """
     Lists all S3 buckets in the account.
 
+    Args:
+        refresh (bool): Bypass the metadata index and ask S3
+
     Returns:
         List[str]: List of bucket names
     """
+    started = time.perf_counter()
     try:
-        s3 = create_s3_connection()
-        buckets = s3.list_buckets()
-        bucket_names = []
-        for bucket in buckets["Buckets"]:
-            print(bucket["Name"])
-            bucket_names.append(bucket["Name"])
-        log_success("Viewing buckets")
+        bucket_names = list_bucket_names(refresh)
+        for bucket_name in bucket_names:
+            print(bucket_name)
+        log_operation("list_buckets", started)
         return bucket_names
     except Exception as e:
-        log_error("Viewing buckets", e)
+        log_operation("list_buckets", started, error=e)
         return []
 
 
@@ -77,6 +395,8 @@ def create_new_bucket() -> Optional[str]:
     Returns:
         Optional[str]: Name of created bucket or None if failed
     """
+    started = time.perf_counter()
+    bucket_name = None
     try:
         s3 = create_s3_connection()
         timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M%S")
@@ -84,14 +404,16 @@ def create_new_bucket() -> Optional[str]:
         region = "us-east-2"
         s3.create_bucket(Bucket=bucket_name, CreateBucketConfiguration={
                          'LocationConstraint': region})
-        log_success(f"Creating new bucket {bucket_name}")
+        get_metadata_index().add_bucket(bucket_name)
+        log_operation("create_bucket", started, bucket_name)
         return bucket_name
     except Exception as e:
-        log_error("Creating new bucket", e)
+        log_operation("create_bucket", started, bucket_name, error=e)
         return None
 
 
-def generate_object_name(file_type: str, file_path: str) -> str:
+def generate_object_name(file_type: str, file_path: str,
+                         base_dir: Optional[str] = None) -> str:
     """
     Generates S3 object name based on file type and path.
     Organizes files into type-specific folders (docs/, texts/, pdfs/).
@@ -99,17 +421,59 @@ def generate_object_name(file_type: str, file_path: str) -> str:
     Args:
         file_type (str): Type of file (doc, docx, txt, pdf)
         file_path (str): Full path to the file
+        base_dir (Optional[str]): When given, keep the file's path relative
+            to this directory under the type folder instead of only its name
 
     Returns:
         str: S3 object name with appropriate folder prefix
     """
-    split_path = file_path.split("/")
+    if base_dir is not None:
+        name = os.path.relpath(file_path, base_dir).replace(os.sep, "/")
+    else:
+        name = file_path.split("/")[-1]
     if file_type == "docx" or file_type == "doc":
-        return f"docs/{split_path[-1]}"
+        return f"docs/{name}"
     elif file_type == "txt":
-        return f"texts/{split_path[-1]}"
+        return f"texts/{name}"
     else:
-        return f"pdfs/{split_path[-1]}"
+        return f"pdfs/{name}"
+
+
+def get_file_type(file_path: str) -> str:
+    """
+    Returns the lower-cased extension of a file path without the dot.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: File type such as txt or pdf, or "" when there is none
+    """
+    return os.path.splitext(file_path)[1][1:].lower()
+
+
+def build_transfer_config(multipart_threshold: int = 8 * MB,
+                          multipart_chunksize: int = 8 * MB,
+                          max_concurrency: int = 4) -> TransferConfig:
+    """
+    Builds the boto3 TransferConfig used for uploads.
+
+    Args:
+        multipart_threshold (int): Size in bytes above which multipart is used
+        multipart_chunksize (int): Size in bytes of each multipart part
+        max_concurrency (int): Parallel part transfers per file
+
+    Returns:
+        TransferConfig: Transfer settings for upload_file/upload_fileobj
+    """
+    config = TransferConfig(multipart_threshold=multipart_threshold,
+                            multipart_chunksize=multipart_chunksize,
+                            max_concurrency=max_concurrency)
+    # Streams that cannot seek are buffered in memory one part at a time;
+    # keep only enough parts to feed every upload thread (not a boto3
+    # constructor argument, but read by s3transfer)
+    config.max_in_memory_upload_chunks = max_concurrency * 2
+    return config
 
 
 def upload_file(bucket_name: str, file_path: str, file_type: str, bucket_list: List[str]) -> None:
@@ -134,40 +498,452 @@ def upload_file(bucket_name: str, file_path: str, file_type: str, bucket_list: L
     if bucket_name not in bucket_list:
         raise ValueError("Bucket name is not in buckets")
     object_name = generate_object_name(file_type, file_path)
+    started = time.perf_counter()
     try:
         s3 = create_s3_connection()
         s3.upload_file(file_path, bucket_name, object_name)
-        log_success(f"Uploading {file_path} to bucket {bucket_name}")
+        size = os.path.getsize(file_path)
+        record_upload(bucket_name, object_name, size)
+        log_operation("upload_file", started, bucket_name, object_name, size)
     except Exception as e:
-        log_error("Uploading bucket", e)
+        log_operation("upload_file", started, bucket_name, object_name,
+                      error=e)
+
 
-def view_objects(bucket_name: str) -> List[str]:
+def record_upload(bucket_name: str, object_name: str, size: int) -> None:
     """
-    Lists all objects in a specified bucket.
+    Adds an object this tool just uploaded to the metadata index.
 
     Args:
         bucket_name (str): Name of the S3 bucket
+        object_name (str): Key of the uploaded object
+        size (int): Size of the uploaded object in bytes
+    """
+    get_metadata_index().record_object(
+        bucket_name, object_name, size,
+        last_modified=datetime.now(timezone.utc).isoformat())
+
+
+class CompressingReader:
+    """
+    Read-only file-like wrapper that compresses a stream as it is read.
+
+    Data is pulled from the source in STREAM_READ_SIZE pieces only when a
+    caller asks for more, so at most one request's worth of output is
+    buffered no matter how long the stream is. Without a compression the
+    data passes through unchanged and is only counted.
+    """
+
+    def __init__(self, source: Any, compression: Optional[str] = None,
+                 level: Optional[int] = None) -> None:
+        self.source = source
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._eof = False
+        if compression is None:
+            self._compressor = None
+        elif compression == "gzip":
+            # wbits 16 + MAX_WBITS writes a gzip header and trailer
+            self._compressor = zlib.compressobj(
+                COMPRESSIONS["gzip"][1] if level is None else level,
+                zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif compression == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd compression requires the "
+                                 "zstandard package")
+            self._compressor = zstandard.ZstdCompressor(
+                level=COMPRESSIONS["zstd"][1] if level is None else level
+            ).compressobj()
+        else:
+            raise ValueError(f"Unknown compression: {compression}")
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self, size: int) -> None:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self.source.read(STREAM_READ_SIZE)
+            if not chunk:
+                self._eof = True
+                if self._compressor is not None:
+                    self._buffer += self._compressor.flush()
+                break
+            self.bytes_read += len(chunk)
+            if self._compressor is not None:
+                chunk = self._compressor.compress(chunk)
+            self._buffer += chunk
+
+    def read(self, size: int = -1) -> bytes:
+        self._fill(size)
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        self.bytes_written += len(data)
+        return data
+
+
+def upload_stream(bucket_name: str, stream: Any, name: str,
+                  compression: Optional[str] = None,
+                  object_name: Optional[str] = None,
+                  transfer_config: Optional[TransferConfig] = None
+                  ) -> Dict[str, Any]:
+    """
+    Uploads a readable stream of unknown length, such as stdin or a
+    document produced in memory, with upload_fileobj. Parts are read and
+    uploaded as the stream produces them, so memory stays bounded by
+    multipart_chunksize times max_in_memory_upload_chunks of the
+    transfer config.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        stream (Any): Binary file-like object with a read() method
+        name (str): File name of the document; its extension picks the
+            docs/, texts/ or pdfs/ folder
+        compression (Optional[str]): "gzip" or "zstd" to compress while
+            streaming; the object gets the matching Content-Encoding
+        object_name (Optional[str]): Key to use instead of the generated one
+        transfer_config (Optional[TransferConfig]): Multipart settings
 
     Returns:
-        List[str]: List of object keys in the bucket
+        Dict[str, Any]: Report with key, bytes read, bytes uploaded,
+            elapsed seconds and MB/s of input
+
+    Raises:
+        ValueError: If the file type or compression is not supported
     """
+    file_type = get_file_type(name)
+    if file_type not in SUPPORTED_FILE_TYPES:
+        raise ValueError("Must be a document file type")
+    object_name = object_name or generate_object_name(file_type, name)
+    reader = CompressingReader(stream, compression)
+    extra_args = {}
+    content_type = mimetypes.guess_type(name)[0]
+    if content_type:
+        extra_args["ContentType"] = content_type
+    if compression:
+        extra_args["ContentEncoding"] = COMPRESSIONS[compression][0]
+    started = time.perf_counter()
     try:
         s3 = create_s3_connection()
-        objects = s3.list_objects(Bucket=bucket_name)
-        object_key = []
-        if "Contents" in objects and objects["Contents"]:
-            print("---------")
-            print(f"{bucket_name} content: ")
-            for obj in objects["Contents"]:
-                object_key.append(obj["Key"])
-                print(obj["Key"])
-        else:
-            print(f'No objects in {bucket_name}')
-        log_success(f"Displayed {bucket_name} content")
-        return object_key
+        s3.upload_fileobj(reader, bucket_name, object_name,
+                          ExtraArgs=extra_args,
+                          Config=transfer_config or build_transfer_config())
+        record_upload(bucket_name, object_name, reader.bytes_written)
+        log_operation("upload_stream", started, bucket_name, object_name,
+                      reader.bytes_written)
     except Exception as e:
-        log_error("Could not view bucket content", e)
-        return []
+        log_operation("upload_stream", started, bucket_name, object_name,
+                      error=e)
+        raise
+    elapsed = time.perf_counter() - started
+    return {"key": object_name, "bytes_read": reader.bytes_read,
+            "bytes_uploaded": reader.bytes_written,
+            "elapsed_seconds": round(elapsed, 3),
+            "mb_per_second": round(reader.bytes_read / MB / elapsed, 2)
+            if elapsed else 0.0}
+
+
+def iter_directory_files(directory: str) -> Iterator[str]:
+    """
+    Walks a directory tree lazily, yielding the path of every file.
+
+    Args:
+        directory (str): Root directory to walk
+
+    Yields:
+        str: Path to each file
+    """
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            yield os.path.join(root, name)
+
+
+def iter_upload_plan(directory: str,
+                     skipped: List[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Pairs every supported document under a directory with its object key.
+
+    Args:
+        directory (str): Root directory to walk
+        skipped (List[str]): Files with unsupported types are appended here
+
+    Yields:
+        Tuple[str, str]: File path and the key generate_object_name gives it
+    """
+    for file_path in iter_directory_files(directory):
+        file_type = get_file_type(file_path)
+        if file_type not in SUPPORTED_FILE_TYPES:
+            skipped.append(file_path)
+            continue
+        yield file_path, generate_object_name(file_type, file_path,
+                                              directory)
+
+
+def upload_with_retries(s3: BaseClient, file_path: str, bucket_name: str,
+                        object_name: str, transfer_config: TransferConfig,
+                        max_retries: int) -> Optional[Exception]:
+    """
+    Uploads one file, retrying with exponential backoff on failure.
+
+    Returns:
+        Optional[Exception]: The last error, or None if the upload succeeded
+    """
+    error = None
+    for attempt in range(max_retries + 1):
+        if attempt:
+            time.sleep(min(2 ** attempt * 0.1, 5))
+        try:
+            s3.upload_file(file_path, bucket_name, object_name,
+                           Config=transfer_config)
+            return None
+        except Exception as e:
+            error = e
+    return error
+
+
+def upload_files(bucket_name: str, files: Iterable[Tuple[str, str]],
+                 max_workers: int = 8,
+                 transfer_config: Optional[TransferConfig] = None,
+                 max_retries: int = 3) -> Dict[str, Any]:
+    """
+    Uploads (file_path, object_name) pairs through a bounded thread pool.
+    Each file is retried on its own, so one failure never restarts the batch.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        files (Iterable[Tuple[str, str]]): Files and the keys to store them at
+        max_workers (int): Number of files uploaded at the same time
+        transfer_config (Optional[TransferConfig]): Multipart settings
+        max_retries (int): Retries per file after the first attempt
+
+    Returns:
+        Dict[str, Any]: Report with uploaded/failed counts, bytes,
+            elapsed seconds, throughput and a path -> error map of failures
+    """
+    s3 = create_s3_connection()
+    transfer_config = transfer_config or build_transfer_config()
+    report: Dict[str, Any] = {"uploaded": 0, "bytes": 0, "failed": {}}
+    lock = threading.Lock()
+    # Bound the number of queued files so huge trees are not held in memory
+    slots = threading.BoundedSemaphore(max_workers * 4)
+
+    def upload(file_path: str, object_name: str) -> None:
+        file_started = time.perf_counter()
+        size = None
+        try:
+            error = upload_with_retries(s3, file_path, bucket_name,
+                                        object_name, transfer_config,
+                                        max_retries)
+            if error is None:
+                size = os.path.getsize(file_path)
+                record_upload(bucket_name, object_name, size)
+            log_operation("upload_file", file_started, bucket_name,
+                          object_name, size, error)
+        except Exception as e:
+            # Nothing waits on the future, so anything raised here has to
+            # land in the report or the file is neither uploaded nor failed
+            error = e
+        finally:
+            slots.release()
+        with lock:
+            if error is None:
+                report["uploaded"] += 1
+                report["bytes"] += size
+            else:
+                report["failed"][file_path] = str(error)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for file_path, object_name in files:
+            slots.acquire()
+            pool.submit(upload, file_path, object_name)
+    elapsed = time.perf_counter() - started
+
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["files_per_second"] = round(report["uploaded"] / elapsed, 2) \
+        if elapsed else 0.0
+    report["mb_per_second"] = round(report["bytes"] / MB / elapsed, 2) \
+        if elapsed else 0.0
+    log_operation("bulk_upload", started, bucket_name, size=report["bytes"])
+    return report
+
+
+def bulk_upload_directory(bucket_name: str, directory: str,
+                          max_workers: int = 8,
+                          transfer_config: Optional[TransferConfig] = None,
+                          max_retries: int = 3) -> Dict[str, Any]:
+    """
+    Uploads every supported document under a directory tree, routing each
+    one to its type folder with generate_object_name.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        directory (str): Root directory to upload
+        max_workers (int): Number of files uploaded at the same time
+        transfer_config (Optional[TransferConfig]): Multipart settings
+        max_retries (int): Retries per file after the first attempt
+
+    Returns:
+        Dict[str, Any]: Upload report (see upload_files) plus the list of
+            skipped files with unsupported types
+
+    Raises:
+        NotADirectoryError: If directory is not a directory
+    """
+    if not os.path.isdir(directory):
+        raise NotADirectoryError(f"Not a directory: {directory}")
+    skipped: List[str] = []
+    report = upload_files(bucket_name, iter_upload_plan(directory, skipped),
+                          max_workers, transfer_config, max_retries)
+    report["skipped"] = skipped
+    return report
+
+
+def retry_failed_uploads(bucket_name: str, report: Dict[str, Any],
+                         directory: str, **options: Any) -> Dict[str, Any]:
+    """
+    Re-uploads only the files that failed in a previous bulk upload report.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        report (Dict[str, Any]): Report returned by bulk_upload_directory
+        directory (str): Root directory the report was produced from
+        **options: Passed through to upload_files
+
+    Returns:
+        Dict[str, Any]: Report for the retried files only
+    """
+    files = [(path, generate_object_name(get_file_type(path), path,
+                                         directory))
+             for path in report["failed"]]
+    return upload_files(bucket_name, files, **options)
+
+
+def iter_objects(bucket_name: str, prefix: str = "",
+                 delimiter: Optional[str] = None,
+                 include_metadata: bool = False,
+                 max_items: Optional[int] = None,
+                 page_size: int = 1000) -> Iterator[Any]:
+    """
+    Lazily lists the objects in a bucket with list_objects_v2 pagination,
+    so results arrive page by page and memory use stays constant.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        prefix (str): Only list keys starting with this prefix
+        delimiter (Optional[str]): Group keys into folders, e.g. "/" to
+            browse the docs/, texts/ and pdfs/ layout one level at a time
+        include_metadata (bool): Yield dicts with Key, Size, LastModified
+            and ETag instead of bare keys
+        max_items (Optional[int]): Stop after this many entries
+        page_size (int): Keys requested per list call (at most 1000)
+
+    Yields:
+        str or Dict[str, Any]: Object keys, or metadata dicts. Folders
+            (common prefixes) end with the delimiter and, with metadata,
+            carry "IsFolder": True
+    """
+    s3 = create_s3_connection()
+    paginator = s3.get_paginator("list_objects_v2")
+    options: Dict[str, Any] = {"Bucket": bucket_name, "Prefix": prefix,
+                               "PaginationConfig": {"PageSize": page_size}}
+    if delimiter:
+        options["Delimiter"] = delimiter
+    count = 0
+    for page in paginator.paginate(**options):
+        entries: List[Any] = []
+        for folder in page.get("CommonPrefixes", []):
+            entries.append({"Key": folder["Prefix"], "IsFolder": True}
+                           if include_metadata else folder["Prefix"])
+        for obj in page.get("Contents", []):
+            entries.append({"Key": obj["Key"], "Size": obj["Size"],
+                            "LastModified": obj["LastModified"],
+                            "ETag": obj["ETag"].strip('"')}
+                           if include_metadata else obj["Key"])
+        for entry in entries:
+            if max_items is not None and count >= max_items:
+                return
+            count += 1
+            yield entry
+
+
+def list_object_keys(bucket_name: str, prefix: str = "",
+                     limit: Optional[int] = None,
+                     refresh: bool = False) -> List[str]:
+    """
+    Returns object keys from the metadata index, re-listing the prefix
+    from S3 only when the indexed listing is older than the TTL.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        prefix (str): Only return keys starting with this prefix
+        limit (Optional[int]): Return at most this many keys
+        refresh (bool): Always re-list the prefix from S3
+
+    Returns:
+        List[str]: Object keys in key order
+    """
+    index = get_metadata_index()
+    if refresh or not index.is_fresh(bucket_name, prefix):
+        index.refresh_objects(bucket_name, prefix, iter_objects(
+            bucket_name, prefix, include_metadata=True))
+    return index.object_keys(bucket_name, prefix, limit)
+
+
+def format_object_entry(entry: Dict[str, Any]) -> str:
+    """
+    Formats one iter_objects metadata entry for display.
+
+    Args:
+        entry (Dict[str, Any]): Entry yielded with include_metadata=True
+
+    Returns:
+        str: Display line
+    """
+    if entry.get("IsFolder"):
+        return f"{'<DIR>':>12}  {'':19}  {entry['Key']}"
+    modified = entry["LastModified"].strftime("%Y-%m-%d %H:%M:%S")
+    return f"{entry['Size']:>12}  {modified}  {entry['Key']}"
+
+
+def view_objects(bucket_name: str, prefix: str = "",
+                 delimiter: Optional[str] = None,
+                 show_metadata: bool = False,
+                 max_items: Optional[int] = None) -> int:
+    """
+    Prints the objects in a specified bucket as they are listed.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        prefix (str): Only show keys starting with this prefix
+        delimiter (Optional[str]): Show folders instead of nested keys
+        show_metadata (bool): Also print size and last-modified time
+        max_items (Optional[int]): Stop after this many entries
+
+    Returns:
+        int: Number of entries printed
+    """
+    count = 0
+    started = time.perf_counter()
+    try:
+        for entry in iter_objects(bucket_name, prefix, delimiter,
+                                  show_metadata, max_items):
+            if count == 0:
+                print("---------")
+                print(f"{bucket_name}/{prefix} content: ")
+            print(format_object_entry(entry) if show_metadata else entry)
+            count += 1
+        if count == 0:
+            print(f'No objects in {bucket_name}/{prefix}')
+        log_operation("list_objects", started, bucket_name, prefix)
+    except Exception as e:
+        log_operation("list_objects", started, bucket_name, prefix, error=e)
+    return count
+
 
 def delete_object(bucket_name: str, object_key: str) -> None:
     """
@@ -177,31 +953,638 @@ def delete_object(bucket_name: str, object_key: str) -> None:
         bucket_name (str): Name of the S3 bucket
         object_key (str): Key of the object to delete
     """
+    started = time.perf_counter()
     try:
         s3 = create_s3_connection()
         s3.delete_object(Bucket=bucket_name, Key=object_key)
-        log_success(f"Deleted {object_key} from {bucket_name}")
+        get_metadata_index().forget_objects(bucket_name, [object_key])
+        log_operation("delete_object", started, bucket_name, object_key)
     except Exception as e:
-        log_error("Deleting object", e)
+        log_operation("delete_object", started, bucket_name, object_key,
+                      error=e)
 
-def delete_bucket(bucket_name: str) -> None:
+
+def is_bucket_versioned(s3: BaseClient, bucket_name: str) -> bool:
+    """
+    Checks whether a bucket has (or has had) versioning turned on.
+
+    Args:
+        s3 (BaseClient): S3 client
+        bucket_name (str): Name of the S3 bucket
+
+    Returns:
+        bool: True if object versions may exist in the bucket
+    """
+    status = s3.get_bucket_versioning(Bucket=bucket_name).get("Status")
+    return status in ("Enabled", "Suspended")
+
+
+def iter_delete_batches(s3: BaseClient, bucket_name: str, prefix: str = "",
+                        versioned: bool = False
+                        ) -> Iterator[List[Dict[str, str]]]:
+    """
+    Pages through every key (or every version and delete marker of a
+    versioned bucket) under a prefix, in delete_objects sized batches.
+
+    Args:
+        s3 (BaseClient): S3 client
+        bucket_name (str): Name of the S3 bucket
+        prefix (str): Only list keys starting with this prefix
+        versioned (bool): List object versions instead of current keys
+
+    Yields:
+        List[Dict[str, str]]: Up to DELETE_BATCH_SIZE object identifiers
+    """
+    batch: List[Dict[str, str]] = []
+    if versioned:
+        paginator = s3.get_paginator("list_object_versions")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            for item in (page.get("Versions", [])
+                         + page.get("DeleteMarkers", [])):
+                batch.append({"Key": item["Key"],
+                              "VersionId": item["VersionId"]})
+                if len(batch) == DELETE_BATCH_SIZE:
+                    yield batch
+                    batch = []
+    else:
+        paginator = s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            for item in page.get("Contents", []):
+                batch.append({"Key": item["Key"]})
+                if len(batch) == DELETE_BATCH_SIZE:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def print_delete_progress(deleted: int) -> None:
+    """
+    Prints how many objects have been deleted so far.
+
+    Args:
+        deleted (int): Objects deleted so far
+    """
+    print(f"\rDeleted {deleted} objects", end="", flush=True)
+
+
+def delete_batches(bucket_name: str,
+                   batches: Iterable[List[Dict[str, str]]],
+                   max_workers: int = 8,
+                   progress: Optional[Callable[[int], None]] = None
+                   ) -> Dict[str, Any]:
+    """
+    Sends delete_objects requests for batches of up to 1000 object
+    identifiers concurrently, consuming the batches lazily.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        batches (Iterable[List[Dict[str, str]]]): Batches of {"Key": ...}
+            (and optionally "VersionId") dicts
+        max_workers (int): Number of delete_objects calls in flight
+        progress (Optional[Callable[[int], None]]): Called with the running
+            total of deleted objects after each batch
+
+    Returns:
+        Dict[str, Any]: Report with the deleted count, up to
+            MAX_REPORTED_ERRORS per-key errors, the error count and
+            elapsed seconds
+    """
+    s3 = create_s3_connection()
+    report: Dict[str, Any] = {"deleted": 0, "error_count": 0, "errors": []}
+    lock = threading.Lock()
+    # Only list ahead of the deletes by a few batches
+    slots = threading.BoundedSemaphore(max_workers * 2)
+
+    def delete_batch(batch: List[Dict[str, str]]) -> None:
+        batch_started = time.perf_counter()
+        error = None
+        try:
+            response = s3.delete_objects(
+                Bucket=bucket_name,
+                Delete={"Objects": batch, "Quiet": True})
+            errors = response.get("Errors", [])
+        except Exception as e:
+            error = e
+            errors = [{"Key": item["Key"], "Message": str(e)}
+                      for item in batch]
+        finally:
+            slots.release()
+        if errors and error is None:
+            error = RuntimeError(f"{len(errors)} of {len(batch)} keys "
+                                 f"failed, first: {errors[0]['Key']}")
+        with lock:
+            report["deleted"] += len(batch) - len(errors)
+            report["error_count"] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(report["errors"])
+            report["errors"].extend(errors[:max(room, 0)])
+            deleted = report["deleted"]
+        try:
+            log_operation("delete_objects", batch_started, bucket_name,
+                          batch[0]["Key"], error=error)
+            if progress:
+                progress(deleted)
+        except Exception as e:
+            # Nothing waits on the future; the keys are gone, but the
+            # failure still has to show up in the report
+            with lock:
+                if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                    report["errors"].append(
+                        {"Key": batch[0]["Key"],
+                         "Message": f"after delete: {e}"})
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for batch in batches:
+            slots.acquire()
+            pool.submit(delete_batch, batch)
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def purge_objects(bucket_name: str, prefix: str = "", max_workers: int = 8,
+                  progress: Optional[Callable[[int], None]] = None
+                  ) -> Dict[str, Any]:
+    """
+    Deletes every object (and every version, if the bucket is versioned)
+    under a prefix, sending delete_objects batches of up to 1000 keys
+    concurrently.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        prefix (str): Only delete keys starting with this prefix;
+            "" empties the whole bucket
+        max_workers (int): Number of delete_objects calls in flight
+        progress (Optional[Callable[[int], None]]): Called with the running
+            total of deleted objects after each batch
+
+    Returns:
+        Dict[str, Any]: Report as returned by delete_batches
+    """
+    started = time.perf_counter()
+    s3 = create_s3_connection()
+    versioned = is_bucket_versioned(s3, bucket_name)
+    report = delete_batches(
+        bucket_name, iter_delete_batches(s3, bucket_name, prefix, versioned),
+        max_workers, progress)
+    index = get_metadata_index()
+    if report["error_count"]:
+        index.invalidate(bucket_name)
+    else:
+        index.forget_prefix(bucket_name, prefix)
+    log_operation("purge_objects", started, bucket_name, prefix)
+    return report
+
+
+def delete_bucket(bucket_name: str, max_workers: int = 8,
+                  progress: Optional[Callable[[int], None]] = None) -> None:
     """
     Deletes a bucket and all its contents.
 
     Args:
         bucket_name (str): Name of the S3 bucket to delete
+        max_workers (int): Number of delete_objects batches in flight
+        progress (Optional[Callable[[int], None]]): Progress callback,
+            see purge_objects
+
+    Raises:
+        RuntimeError: If some objects could not be deleted
     """
+    started = time.perf_counter()
     try:
+        report = purge_objects(bucket_name, max_workers=max_workers,
+                               progress=progress)
+        if report["error_count"]:
+            raise RuntimeError(
+                f"{report['error_count']} objects could not be deleted, "
+                f"first error: {report['errors'][0]}")
         s3 = create_s3_connection()
-        objects = s3.list_objects(Bucket=bucket_name)
-        if "Contents" in objects and objects["Contents"]:
-            for obj in objects["Contents"]:
-                delete_object(bucket_name, obj["Key"])
-
         s3.delete_bucket(Bucket=bucket_name)
-        log_success(f"Deleted bucket {bucket_name}")
+        get_metadata_index().remove_bucket(bucket_name)
+        log_operation("delete_bucket", started, bucket_name)
     except Exception as e:
-        log_error("Deleting bucket", e)
+        log_operation("delete_bucket", started, bucket_name, error=e)
+        raise
+
+
+def file_etag(file_path: str, part_size: Optional[int] = None) -> str:
+    """
+    Computes the ETag S3 gives an unencrypted upload of a local file.
+
+    Args:
+        file_path (str): Path to the file
+        part_size (Optional[int]): Multipart part size; None for the plain
+            MD5 of a single-part upload
+
+    Returns:
+        str: Hex MD5, or "<md5 of part md5s>-<part count>" for multipart
+    """
+    whole = hashlib.md5()
+    digests = []
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(part_size or MB)
+            if not chunk:
+                break
+            if part_size:
+                digests.append(hashlib.md5(chunk).digest())
+            else:
+                whole.update(chunk)
+    if not part_size:
+        return whole.hexdigest()
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+def local_matches_etag(file_path: str, etag: str, part_size: int) -> bool:
+    """
+    Checks a local file against a remote ETag without asking S3 for the
+    part size. Multipart ETags are tried with our own part size first,
+    then common tool defaults.
+
+    Args:
+        file_path (str): Path to the file
+        etag (str): ETag of the remote object
+        part_size (int): multipart_chunksize used by this tool
+
+    Returns:
+        bool: True if the contents match
+    """
+    etag = etag.strip('"')
+    if "-" not in etag:
+        return file_etag(file_path) == etag
+    parts = int(etag.rsplit("-", 1)[1])
+    size = os.path.getsize(file_path)
+    candidates = [part_size] + [n * MB for n in (5, 8, 16, 32, 64, 100)]
+    for candidate in dict.fromkeys(candidates):
+        if -(-size // candidate) == parts and \
+                file_etag(file_path, candidate) == etag:
+            return True
+    return False
+
+
+def multipart_part_size(s3: BaseClient, bucket_name: str, object_key: str,
+                        etag: str) -> Optional[int]:
+    """
+    Looks up the part size a multipart object was uploaded with, which
+    its ETag depends on.
+
+    Args:
+        s3 (BaseClient): S3 client
+        bucket_name (str): Name of the S3 bucket
+        object_key (str): Key of the object
+        etag (str): Multipart ETag of the object
+
+    Returns:
+        Optional[int]: Size in bytes of the first part, or None if the
+            object reports a different part count than its ETag
+    """
+    etag = etag.strip('"')
+    # Only the part count is compared: S3 stand-ins differ in which ETag
+    # they return for a part, and a replaced object fails the check anyway
+    head = s3.head_object(Bucket=bucket_name, Key=object_key, PartNumber=1)
+    if head.get("PartsCount") != int(etag.rsplit("-", 1)[1]):
+        return None
+    return head["ContentLength"]
+
+
+def local_matches_object(s3: BaseClient, bucket_name: str, object_key: str,
+                         etag: str, size: int, file_path: str) -> bool:
+    """
+    Checks whether a local file has the contents of a remote object,
+    using the object's real part size for multipart ETags.
+
+    Args:
+        s3 (BaseClient): S3 client
+        bucket_name (str): Name of the S3 bucket
+        object_key (str): Key of the object
+        etag (str): ETag of the object
+        size (int): Size of the object in bytes
+        file_path (str): Path to the local file
+
+    Returns:
+        bool: True if the file exists and its size and ETag match
+    """
+    if not os.path.isfile(file_path) or os.path.getsize(file_path) != size:
+        return False
+    etag = etag.strip('"')
+    if "-" not in etag:
+        return file_etag(file_path) == etag
+    part_size = multipart_part_size(s3, bucket_name, object_key, etag)
+    return part_size is not None and file_etag(file_path, part_size) == etag
+
+
+def sync_matches_remote(s3: BaseClient, bucket_name: str, object_key: str,
+                        etag: str, file_path: str, part_size: int) -> bool:
+    """
+    Checks a local file against a remote ETag for sync, using the
+    object's real part size for multipart ETags when S3 reports it and
+    falling back to local_matches_etag's guesses otherwise.
+
+    Args:
+        s3 (BaseClient): S3 client
+        bucket_name (str): Name of the S3 bucket
+        object_key (str): Key of the object
+        etag (str): ETag of the object
+        file_path (str): Path to the local file
+        part_size (int): multipart_chunksize used by this tool
+
+    Returns:
+        bool: True if the contents match
+    """
+    etag = etag.strip('"')
+    if "-" in etag:
+        try:
+            real_part_size = multipart_part_size(s3, bucket_name, object_key,
+                                                 etag)
+        except Exception:
+            # e.g. an S3 stand-in without PartNumber support
+            real_part_size = None
+        if real_part_size is not None:
+            return file_etag(file_path, real_part_size) == etag
+    return local_matches_etag(file_path, etag, part_size)
+
+
+def sync_directory(bucket_name: str, directory: str, delete: bool = False,
+                   max_workers: int = 8,
+                   transfer_config: Optional[TransferConfig] = None,
+                   dry_run: bool = False,
+                   max_retries: int = 3) -> Dict[str, Any]:
+    """
+    Uploads only new or changed documents under a directory. Files are
+    compared by size and modification time first and only hashed against
+    the remote ETag when the local copy is newer but the same size; a
+    multipart ETag is checked with the part size S3 reports for it.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        directory (str): Root directory to sync
+        delete (bool): Also delete remote objects under docs/, texts/ and
+            pdfs/ that have no local counterpart
+        max_workers (int): Number of files uploaded at the same time
+        transfer_config (Optional[TransferConfig]): Multipart settings
+        dry_run (bool): Only report what would be uploaded and deleted
+        max_retries (int): Retries per file after the first attempt
+
+    Returns:
+        Dict[str, Any]: Upload report (see upload_files) plus unchanged,
+            planned upload, deleted and skipped counts
+
+    Raises:
+        NotADirectoryError: If directory is not a directory
+    """
+    if not os.path.isdir(directory):
+        raise NotADirectoryError(f"Not a directory: {directory}")
+    started = time.perf_counter()
+    transfer_config = transfer_config or build_transfer_config()
+    index = get_metadata_index()
+    s3 = create_s3_connection()
+    for prefix in SYNC_PREFIXES:
+        index.refresh_objects(bucket_name, prefix, iter_objects(
+            bucket_name, prefix, include_metadata=True))
+
+    skipped: List[str] = []
+    local_keys = set()
+    counts = {"unchanged": 0, "planned_uploads": 0}
+
+    def changed_files() -> Iterator[Tuple[str, str]]:
+        for file_path, key in iter_upload_plan(directory, skipped):
+            local_keys.add(key)
+            remote = index.get_object(bucket_name, key)
+            if remote is not None:
+                stat = os.stat(file_path)
+                if stat.st_size == remote["Size"]:
+                    modified = datetime.fromisoformat(remote["LastModified"])
+                    if stat.st_mtime <= modified.timestamp() or (
+                            remote["ETag"] and sync_matches_remote(
+                                s3, bucket_name, key, remote["ETag"],
+                                file_path,
+                                transfer_config.multipart_chunksize)):
+                        counts["unchanged"] += 1
+                        continue
+            counts["planned_uploads"] += 1
+            yield file_path, key
+
+    if dry_run:
+        report: Dict[str, Any] = {"uploaded": 0, "bytes": 0, "failed": {}}
+        for _ in changed_files():
+            pass
+    else:
+        report = upload_files(bucket_name, changed_files(), max_workers,
+                              transfer_config, max_retries)
+    report.update(counts, skipped=skipped, deleted=0)
+
+    if delete:
+        orphans = [key for prefix in SYNC_PREFIXES
+                   for key in index.object_keys(bucket_name, prefix)
+                   if key not in local_keys]
+        report["planned_deletes"] = len(orphans)
+        if orphans and not dry_run:
+            batches = ([{"Key": key}
+                        for key in orphans[i:i + DELETE_BATCH_SIZE]]
+                       for i in range(0, len(orphans), DELETE_BATCH_SIZE))
+            deleted = delete_batches(bucket_name, batches, max_workers)
+            report["deleted"] = deleted["deleted"]
+            report["delete_errors"] = deleted["errors"]
+            index.invalidate(bucket_name)
+    log_operation("sync_directory", started, bucket_name,
+                  size=report["bytes"])
+    return report
+
+
+def load_download_journal(journal_path: str, etag: str, size: int,
+                          part_size: int) -> Optional[Dict[str, Any]]:
+    """
+    Loads the progress journal of an interrupted download, if it belongs
+    to the same version of the object and the same part size.
+
+    Returns:
+        Optional[Dict[str, Any]]: Journal with the list of finished parts
+    """
+    try:
+        with open(journal_path) as f:
+            journal = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (journal.get("etag"), journal.get("size"),
+            journal.get("part_size")) != (etag, size, part_size):
+        return None
+    return journal
+
+
+def save_download_journal(journal_path: str,
+                          journal: Dict[str, Any]) -> None:
+    """
+    Atomically writes a download progress journal.
+    """
+    temp_path = journal_path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(journal, f)
+    os.replace(temp_path, journal_path)
+
+
+def download_object(bucket_name: str, object_key: str, destination: str,
+                    part_size: int = DOWNLOAD_PART_SIZE,
+                    max_workers: int = 8,
+                    verify: bool = True) -> Dict[str, Any]:
+    """
+    Downloads one object with concurrent byte-range GETs into a
+    preallocated file. Finished parts are recorded in a journal next to
+    the destination, so an interrupted download resumes where it stopped.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        object_key (str): Key of the object to download
+        destination (str): Local file path to write
+        part_size (int): Size in bytes of each ranged GET
+        max_workers (int): Number of ranged GETs in flight
+        verify (bool): Check the finished file against the object's ETag
+
+    Returns:
+        Dict[str, Any]: Report with key, bytes, parts, resumed parts,
+            elapsed seconds, MB/s and whether the ETag was verified
+
+    Raises:
+        ValueError: If verification fails; the partial file is discarded
+    """
+    operation_started = time.perf_counter()
+    s3 = create_s3_connection()
+    head = s3.head_object(Bucket=bucket_name, Key=object_key)
+    size = head["ContentLength"]
+    etag = head["ETag"].strip('"')
+    temp_path = destination + ".part"
+    journal_path = destination + ".download.json"
+    parts = max(1, -(-size // part_size))
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+
+    journal = load_download_journal(journal_path, etag, size, part_size)
+    if journal is None or not os.path.exists(temp_path):
+        journal = {"etag": etag, "size": size, "part_size": part_size,
+                   "done": []}
+        with open(temp_path, "wb") as f:
+            f.truncate(size)
+        save_download_journal(journal_path, journal)
+    done = set(journal["done"])
+    resumed = len(done)
+    lock = threading.Lock()
+
+    def fetch(part: int) -> None:
+        start = part * part_size
+        end = min(start + part_size, size) - 1
+        response = s3.get_object(Bucket=bucket_name, Key=object_key,
+                                 Range=f"bytes={start}-{end}",
+                                 IfMatch=head["ETag"])
+        with open(temp_path, "r+b") as f:
+            f.seek(start)
+            for chunk in response["Body"].iter_chunks(MB):
+                f.write(chunk)
+        with lock:
+            done.add(part)
+            journal["done"] = sorted(done)
+            save_download_journal(journal_path, journal)
+
+    started = time.perf_counter()
+    if size:
+        pending = [part for part in range(parts) if part not in done]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for future in [pool.submit(fetch, part) for part in pending]:
+                future.result()
+    elapsed = time.perf_counter() - started
+
+    verified = False
+    if verify and size:
+        verified = local_matches_object(s3, bucket_name, object_key,
+                                        head["ETag"], size, temp_path)
+        if not verified:
+            os.remove(temp_path)
+            os.remove(journal_path)
+            raise ValueError(f"Checksum mismatch for {object_key}")
+    os.replace(temp_path, destination)
+    os.remove(journal_path)
+    log_operation("download_object", operation_started, bucket_name,
+                  object_key, size)
+    return {"key": object_key, "bytes": size, "parts": parts,
+            "resumed_parts": resumed, "verified": verified,
+            "elapsed_seconds": round(elapsed, 3),
+            "mb_per_second": round(size / MB / elapsed, 2) if elapsed else 0.0}
+
+
+def download_prefix(bucket_name: str, prefix: str, destination_dir: str,
+                    max_workers: int = 8, part_workers: int = 4,
+                    part_size: int = DOWNLOAD_PART_SIZE) -> Dict[str, Any]:
+    """
+    Downloads every object under a prefix (or the whole bucket for "")
+    into a directory, mirroring the key layout. Several objects download
+    at once and each large object is split into ranged GETs. Files that
+    already exist with the object's size and ETag are skipped, so
+    re-running an interrupted job only fetches what is missing or has
+    changed.
+
+    Args:
+        bucket_name (str): Name of the S3 bucket
+        prefix (str): Only download keys starting with this prefix
+        destination_dir (str): Local directory to download into
+        max_workers (int): Number of objects downloaded at the same time
+        part_workers (int): Ranged GETs in flight per object
+        part_size (int): Size in bytes of each ranged GET
+
+    Returns:
+        Dict[str, Any]: Report with downloaded/skipped counts, bytes,
+            elapsed seconds, MB/s and a key -> error map of failures
+    """
+    root = os.path.abspath(destination_dir)
+    report: Dict[str, Any] = {"downloaded": 0, "skipped": 0, "bytes": 0,
+                              "failed": {}}
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(max_workers * 4)
+    s3 = create_s3_connection()
+
+    def download(entry: Dict[str, Any], destination: str) -> None:
+        file_started = time.perf_counter()
+        try:
+            if local_matches_object(s3, bucket_name, entry["Key"],
+                                    entry["ETag"], entry["Size"],
+                                    destination):
+                with lock:
+                    report["skipped"] += 1
+                return
+            result = download_object(bucket_name, entry["Key"], destination,
+                                     part_size, part_workers)
+            with lock:
+                report["downloaded"] += 1
+                report["bytes"] += result["bytes"]
+        except Exception as e:
+            with lock:
+                report["failed"][entry["Key"]] = str(e)
+            log_operation("download_object", file_started, bucket_name,
+                          entry["Key"], error=e)
+        finally:
+            slots.release()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for entry in iter_objects(bucket_name, prefix, include_metadata=True):
+            if entry["Key"].endswith("/"):
+                continue
+            destination = os.path.abspath(os.path.join(root, entry["Key"]))
+            if not destination.startswith(root + os.sep):
+                report["failed"][entry["Key"]] = "key escapes destination"
+                continue
+            slots.acquire()
+            pool.submit(download, entry, destination)
+    elapsed = time.perf_counter() - started
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["mb_per_second"] = round(report["bytes"] / MB / elapsed, 2) \
+        if elapsed else 0.0
+    return report
+
+
+def download_bucket(bucket_name: str, destination_dir: str,
+                    **options: Any) -> Dict[str, Any]:
+    """
+    Downloads a whole bucket into a directory; see download_prefix.
+    """
+    return download_prefix(bucket_name, "", destination_dir, **options)
+
 
 def main() -> None:
     """
@@ -214,9 +1597,15 @@ def main() -> None:
         "View all buckets",
         "Create new bucket",
         "Upload file",
+        "Bulk upload directory",
+        "Sync directory",
         "View bucket contents",
+        "Download objects",
         "Delete object",
+        "Purge objects by prefix",
         "Delete bucket",
+        "Refresh metadata index",
+        "Show performance summary",
         "Exit"
     ]
     while True:
@@ -225,7 +1614,7 @@ def main() -> None:
             choices=query_choices).ask()
         try:
             if query == "View all buckets":
-                view_all_active_buckets()
+                view_all_active_buckets(refresh=True)
             elif query == "Create new bucket":
                 create_new_bucket()
             elif query == "Upload file":
@@ -236,18 +1625,75 @@ def main() -> None:
                 file_path = questionary.text("Enter the filepath").ask()
                 file_type = file_path.split("/")[-1].split(".")[-1]
                 upload_file(bucket_name, file_path, file_type, buckets)
+            elif query == "Bulk upload directory":
+                buckets = view_all_active_buckets()
+                bucket_name = questionary.select(
+                    "Which bucket would you like to upload to?",
+                    choices=buckets).ask()
+                directory = questionary.text("Enter the directory").ask()
+                report = bulk_upload_directory(bucket_name, directory)
+                while True:
+                    print(f"Uploaded {report['uploaded']} files "
+                          f"({report['bytes']} bytes) in "
+                          f"{report['elapsed_seconds']}s, "
+                          f"{report['mb_per_second']} MB/s")
+                    for file_path, error in report["failed"].items():
+                        print(f"Failed: {file_path}: {error}")
+                    if not report["failed"] or not questionary.confirm(
+                            "Retry failed files?").ask():
+                        break
+                    report = retry_failed_uploads(bucket_name, report,
+                                                  directory)
+            elif query == "Sync directory":
+                buckets = view_all_active_buckets()
+                bucket_name = questionary.select(
+                    "Which bucket would you like to sync to?",
+                    choices=buckets).ask()
+                directory = questionary.text("Enter the directory").ask()
+                delete = questionary.confirm(
+                    "Delete remote documents missing locally?",
+                    default=False).ask()
+                report = sync_directory(bucket_name, directory, delete)
+                print(f"Uploaded {report['uploaded']}, unchanged "
+                      f"{report['unchanged']}, deleted {report['deleted']}, "
+                      f"failed {len(report['failed'])}")
             elif query == "View bucket contents":
                 buckets = view_all_active_buckets()
                 bucket_name = questionary.select(
                     "Which bucket would you like to view?", 
                     choices=buckets).ask()
-                view_objects(bucket_name) 
+                prefix = questionary.text(
+                    "Folder to view (e.g. docs/, blank for top level):").ask()
+                view_objects(bucket_name, prefix or "", delimiter="/",
+                             show_metadata=True)
+            elif query == "Download objects":
+                buckets = view_all_active_buckets()
+                bucket_name = questionary.select(
+                    "Which bucket would you like to download from?",
+                    choices=buckets).ask()
+                prefix = questionary.text(
+                    "Key or prefix to download (blank for whole bucket):"
+                ).ask() or ""
+                destination = questionary.text(
+                    "Download into directory:").ask()
+                report = download_prefix(bucket_name, prefix, destination)
+                print(f"Downloaded {report['downloaded']} objects "
+                      f"({report['mb_per_second']} MB/s), skipped "
+                      f"{report['skipped']}, failed {len(report['failed'])}")
+                for key, error in report["failed"].items():
+                    print(f"Failed: {key}: {error}")
             elif query == "Delete object":
                 buckets = view_all_active_buckets()
                 bucket_name = questionary.select(
                     "Which bucket would you like to delete an object from?", 
                     choices=buckets).ask()
-                objects = view_objects(bucket_name)  
+                prefix = questionary.text(
+                    "Only list keys starting with (optional):").ask()
+                objects = list_object_keys(bucket_name, prefix or "",
+                                           limit=OBJECT_PICKER_LIMIT)
+                if not objects:
+                    print(f"No objects in {bucket_name}/{prefix or ''}")
+                    continue
                 object_name = questionary.select(
                     "Which objects would you like to delete?", 
                     choices=objects).ask()
@@ -257,15 +1703,81 @@ def main() -> None:
                 bucket_name = questionary.select(
                     "Which bucket would you like to delete?", 
                     choices=buckets).ask()
-                delete_bucket(bucket_name) 
+                delete_bucket(bucket_name, progress=print_delete_progress)
+                print()
+            elif query == "Purge objects by prefix":
+                buckets = view_all_active_buckets()
+                bucket_name = questionary.select(
+                    "Which bucket would you like to purge?",
+                    choices=buckets).ask()
+                prefix = questionary.text(
+                    "Delete every object whose key starts with:").ask()
+                if not prefix:
+                    print("A prefix is required; use Delete bucket to "
+                          "empty a whole bucket.")
+                    continue
+                if questionary.confirm(
+                        f"Delete all objects under '{prefix}' "
+                        f"in {bucket_name}?").ask():
+                    report = purge_objects(bucket_name, prefix,
+                                           progress=print_delete_progress)
+                    print(f"\nDeleted {report['deleted']} objects, "
+                          f"{report['error_count']} errors")
+            elif query == "Refresh metadata index":
+                get_metadata_index().invalidate()
+                view_all_active_buckets(refresh=True)
+            elif query == "Show performance summary":
+                print_operation_summary()
             elif query == "Exit":
                 break
         except Exception as e:
             print(f"\nAn error occurred: {str(e)}")
             print("Please try again.\n")
-    
+
+    print_operation_summary()
+    stop_logging()
     print("Goodbye!")
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="AWS S3 Operations Manager; runs the interactive menu "
+                    "when no command is given")
+    commands = parser.add_subparsers(dest="command")
+    stream = commands.add_parser(
+        "upload-stream", help="upload a stream, e.g. stdin, to a bucket")
+    stream.add_argument("bucket")
+    stream.add_argument("name", help="document file name; its extension "
+                                     "picks the docs/texts/pdfs folder")
+    stream.add_argument("--input", default="-",
+                        help="file to read instead of stdin")
+    stream.add_argument("--compress", choices=sorted(COMPRESSIONS))
+    stream.add_argument("--key", help="object key instead of the "
+                                      "generated one")
+    return parser.parse_args(argv)
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.command != "upload-stream":
+        main()
+        return 0
+    try:
+        if args.input == "-":
+            report = upload_stream(args.bucket, sys.stdin.buffer, args.name,
+                                   args.compress, args.key)
+        else:
+            with open(args.input, "rb") as f:
+                report = upload_stream(args.bucket, f, args.name,
+                                       args.compress, args.key)
+    except Exception as e:
+        print(f"Upload failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        stop_logging()
+    print(json.dumps(report))
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())
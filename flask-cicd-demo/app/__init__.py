@@ -1,5 +1,20 @@
 from flask import Flask
+from database.pool import DEFAULT_PRAGMAS
 app = Flask(__name__)
-from app import routes
-from database import setup_db
-setup_db.main()
+app.config.from_mapping(
+    DATABASE="todo.db",
+    DB_POOL_SIZE=8,
+    DB_TIMEOUT=5.0,
+    DB_PRAGMAS=DEFAULT_PRAGMAS,
+    AUTO_MIGRATE=True,
+    RESPONSE_CACHE_SIZE=256,
+    RESPONSE_CACHE_MAX_BYTES=32 * 1024 * 1024,
+    RESPONSE_CACHE_MAX_ENTRY_BYTES=1024 * 1024,
+    RESPONSE_CACHE_EPOCH_CHECK_SECONDS=1.0,
+    SLOW_QUERY_THRESHOLD_MS=None,
+    BACKUP_BUCKET=None,
+    BACKUP_PREFIX="todo-db/",
+    BACKUP_COMPRESSION="gzip",
+    BACKUP_KEEP=48,
+)
+from app import routes, commands
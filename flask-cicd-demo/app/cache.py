@@ -0,0 +1,87 @@
+from collections import OrderedDict
+import threading
+import time
+import uuid
+
+
+class ResponseCache:
+    """LRU cache of rendered GET responses, tagged with a data version.
+
+    The cache holds at most ``max_entries`` responses and ``max_bytes``
+    bytes of them. A response larger than ``max_entry_bytes`` (an
+    unpaginated listing of a big table, say) is not cached at all.
+
+    Every successful write bumps ``version``, which drops all cached
+    entries at once; an entry rendered under an older version is never
+    served. The boot id keeps ETags from colliding across restarts.
+    ``observe_epoch`` drops everything when the database's sync epoch
+    changes, i.e. when it was restored from a snapshot by another process.
+    """
+
+    def __init__(
+        self,
+        max_entries=256,
+        max_bytes=32 * 1024 * 1024,
+        max_entry_bytes=1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.size = 0
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.epoch = None
+        self._epoch_checked = float("-inf")
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def etag(self, version):
+        return f"{self.boot_id}-{version}"
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self.size = 0
+
+    def epoch_check_due(self, interval):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._epoch_checked < interval:
+                return False
+            self._epoch_checked = now
+            return True
+
+    def observe_epoch(self, epoch):
+        with self._lock:
+            changed = self.epoch is not None and epoch != self.epoch
+            self.epoch = epoch
+        if changed:
+            self.bump()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, value, size):
+        if size > self.max_entry_bytes:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[2]
+            self._entries[key] = (version, value, size)
+            self.size += size
+            while self._over_limit():
+                self.size -= self._entries.popitem(last=False)[1][2]
+
+    def _over_limit(self):
+        if len(self._entries) > self.max_entries:
+            return True
+        return self.size > self.max_bytes
@@ -0,0 +1,207 @@
+from app import app
+from database.backup import (
+    PAGES_PER_STEP,
+    configure_s3,
+    find_snapshot,
+    list_snapshots,
+    parse_snapshot_key,
+    prune_snapshots,
+    restore_snapshot,
+    take_snapshot,
+)
+from database.migrations import SCHEMA_VERSION, get_schema_version, migrate
+from database.setup_db import create_connection
+import click
+import sqlite3
+import time
+
+MB = 1024 * 1024
+
+
+@app.cli.command("init-db")
+def init_db():
+    """Apply pending schema migrations to the configured database."""
+    conn, cursor = create_connection(app.config["DATABASE"])
+    try:
+        before = get_schema_version(conn)
+        try:
+            migrated = migrate(conn)
+        except sqlite3.DatabaseError as e:
+            raise click.ClickException(f"Migration failed: {e}")
+        if migrated:
+            after = SCHEMA_VERSION
+            click.echo(f"Migrated schema from version {before} to {after}")
+        else:
+            click.echo(f"Schema is current (version {before})")
+    finally:
+        conn.close()
+
+
+def backup_location(bucket, prefix, endpoint_url):
+    bucket = bucket or app.config["BACKUP_BUCKET"]
+    if not bucket:
+        raise click.UsageError(
+            "No backup bucket: pass --bucket or set TODO_BACKUP_BUCKET"
+        )
+    configure_s3(endpoint_url)
+    return bucket, app.config["BACKUP_PREFIX"] if prefix is None else prefix
+
+
+bucket_option = click.option(
+    "--bucket",
+    envvar="TODO_BACKUP_BUCKET",
+    help="S3 bucket holding the snapshots",
+)
+prefix_option = click.option("--prefix", help="key prefix of the snapshots")
+endpoint_option = click.option(
+    "--endpoint-url",
+    envvar="S3_ENDPOINT_URL",
+    help="S3 endpoint, e.g. a local stand-in",
+)
+
+
+@app.cli.command("backup-db")
+@bucket_option
+@prefix_option
+@endpoint_option
+@click.option("--compression", type=click.Choice(["gzip", "zstd"]))
+@click.option(
+    "--keep",
+    type=int,
+    help="snapshots to keep; older ones are deleted",
+)
+@click.option(
+    "--every",
+    type=float,
+    help="take a snapshot every N seconds until interrupted",
+)
+@click.option(
+    "--pages",
+    type=int,
+    default=PAGES_PER_STEP,
+    help="database pages copied per backup step",
+)
+@click.option(
+    "--pause",
+    type=float,
+    default=0.0,
+    help="seconds to sleep between backup steps",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="upload even if the database has not changed",
+)
+def backup_db(
+    bucket, prefix, endpoint_url, compression, keep, every, pages, pause, force
+):
+    """Snapshot the configured database to S3 while it stays online."""
+    bucket, prefix = backup_location(bucket, prefix, endpoint_url)
+    compression = compression or app.config["BACKUP_COMPRESSION"]
+    keep = app.config["BACKUP_KEEP"] if keep is None else keep
+    last = None
+    while True:
+        started = time.monotonic()
+        try:
+            report = take_snapshot(
+                app.config["DATABASE"],
+                bucket,
+                prefix,
+                compression,
+                pages,
+                pause,
+                force=force,
+                last=last,
+            )
+        except Exception as e:
+            if every is None:
+                raise click.ClickException(f"Backup failed: {e}")
+            click.echo(f"Backup failed: {e}", err=True)
+        else:
+            last = parse_snapshot_key(report["key"], prefix)
+            if report["skipped"]:
+                click.echo(f"Unchanged since s3://{bucket}/{report['key']}")
+            else:
+                click.echo(
+                    f"Snapshot s3://{bucket}/{report['key']}: "
+                    f"{report['database_bytes'] / MB:.1f} MB -> "
+                    f"{report['uploaded_bytes'] / MB:.1f} MB, copied in "
+                    f"{report['copy_seconds']} s, uploaded in "
+                    f"{report['upload_seconds']} s"
+                )
+                if keep:
+                    pruned = prune_snapshots(bucket, prefix, keep)
+                    if pruned:
+                        click.echo(f"Deleted {len(pruned)} old snapshots")
+        if every is None:
+            return
+        time.sleep(max(every - (time.monotonic() - started), 0))
+
+
+@app.cli.command("list-backups")
+@bucket_option
+@prefix_option
+@endpoint_option
+def list_backups(bucket, prefix, endpoint_url):
+    """List the snapshots in S3, oldest first."""
+    bucket, prefix = backup_location(bucket, prefix, endpoint_url)
+    try:
+        snapshots = list_snapshots(bucket, prefix)
+    except Exception as e:
+        raise click.ClickException(f"Could not list snapshots: {e}")
+    if not snapshots:
+        click.echo(f"No snapshots in s3://{bucket}/{prefix}")
+    for info in snapshots:
+        click.echo(
+            f"{info['taken_at'].isoformat()}  "
+            f"revision {info['revision']:<8}  "
+            f"{info['size'] / MB:8.1f} MB  {info['key']}"
+        )
+
+
+@app.cli.command("restore-db")
+@bucket_option
+@prefix_option
+@endpoint_option
+@click.option(
+    "--at",
+    help="restore the latest snapshot taken at or before "
+    "this ISO 8601 time (UTC unless given)",
+)
+@click.option("--key", help="restore this snapshot key")
+@click.option(
+    "--to",
+    "target",
+    help="database file to restore into, default the app's",
+)
+@click.option("--yes", is_flag=True, help="do not ask for confirmation")
+def restore_db(bucket, prefix, endpoint_url, at, key, target, yes):
+    """Restore the database from a snapshot in S3."""
+    bucket, prefix = backup_location(bucket, prefix, endpoint_url)
+    target = target or app.config["DATABASE"]
+    if key is None:
+        try:
+            info = find_snapshot(list_snapshots(bucket, prefix), at)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--at")
+        except Exception as e:
+            raise click.ClickException(f"Could not list snapshots: {e}")
+        if info is None:
+            raise click.ClickException(
+                f"No snapshot in s3://{bucket}/{prefix}"
+                + (f" at or before {at}" if at else "")
+            )
+        key = info["key"]
+    if not yes:
+        click.confirm(
+            f"Replace the contents of {target} with s3://{bucket}/{key}?",
+            abort=True,
+        )
+    try:
+        report = restore_snapshot(target, bucket, prefix, key=key)
+    except Exception as e:
+        raise click.ClickException(f"Restore failed: {e}")
+    click.echo(
+        f"Restored {target} to revision {report['revision']} "
+        f"({report['taken_at']}) in {report['seconds']} s"
+    )
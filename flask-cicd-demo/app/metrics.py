@@ -0,0 +1,237 @@
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+METRIC_HELP = {
+    "todo_http_request_duration_seconds": (
+        "histogram",
+        "Time spent handling a request, by route.",
+    ),
+    "todo_http_requests_total": (
+        "counter",
+        "Requests handled, by route and status code.",
+    ),
+    "todo_http_request_errors_total": (
+        "counter",
+        "Requests that ended in a 5xx response, by route.",
+    ),
+    "todo_db_connection_acquire_seconds": (
+        "histogram",
+        "Time spent waiting for a pooled connection.",
+    ),
+    "todo_db_query_duration_seconds": (
+        "histogram",
+        "Time spent executing a statement, by template.",
+    ),
+    "todo_db_query_rows_total": (
+        "counter",
+        "Rows fetched or modified, by statement template.",
+    ),
+    "todo_db_query_errors_total": (
+        "counter",
+        "Statements that raised a database error.",
+    ),
+}
+
+PLACEHOLDER_LIST = re.compile(r"\?(\s*,\s*\?)+")
+
+
+def statement_template(sql):
+    sql = " ".join(sql.split())
+    return PLACEHOLDER_LIST.sub("?, ...", sql)[:200]
+
+
+def escape_label(value):
+    value = str(value).replace("\\", "\\\\")
+    return value.replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{escape_label(val)}"' for key, val in labels)
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms rendered in Prometheus format."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def render(self):
+        lines = []
+        with self._lock:
+            series = {}
+            for (name, labels), value in self._counters.items():
+                series.setdefault(name, []).append((labels, value))
+            for (name, labels), value in self._histograms.items():
+                series.setdefault(name, []).append((labels, value))
+            for name in sorted(series):
+                kind, text = METRIC_HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                ordered = sorted(series[name], key=lambda item: item[0])
+                for labels, value in ordered:
+                    if isinstance(value, Histogram):
+                        histogram = self._render_histogram(name, labels, value)
+                        lines.extend(histogram)
+                    else:
+                        lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _render_histogram(self, name, labels, histogram):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            bucket_labels = labels + (("le", repr(bound)),)
+            yield f"{name}_bucket{format_labels(bucket_labels)} {cumulative}"
+        inf_labels = labels + (("le", "+Inf"),)
+        yield f"{name}_bucket{format_labels(inf_labels)} {histogram.count}"
+        yield f"{name}_sum{format_labels(labels)} {histogram.total}"
+        yield f"{name}_count{format_labels(labels)} {histogram.count}"
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports statement latency, row counts and errors."""
+
+    template = None
+
+    def _record(self, sql, started, error=None):
+        registry = self.connection.registry
+        elapsed = time.perf_counter() - started
+        self.template = statement_template(sql)
+        registry.observe(
+            "todo_db_query_duration_seconds", elapsed, statement=self.template
+        )
+        if error is not None:
+            registry.inc(
+                "todo_db_query_errors_total",
+                statement=self.template,
+                error=type(error).__name__,
+            )
+        elif self.rowcount > 0:
+            registry.inc(
+                "todo_db_query_rows_total",
+                self.rowcount,
+                statement=self.template,
+            )
+        threshold = self.connection.slow_query_seconds
+        if threshold is not None and elapsed >= threshold:
+            self.connection.logger.warning(
+                "slow query (%.1f ms): %s", elapsed * 1000, self.template
+            )
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except sqlite3.Error as e:
+            self._record(sql, started, e)
+            raise
+        self._record(sql, started)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except sqlite3.Error as e:
+            self._record(sql, started, e)
+            raise
+        self._record(sql, started)
+        return self
+
+    def _count_fetched(self, count):
+        if count and self.template is not None:
+            self.connection.registry.inc(
+                "todo_db_query_rows_total", count, statement=self.template
+            )
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._count_fetched(0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._count_fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count_fetched(len(rows))
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    registry = None
+    slow_query_seconds = None
+    logger = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+
+def connection_factory(registry, logger, slow_query_ms=None):
+    slow_query_seconds = None
+    if slow_query_ms is not None:
+        slow_query_seconds = slow_query_ms / 1000
+    return type(
+        "InstrumentedConnection",
+        (InstrumentedConnection,),
+        {
+            "registry": registry,
+            "slow_query_seconds": slow_query_seconds,
+            "logger": logger,
+        },
+    )
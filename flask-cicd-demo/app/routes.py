@@ -1,35 +1,386 @@
 from app import app
-from flask import jsonify, request
-from database.setup_db import create_connection, to_dict
+from app.cache import ResponseCache
+from app.metrics import MetricsRegistry, connection_factory
+from flask import Response, g, jsonify, request
+from database.migrations import migrate
+from database.pool import ConnectionPool
+from database.setup_db import to_dict
+from functools import wraps
+from itertools import groupby
+import csv
+import io
+import json
 import sqlite3
+import threading
+import time
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+BULK_LOOKUP_CHUNK = 500
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 100
+COMPLETED_VALUES = ("incomplete", "complete")
+SORT_ORDERS = {"asc": "ASC", "desc": "DESC"}
+STREAM_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_FIELDS = ["task_id", "name", "description", "completed"]
+IMPORT_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+pool_lock = threading.Lock()
+response_cache = ResponseCache(
+    app.config["RESPONSE_CACHE_SIZE"],
+    max_bytes=app.config["RESPONSE_CACHE_MAX_BYTES"],
+    max_entry_bytes=app.config["RESPONSE_CACHE_MAX_ENTRY_BYTES"],
+)
+metrics = MetricsRegistry()
+
+
+def get_pool():
+    pool = app.extensions.get("db_pool")
+    if pool is None:
+        with pool_lock:
+            pool = app.extensions.get("db_pool")
+            if pool is None:
+                pool = ConnectionPool(
+                    app.config["DATABASE"],
+                    max_size=app.config["DB_POOL_SIZE"],
+                    timeout=app.config["DB_TIMEOUT"],
+                    pragmas=app.config["DB_PRAGMAS"],
+                    factory=connection_factory(
+                        metrics, app.logger,
+                        app.config["SLOW_QUERY_THRESHOLD_MS"]),
+                )
+                if app.config["AUTO_MIGRATE"]:
+                    conn = pool.acquire()
+                    try:
+                        migrate(conn)
+                    finally:
+                        pool.release(conn)
+                app.extensions["db_pool"] = pool
+    return pool
+
+
+def acquire_connection():
+    pool = get_pool()
+    started = time.perf_counter()
+    conn = pool.acquire()
+    metrics.observe("todo_db_connection_acquire_seconds",
+                    time.perf_counter() - started)
+    return conn
 
 
 def get_db_connection():
-    conn, cursor = create_connection()
-    return conn, cursor
+    if "db_conn" not in g:
+        g.db_conn = acquire_connection()
+    conn = g.db_conn
+    return conn, conn.cursor()
+
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop("db_conn", None)
+    if conn is not None:
+        get_pool().release(conn)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop("request_started", None)
+    if started is None:
+        return response
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    labels = {"method": request.method, "route": route}
+    metrics.observe("todo_http_request_duration_seconds",
+                    time.perf_counter() - started, **labels)
+    metrics.inc("todo_http_requests_total",
+                status=str(response.status_code), **labels)
+    if response.status_code >= 500:
+        metrics.inc("todo_http_request_errors_total", **labels)
+    return response
+
+
+@app.after_request
+def invalidate_response_cache(response):
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        response_cache.bump()
+    return response
+
+
+def check_database_epoch():
+    # Writes from this process bump the cache themselves; a restore by
+    # another process (flask restore-db) only shows up as a new epoch.
+    if response_cache.epoch_check_due(
+            app.config["RESPONSE_CACHE_EPOCH_CHECK_SECONDS"]):
+        conn, cursor = get_db_connection()
+        cursor.execute("SELECT epoch FROM sync_state")
+        response_cache.observe_epoch(cursor.fetchone()[0])
+
+
+def cached_response(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if "stream" in request.args:
+            return view(*args, **kwargs)
+        check_database_epoch()
+        version = response_cache.version
+        etag = response_cache.etag(version)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            key = request.full_path
+            cached = response_cache.get(key, version)
+            if cached is None:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                cached = (response.get_data(), response.mimetype)
+                response_cache.put(key, version, cached, len(cached[0]))
+            response = Response(cached[0], mimetype=cached[1])
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    return wrapper
+
+
+def parse_int_arg(name, default=None, minimum=0):
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return value
+
+
+def stream_tasks(query, params, fmt):
+    pool = get_pool()
+    conn = acquire_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        if fmt == "json":
+            yield "["
+        elif fmt == "csv":
+            yield ",".join(EXPORT_FIELDS) + "\r\n"
+        first = True
+        while True:
+            rows = cursor.fetchmany(STREAM_BATCH_SIZE)
+            if not rows:
+                break
+            if fmt == "csv":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(row[:4] for row in rows)
+                yield buffer.getvalue()
+                continue
+            chunk = []
+            for row in rows:
+                item = json.dumps(to_dict(row))
+                if fmt == "ndjson":
+                    chunk.append(item + "\n")
+                else:
+                    chunk.append(item if first else "," + item)
+                first = False
+            yield "".join(chunk)
+        if fmt == "json":
+            yield "]"
+    finally:
+        pool.release(conn)
+
+
+def name_prefix_bound(prefix):
+    last = ord(prefix[-1])
+    if last >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(last + 1)
+
+
+def build_task_query(after=None):
+    clauses = []
+    params = []
+    completed = request.args.get("completed")
+    if completed is not None:
+        if completed not in COMPLETED_VALUES:
+            raise ValueError("completed must be one of: " +
+                             ", ".join(COMPLETED_VALUES))
+        # Inlined (not bound) so the partial index on completed applies.
+        clauses.append(f"completed = '{completed}'")
+    prefix = request.args.get("name_prefix")
+    if prefix:
+        clauses.append("name >= ?")
+        params.append(prefix)
+        upper = name_prefix_bound(prefix)
+        if upper is not None:
+            clauses.append("name < ?")
+            params.append(upper)
+    order = request.args.get("order", "asc").lower()
+    if order not in SORT_ORDERS:
+        raise ValueError("order must be asc or desc")
+    if after is not None:
+        clauses.append("task_id > ?" if order == "asc" else "task_id < ?")
+        params.append(after)
+
+    query = "SELECT * FROM tasks"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += f" ORDER BY task_id {SORT_ORDERS[order]}"
+    return query, params
 
 
 @app.route('/tasks', methods=['GET'])
 @app.route('/', methods=['GET'])
+@cached_response
 def get_tasks():
+    try:
+        after = parse_int_arg("after")
+        limit = parse_int_arg("limit", minimum=1)
+        offset = parse_int_arg("offset")
+        query, params = build_task_query(after)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    fmt = request.args.get("stream")
+    if fmt is not None:
+        if fmt not in STREAM_FORMATS:
+            return jsonify({"message": "stream must be one of: " +
+                            ", ".join(STREAM_FORMATS)}), 400
+        return Response(
+            stream_tasks(query, params, fmt),
+            mimetype=STREAM_FORMATS[fmt],
+        )
+
     conn, cursor = get_db_connection()
-    query = "SELECT * FROM tasks"
-    cursor.execute(query)
+    if after is None and limit is None and offset is None:
+        cursor.execute(query, params)
+        result = cursor.fetchall()
+        return jsonify({
+            "message": "Tasks found",
+            "data": [to_dict(task) for task in result]
+        }), 200
+
+    limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    # offset jumps to a page by number; following next_cursor is cheaper
+    # for sequential paging since it seeks on task_id instead of skipping.
+    cursor.execute(query + " LIMIT ? OFFSET ?",
+                   params + [limit + 1, offset or 0])
+    result = cursor.fetchall()
+    next_cursor = None
+    if len(result) > limit:
+        result = result[:limit]
+        next_cursor = result[-1][0]
+    return jsonify({
+        "message": "Tasks found",
+        "data": [to_dict(task) for task in result],
+        "next_cursor": next_cursor
+    }), 200
+
+
+def build_match_query(text):
+    terms = []
+    for token in text.split():
+        prefix = token.endswith("*")
+        token = token.rstrip("*").replace('"', '""')
+        if token:
+            terms.append(f'"{token}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+@app.route('/tasks/search', methods=['GET'])
+@cached_response
+def search_tasks():
+    match = build_match_query(request.args.get("q", ""))
+    if not match:
+        return jsonify({"message": "q is required"}), 400
+    try:
+        offset = parse_int_arg("offset", default=0)
+        limit = parse_int_arg("limit", default=DEFAULT_PAGE_SIZE, minimum=1)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    conn, cursor = get_db_connection()
+    query = """
+    SELECT tasks.* FROM tasks_fts
+    JOIN tasks ON tasks.task_id = tasks_fts.rowid
+    WHERE tasks_fts MATCH ?
+    ORDER BY tasks_fts.rank
+    LIMIT ? OFFSET ?
+    """
+    cursor.execute(query, (match, limit + 1, offset))
     result = cursor.fetchall()
-    conn.close()
+    next_offset = None
+    if len(result) > limit:
+        result = result[:limit]
+        next_offset = offset + limit
     return jsonify({
         "message": "Tasks found",
-        "data": [to_dict(task) for task in result]
+        "data": [to_dict(task) for task in result],
+        "next_offset": next_offset
+    }), 200
+
+
+@app.route('/tasks/changes', methods=['GET'])
+@cached_response
+def get_task_changes():
+    try:
+        since = parse_int_arg("since", default=0)
+        limit = parse_int_arg("limit", default=MAX_PAGE_SIZE, minimum=1)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    conn, cursor = get_db_connection()
+    cursor.execute("SELECT revision, epoch FROM sync_state")
+    revision, epoch = cursor.fetchone()
+    # Task and tombstone revisions never collide, so each side is read
+    # through its revision index and the two sorted pages are merged.
+    cursor.execute("""
+    SELECT revision, task_id, name, description, completed, updated_at
+    FROM tasks WHERE revision > ? ORDER BY revision LIMIT ?
+    """, (since, limit + 1))
+    changes = [dict(to_dict(row[1:5]), revision=row[0], updated_at=row[5],
+                    deleted=False) for row in cursor.fetchall()]
+    cursor.execute("""
+    SELECT revision, task_id, deleted_at FROM task_tombstones
+    WHERE revision > ? ORDER BY revision LIMIT ?
+    """, (since, limit + 1))
+    changes.extend({"revision": row[0], "task_id": row[1],
+                    "updated_at": row[2], "deleted": True}
+                   for row in cursor.fetchall())
+    changes.sort(key=lambda change: change["revision"])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    return jsonify({
+        "message": "Changes found",
+        "data": changes,
+        "epoch": epoch,
+        "next_since": changes[-1]["revision"] if has_more else revision,
+        "has_more": has_more
     }), 200
 
 
 @app.route('/tasks/<int:task_id>', methods=['GET'])
+@cached_response
 def get_task(task_id):
     conn, cursor = get_db_connection()
     query = "SELECT * FROM tasks where task_id = ?"
     cursor.execute(query, (task_id,))
     result = cursor.fetchone()
-    conn.close()
     if not result:
         return jsonify({"message": "Failed to fetch task"}), 404
     return jsonify({
@@ -38,12 +389,47 @@ def get_task(task_id):
     }), 200
 
 
+def validate_task_fields(info):
+    if "name" in info and (not isinstance(info["name"], str)
+                           or not info["name"]):
+        return "name must be a non-empty string"
+    if "description" in info and not isinstance(info["description"],
+                                                (str, type(None))):
+        return "description must be a string or null"
+    return None
+
+
+def validate_new_task(info):
+    if not isinstance(info, dict) or "name" not in info or not info["name"]:
+        return "name is required"
+    return validate_task_fields(info)
+
+
+def build_task_update(info):
+    fields = []
+    values = []
+    if not isinstance(info, dict):
+        return fields, values
+
+    if "name" in info:
+        fields.append("name = ?")
+        values.append(info["name"])
+    if "description" in info:
+        fields.append("description = ?")
+        values.append(info["description"])
+    if "completed" in info and info["completed"] in COMPLETED_VALUES:
+        fields.append("completed = ?")
+        values.append(info["completed"])
+    return fields, values
+
+
 @app.route('/tasks', methods=['POST'])
 def create_task():
     conn, cursor = get_db_connection()
     info = request.get_json()
-    if "name" not in info or not info["name"]:
-        return jsonify({"message": "name is required"}), 400
+    error = validate_new_task(info)
+    if error:
+        return jsonify({"message": error}), 400
     query = """
     INSERT INTO tasks (name, description, completed)
     VALUES (?, ?, ?)
@@ -52,7 +438,6 @@ def create_task():
         "description", ""), "incomplete"))
     conn.commit()
     task_id = cursor.lastrowid
-    conn.close()
     return jsonify({
         "message": "successfully added new task",
         "task_id": task_id
@@ -63,28 +448,18 @@ def create_task():
 def update_task(task_id):
     conn, cursor = get_db_connection()
     info = request.get_json()
-    fields = []
-    values = []
-
-    if "name" in info:
-        fields.append("name = ?")
-        values.append(info["name"])
-    if "description" in info:
-        fields.append("description = ?")
-        values.append(info["description"])
-    if "completed" in info and info["completed"] in ["incomplete", "complete"]:
-        fields.append("completed = ?")
-        values.append(info["completed"])
+    error = validate_task_fields(info) if isinstance(info, dict) else None
+    if error:
+        return jsonify({"message": error}), 400
+    fields, values = build_task_update(info)
 
     if not fields:
-        conn.close()
         return jsonify({"message": "No valid fields to update"}), 400
 
     query = f"UPDATE tasks SET {', '.join(fields)} WHERE task_id = ?"
     values.append(task_id)
     cursor.execute(query, values)
     conn.commit()
-    conn.close()
     return jsonify({
         "message": "successfully updated task",
         "task_id": task_id
@@ -97,26 +472,310 @@ def delete_task(task_id):
     cursor.execute("SELECT task_id FROM tasks WHERE task_id = ?", (task_id, ))
     result = cursor.fetchone()
     if not result:
-        conn.close()
         return jsonify({
             "message": "task could not be found"
         }), 404
     query = "DELETE FROM tasks WHERE task_id = ?"
     cursor.execute(query, (task_id,))
     conn.commit()
-    conn.close()
     return jsonify({
         "message": "successfully deleted task",
         "task_id": task_id
     }), 200
 
 
+def existing_task_ids(cursor, task_ids):
+    task_ids = list(set(task_ids))
+    found = set()
+    for start in range(0, len(task_ids), BULK_LOOKUP_CHUNK):
+        chunk = task_ids[start:start + BULK_LOOKUP_CHUNK]
+        marks = ", ".join("?" * len(chunk))
+        cursor.execute(
+            f"SELECT task_id FROM tasks WHERE task_id IN ({marks})", chunk)
+        found.update(row[0] for row in cursor.fetchall())
+    return found
+
+
+def is_task_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def bulk_response(message, results):
+    return jsonify({
+        "message": message,
+        "succeeded": sum(1 for r in results if r["status"] < 400),
+        "failed": sum(1 for r in results if r["status"] >= 400),
+        "results": results
+    }), 200
+
+
+def read_bulk_items():
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        return None
+    return items
+
+
+@app.route('/tasks/bulk', methods=['POST'])
+def create_tasks_bulk():
+    items = read_bulk_items()
+    if items is None:
+        return jsonify({"message": "expected a JSON array of tasks"}), 400
+    results = []
+    rows = []
+    for index, info in enumerate(items):
+        error = validate_new_task(info)
+        if error:
+            results.append({"index": index, "status": 400, "message": error})
+            continue
+        results.append({"index": index, "status": 201})
+        rows.append([info["name"], info.get("description", ""), "incomplete"])
+
+    conn, cursor = get_db_connection()
+    cursor.execute("BEGIN IMMEDIATE")
+    cursor.execute("SELECT COALESCE(MAX(task_id), 0) FROM tasks")
+    next_id = cursor.fetchone()[0] + 1
+    for row in rows:
+        row.insert(0, next_id)
+        next_id += 1
+    query = """
+    INSERT INTO tasks (task_id, name, description, completed)
+    VALUES (?, ?, ?, ?)
+    """
+    cursor.executemany(query, rows)
+    conn.commit()
+
+    created = iter(rows)
+    for result in results:
+        if result["status"] == 201:
+            result["task_id"] = next(created)[0]
+    return bulk_response("processed bulk task creation", results)
+
+
+@app.route('/tasks/bulk', methods=['PATCH'])
+def update_tasks_bulk():
+    items = read_bulk_items()
+    if items is None:
+        return jsonify({"message": "expected a JSON array of updates"}), 400
+    results = []
+    updates = []
+    for index, info in enumerate(items):
+        task_id = info.get("task_id") if isinstance(info, dict) else None
+        if not is_task_id(task_id):
+            message = "task_id is required"
+        elif ("completed" in info
+              and info["completed"] not in COMPLETED_VALUES):
+            message = "completed must be one of: " + \
+                ", ".join(COMPLETED_VALUES)
+        else:
+            message = validate_task_fields(info)
+        fields, values = build_task_update(info)
+        if message is None and not fields:
+            message = "No valid fields to update"
+        result = {"index": index, "status": 200, "task_id": task_id}
+        if message:
+            result.update(status=400, message=message)
+        else:
+            updates.append((result, fields, values))
+        results.append(result)
+
+    conn, cursor = get_db_connection()
+    cursor.execute("BEGIN IMMEDIATE")
+    found = existing_task_ids(cursor, [r["task_id"] for r, _, _ in updates])
+    applicable = []
+    for result, fields, values in updates:
+        if result["task_id"] not in found:
+            result.update(status=404, message="task could not be found")
+        else:
+            applicable.append((fields, values + [result["task_id"]]))
+    for fields, group in groupby(applicable, key=lambda item: item[0]):
+        query = f"UPDATE tasks SET {', '.join(fields)} WHERE task_id = ?"
+        cursor.executemany(query, [values for _, values in group])
+    conn.commit()
+    return bulk_response("processed bulk task update", results)
+
+
+@app.route('/tasks/bulk', methods=['DELETE'])
+def delete_tasks_bulk():
+    items = read_bulk_items()
+    if items is None:
+        return jsonify({"message": "expected a JSON array of task ids"}), 400
+    conn, cursor = get_db_connection()
+    cursor.execute("BEGIN IMMEDIATE")
+    found = existing_task_ids(cursor, filter(is_task_id, items))
+    results = []
+    deleted = []
+    for index, task_id in enumerate(items):
+        result = {"index": index, "status": 200, "task_id": task_id}
+        if not is_task_id(task_id):
+            result.update(status=400, message="task_id must be an integer")
+        elif task_id not in found:
+            result.update(status=404, message="task could not be found")
+        else:
+            found.discard(task_id)
+            deleted.append((task_id,))
+        results.append(result)
+    cursor.executemany("DELETE FROM tasks WHERE task_id = ?", deleted)
+    conn.commit()
+    return bulk_response("processed bulk task deletion", results)
+
+
+@app.route('/tasks/export', methods=['GET'])
+def export_tasks():
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in STREAM_FORMATS:
+        return jsonify({"message": "format must be one of: " +
+                        ", ".join(STREAM_FORMATS)}), 400
+    try:
+        query, params = build_task_query()
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    response = Response(stream_tasks(query, params, fmt),
+                        mimetype=STREAM_FORMATS[fmt])
+    response.headers["Content-Disposition"] = \
+        f"attachment; filename=tasks.{fmt}"
+    return response
+
+
+def decode_lines(stream, bad_lines):
+    """Yield the body's lines as text, noting lines that are not UTF-8.
+
+    Undecodable lines are yielded with replacement characters so a CSV
+    reader keeps its place, and their numbers are added to ``bad_lines``.
+    """
+    for line_no, raw in enumerate(iter(stream.readline, b""), 1):
+        try:
+            yield raw.decode("utf-8")
+        except UnicodeDecodeError:
+            bad_lines.add(line_no)
+            yield raw.decode("utf-8", errors="replace")
+
+
+def iter_import_rows(stream, fmt):
+    """Yield (line, task, error) from an NDJSON or CSV body as it arrives."""
+    bad_lines = set()
+    lines = decode_lines(stream, bad_lines)
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        # Reading the header first makes line_num point at its last line
+        if reader.fieldnames is None:
+            return
+        last_line = reader.line_num
+        for row in reader:
+            # A quoted field can span lines, so check the whole record
+            first_line, last_line = last_line + 1, reader.line_num
+            if bad_lines.intersection(range(first_line, last_line + 1)):
+                yield last_line, None, "invalid UTF-8"
+            else:
+                yield last_line, row, None
+        return
+    for line_no, line in enumerate(lines, 1):
+        if line_no in bad_lines:
+            yield line_no, None, "invalid UTF-8"
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except ValueError as e:
+            yield line_no, None, f"invalid JSON: {e}"
+
+
+def build_import_row(info, keep_ids):
+    error = validate_new_task(info)
+    if error:
+        return None, error
+    completed = info.get("completed") or "incomplete"
+    if completed not in COMPLETED_VALUES:
+        return None, "completed must be one of: " + ", ".join(COMPLETED_VALUES)
+    row = [info["name"], info.get("description") or "", completed]
+    if keep_ids:
+        task_id = info.get("task_id")
+        if isinstance(task_id, str) and task_id.isdigit():
+            task_id = int(task_id)
+        if not is_task_id(task_id) or task_id < 1:
+            return None, "task_id must be a positive integer"
+        row.insert(0, task_id)
+    return row, None
+
+
+@app.route('/tasks/import', methods=['POST'])
+def import_tasks():
+    fmt = request.args.get("format") or IMPORT_FORMATS.get(request.mimetype)
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"message": "send application/x-ndjson or text/csv, "
+                        "or pass format=ndjson|csv"}), 415
+    keep_ids = request.args.get("keep_ids", "").lower() in ("1", "true")
+    if keep_ids:
+        # Rows with an existing task_id replace that task
+        query = """
+        INSERT INTO tasks (task_id, name, description, completed)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (task_id) DO UPDATE SET
+            name = excluded.name,
+            description = excluded.description,
+            completed = excluded.completed
+        """
+    else:
+        query = """
+        INSERT INTO tasks (name, description, completed)
+        VALUES (?, ?, ?)
+        """
+
+    conn, cursor = get_db_connection()
+    report = {"imported": 0, "failed": 0, "errors": []}
+
+    def fail(line_no, message, count=1):
+        report["failed"] += count
+        if len(report["errors"]) < MAX_IMPORT_ERRORS:
+            report["errors"].append({"line": line_no, "message": message})
+
+    def flush(batch, first_line):
+        # One short transaction per batch keeps the write lock free for
+        # other requests while a large body is still arriving.
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(query, batch)
+            conn.commit()
+            report["imported"] += len(batch)
+        except sqlite3.Error as e:
+            conn.rollback()
+            fail(first_line, f"batch not imported: {e}", len(batch))
+            return
+        # Committed rows must not be hidden by cached responses, even if
+        # the request fails before its after_request hooks run
+        response_cache.bump()
+
+    batch = []
+    first_line = None
+    for line_no, info, error in iter_import_rows(request.stream, fmt):
+        if error is None:
+            row, error = build_import_row(info, keep_ids)
+        if error:
+            fail(line_no, error)
+            continue
+        if not batch:
+            first_line = line_no
+        batch.append(row)
+        if len(batch) == IMPORT_BATCH_SIZE:
+            flush(batch, first_line)
+            batch = []
+    if batch:
+        flush(batch, first_line)
+    return jsonify(dict(report, message="processed task import")), 200
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     try:
         conn, cursor = get_db_connection()
         cursor.execute("SELECT 1")
-        conn.close()
         return jsonify({"status": "ok"}), 200
     except Exception as e:
         return jsonify({"status": "error", "details": str(e)}), 500
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(),
+                    mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,291 @@
+"""Load test and latency benchmark for the task API.
+
+Seeds a temporary todo.db, drives every route through Flask's test client
+and/or a real local HTTP server, and prints (or writes) a JSON report with
+requests/s and p50/p95/p99 latencies per route. Run from flask-cicd-demo/:
+
+    python -m benchmarks.bench_api --mode both --concurrency 8 \
+        --requests 2000 --dataset-size 100000 --output bench.json
+
+Pass --baseline with a previous report to fail (exit code 1) when a route
+loses more than --max-regression of its throughput or p95 latency.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import app
+from app.routes import response_cache
+from database.migrations import migrate
+from database.setup_db import create_connection
+
+ROUTES = ["health", "list", "get", "create", "update", "delete"]
+MODES = ["client", "server"]
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+def seed_database(path, size):
+    conn, cursor = create_connection(path)
+    migrate(conn)
+    cursor.executemany(
+        "INSERT INTO tasks (name, description, completed) VALUES (?, ?, ?)",
+        (
+            (
+                f"task {i}",
+                f"seeded task number {i}",
+                "complete" if i % 3 == 0 else "incomplete",
+            )
+            for i in range(size)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+class Scenario:
+    """Produces the (method, path, body) of each request for a route."""
+
+    def __init__(self, dataset_size, seed):
+        self.dataset_size = dataset_size
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.deletable = itertools.count(dataset_size, -1)
+
+    def random_id(self):
+        with self.lock:
+            return self.rng.randint(1, self.dataset_size)
+
+    def next_deletable(self):
+        with self.lock:
+            return next(self.deletable)
+
+    def request(self, route):
+        if route == "health":
+            return "GET", "/health", None
+        if route == "list":
+            return "GET", f"/tasks?limit=100&after={self.random_id()}", None
+        if route == "get":
+            return "GET", f"/tasks/{self.random_id()}", None
+        if route == "create":
+            return "POST", "/tasks", {"name": "bench", "description": "x"}
+        if route == "update":
+            body = {"completed": "complete"}
+            return "PUT", f"/tasks/{self.random_id()}", body
+        return "DELETE", f"/tasks/{self.next_deletable()}", None
+
+
+class ClientTransport:
+    def __init__(self):
+        self.local = threading.local()
+
+    def send(self, method, path, body):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class ServerTransport:
+    def __init__(self):
+        self.server = make_server(
+            "127.0.0.1",
+            0,
+            app,
+            threaded=True,
+            request_handler=KeepAliveRequestHandler,
+        )
+        self.port = self.server.server_port
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            daemon=True,
+        )
+        self.thread.start()
+        self.local = threading.local()
+
+    def send(self, method, path, body):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection(
+                "127.0.0.1", self.port, timeout=30
+            )
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self.local.conn = None
+            raise
+        return response.status
+
+    def close(self):
+        self.server.shutdown()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_route(transport, scenario, route, total, concurrency):
+    def worker(count):
+        latencies = []
+        errors = 0
+        for _ in range(count):
+            method, path, body = scenario.request(route)
+            start = time.perf_counter()
+            try:
+                status = transport.send(method, path, body)
+            except (http.client.HTTPException, OSError):
+                status = 599
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+        return latencies, errors
+
+    shares = [
+        total // concurrency + (1 if i < total % concurrency else 0)
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(worker, shares))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(x for lat, _ in outcomes for x in lat)
+    return {
+        "requests": len(latencies),
+        "errors": sum(err for _, err in outcomes),
+        "requests_per_second": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_mode(mode, args):
+    workdir = tempfile.mkdtemp(prefix="todo-bench-")
+    path = os.path.join(workdir, "todo.db")
+    # Deletes consume ids from the top of the seeded range.
+    size = max(args.dataset_size, args.requests + 1)
+    seed_database(path, size)
+    pool = app.extensions.pop("db_pool", None)
+    if pool is not None:
+        pool.close_all()
+    app.config.update(DATABASE=path, DB_POOL_SIZE=args.concurrency)
+    response_cache.bump()
+
+    scenario = Scenario(size, args.seed)
+    transport = ClientTransport() if mode == "client" else ServerTransport()
+    try:
+        return {
+            route: run_route(
+                transport, scenario, route, args.requests, args.concurrency
+            )
+            for route in args.routes
+        }
+    finally:
+        transport.close()
+        pool = app.extensions.pop("db_pool", None)
+        if pool is not None:
+            pool.close_all()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(report, baseline, max_regression):
+    regressions = []
+    for mode, routes in report["results"].items():
+        for route, current in routes.items():
+            previous = baseline.get("results", {}).get(mode, {}).get(route)
+            if not previous:
+                continue
+            floor = previous["requests_per_second"] * (1 - max_regression)
+            if current["requests_per_second"] < floor:
+                regressions.append(
+                    f"{mode}/{route}: {current['requests_per_second']} req/s "
+                    f"< baseline {previous['requests_per_second']}"
+                )
+            ceiling = previous["p95_ms"] * (1 + max_regression)
+            if current["p95_ms"] > ceiling:
+                regressions.append(
+                    f"{mode}/{route}: p95 {current['p95_ms']} ms "
+                    f"> baseline {previous['p95_ms']}"
+                )
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=MODES + ["both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--requests", type=int, default=500, help="requests issued per route"
+    )
+    parser.add_argument("--dataset-size", type=int, default=10000)
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=ROUTES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    modes = MODES if args.mode == "both" else [args.mode]
+    report = {
+        "meta": {
+            "concurrency": args.concurrency,
+            "requests_per_route": args.requests,
+            "dataset_size": args.dataset_size,
+            "python": sys.version.split()[0],
+        },
+        "results": {mode: run_mode(mode, args) for mode in modes},
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
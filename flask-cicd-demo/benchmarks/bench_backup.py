@@ -0,0 +1,280 @@
+"""Benchmark of online snapshots under API load, against a local S3.
+
+Seeds a temporary todo.db, starts moto's S3 server (or uses
+--endpoint-url), and drives the write routes through Flask's test client
+twice: once alone and once while snapshots are taken every --interval
+seconds. Every snapshot is then restored into a scratch file and checked,
+and point-in-time lookup is checked against each snapshot's time. Run from
+flask-cicd-demo/:
+
+    python -m benchmarks.bench_backup --dataset-size 100000 \
+        --requests 2000 --interval 1 --output backup_bench.json
+
+The exit code is 1 if a restored snapshot is inconsistent.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from app import app
+from app.routes import response_cache
+from benchmarks.bench_api import (
+    ClientTransport,
+    Scenario,
+    percentile,
+    run_route,
+    seed_database,
+)
+from database.backup import (
+    configure_s3,
+    find_snapshot,
+    list_snapshots,
+    parse_snapshot_key,
+    restore_snapshot,
+    take_snapshot,
+)
+from database.pool import DEFAULT_PRAGMAS, ConnectionPool
+
+ROUTES = ["create", "update", "list"]
+BUCKET = "todo-bench-backups"
+
+
+class SnapshotLoop:
+    """Takes a snapshot every ``interval`` seconds on a background thread."""
+
+    def __init__(self, database, bucket, prefix, interval, compression, pages):
+        self.database = database
+        self.bucket = bucket
+        self.prefix = prefix
+        self.interval = interval
+        self.compression = compression
+        self.pages = pages
+        self.reports = []
+        self.errors = []
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        last = None
+        while not self.stopped.is_set():
+            started = time.monotonic()
+            try:
+                report = take_snapshot(
+                    self.database,
+                    self.bucket,
+                    self.prefix,
+                    self.compression,
+                    self.pages,
+                    last=last,
+                )
+            except Exception as e:
+                self.errors.append(f"{type(e).__name__}: {e}")
+            else:
+                self.reports.append(report)
+                last = parse_snapshot_key(report["key"], self.prefix)
+            elapsed = time.monotonic() - started
+            self.stopped.wait(max(self.interval - elapsed, 0))
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+def run_load(args, scenario):
+    transport = ClientTransport()
+    results = {}
+    for route in args.routes:
+        results[route] = run_route(
+            transport, scenario, route, args.requests, args.concurrency
+        )
+    return results
+
+
+def summarize_snapshots(reports):
+    taken = [report for report in reports if not report["skipped"]]
+    copy = sorted(report["copy_seconds"] for report in taken)
+    upload = sorted(report["upload_seconds"] for report in taken)
+    database_bytes = sum(report["database_bytes"] for report in taken)
+    uploaded_bytes = sum(report["uploaded_bytes"] for report in taken)
+    ratio = database_bytes / uploaded_bytes if uploaded_bytes else 0.0
+    return {
+        "taken": len(taken),
+        "skipped": len(reports) - len(taken),
+        "copy_p50_seconds": percentile(copy, 50),
+        "copy_max_seconds": copy[-1] if copy else 0.0,
+        "upload_p50_seconds": percentile(upload, 50),
+        "upload_max_seconds": upload[-1] if upload else 0.0,
+        "compression_ratio": round(ratio, 2),
+    }
+
+
+def verify_snapshots(workdir, prefix):
+    """Restores every snapshot and returns a list of problems found."""
+    problems = []
+    restored_path = os.path.join(workdir, "restored.db")
+    snapshots = list_snapshots(BUCKET, prefix)
+    seconds = []
+    for info in snapshots:
+        if find_snapshot(snapshots, info["taken_at"])["key"] != info["key"]:
+            problems.append(f"{info['key']}: not found by its own time")
+        key = info["key"]
+        report = restore_snapshot(restored_path, BUCKET, prefix, key=key)
+        seconds.append(report["seconds"])
+        pool = ConnectionPool(restored_path, max_size=1)
+        conn = pool.acquire()
+        try:
+            query = "SELECT revision FROM sync_state"
+            revision = conn.execute(query).fetchone()[0]
+            # A torn copy would disagree with its own change counter
+            newest = conn.execute(
+                "SELECT max(revision) FROM (SELECT revision FROM tasks "
+                "UNION ALL SELECT revision FROM task_tombstones)"
+            ).fetchone()[0]
+        finally:
+            pool.release(conn)
+            pool.close_all()
+        if revision != info["revision"] or newest != revision:
+            problems.append(
+                f"{info['key']}: restored revision {revision}, "
+                f"newest row revision {newest}"
+            )
+    return {
+        "restored": len(snapshots),
+        "problems": problems,
+        "restore_max_seconds": max(seconds) if seconds else 0.0,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset-size", type=int, default=20000)
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=1000,
+        help="requests issued per route and phase",
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=ROUTES)
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="seconds between snapshots"
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["gzip", "zstd"],
+        default="gzip",
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=1024,
+        help="database pages copied per backup step",
+    )
+    parser.add_argument(
+        "--endpoint-url", help="use this S3 endpoint instead of starting moto"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    s3_operations = configure_s3(args.endpoint_url)
+    workdir = tempfile.mkdtemp(prefix="todo-backup-bench-")
+    try:
+        path = os.path.join(workdir, "todo.db")
+        seed_database(path, args.dataset_size)
+        app.config.update(
+            DATABASE=path,
+            DB_POOL_SIZE=args.concurrency,
+            DB_PRAGMAS=DEFAULT_PRAGMAS,
+        )
+        response_cache.bump()
+        prefix = f"bench-{int(time.time())}/"
+
+        s3_operations.S3_LOG_PATH = os.path.join(workdir, "aws.log")
+        from s3_benchmark import moto_server
+
+        with contextlib.ExitStack() as stack:
+            if args.endpoint_url is None:
+                for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+                    os.environ.setdefault(name, "benchmark")
+                region = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
+                s3_operations.configure_s3_client(
+                    endpoint_url=stack.enter_context(moto_server()),
+                    region_name=region,
+                )
+            s3 = s3_operations.create_s3_connection()
+            if BUCKET not in [
+                bucket["Name"] for bucket in s3.list_buckets()["Buckets"]
+            ]:
+                s3.create_bucket(Bucket=BUCKET)
+
+            scenario = Scenario(args.dataset_size, args.seed)
+            without = run_load(args, scenario)
+            loop = SnapshotLoop(
+                path,
+                BUCKET,
+                prefix,
+                args.interval,
+                args.compression,
+                args.pages,
+            )
+            with loop:
+                during = run_load(args, scenario)
+            # One more after the load, so the final state is covered too
+            final = take_snapshot(
+                path,
+                BUCKET,
+                prefix,
+                args.compression,
+                args.pages,
+            )
+            loop.reports.append(final)
+            verification = verify_snapshots(workdir, prefix)
+    finally:
+        pool = app.extensions.pop("db_pool", None)
+        if pool is not None:
+            pool.close_all()
+        s3_operations.stop_logging()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "dataset_size": args.dataset_size,
+            "requests_per_route": args.requests,
+            "concurrency": args.concurrency,
+            "interval_seconds": args.interval,
+            "compression": args.compression,
+            "pages_per_step": args.pages,
+            "endpoint": args.endpoint_url or "moto",
+            "python": sys.version.split()[0],
+        },
+        "results": {"without_snapshots": without, "with_snapshots": during},
+        "snapshots": summarize_snapshots(loop.reports),
+        "snapshot_errors": loop.errors,
+        "verification": verification,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if verification["problems"] or loop.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,14 @@
 import questionary
 import requests
+from requests.adapters import HTTPAdapter
 from rich.console import Console
 from rich.table import Table
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+import socket
+import sqlite3
 import subprocess
 import time
 import signal
@@ -9,11 +16,50 @@ import sys
 import os
 
 API_URL = "http://127.0.0.1:5000"
+REQUEST_TIMEOUT = 10
+READY_TIMEOUT = 15.0
+READY_MAX_DELAY = 0.5
+CACHE_PATH = os.environ.get(
+    "TODO_CLI_CACHE", os.path.join(os.path.expanduser("~"), ".todo-cli.db"))
+SYNC_PAGE_SIZE = 1000
+# Pages kept in memory by the viewer, so going back is instant
+PAGER_CACHE_PAGES = 8
+EXPORT_CHUNK_SIZE = 64 * 1024
 console = Console()
 
 
-def format_tasks(tasks):
-    table = Table(title="Tasks")
+def build_session():
+    """Create one keep-alive session with retries for every API call.
+
+    Connection errors are retried for every method, since the request
+    never reached the server; 502/503/504 responses only for idempotent
+    methods, so a POST is never sent twice.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+session = build_session()
+
+
+def api_request(method, path, **kwargs):
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    return session.request(method, API_URL + path, **kwargs)
+
+
+def format_tasks(tasks, title="Tasks"):
+    table = Table(title=title)
     table.add_column("ID", style="cyan")
     table.add_column("Name", style="magenta")
     table.add_column("Description", style="green")
@@ -28,6 +74,225 @@ def format_tasks(tasks):
     return table
 
 
+class TaskCache:
+    """On-disk copy of the task list, updated from GET /tasks/changes.
+
+    Only rows changed since the stored sync token are transferred. The
+    cache starts over when it points at another server or when the
+    server's epoch changes (its database was recreated).
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        # The pager reads pages on its prefetch thread
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id INTEGER PRIMARY KEY,
+            name TEXT,
+            description TEXT,
+            completed TEXT,
+            updated_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        """)
+
+    def get_meta(self, key):
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, **values):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, str(value)) for key, value in values.items()])
+
+    def reset(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks")
+            self.conn.execute("DELETE FROM meta")
+
+    def sync(self):
+        """Apply every change since the last sync; returns how many."""
+        if self.get_meta("api_url") != API_URL:
+            self.reset()
+        since = int(self.get_meta("since") or 0)
+        applied = 0
+        while True:
+            response = api_request(
+                "GET", "/tasks/changes",
+                params={"since": since, "limit": SYNC_PAGE_SIZE})
+            response.raise_for_status()
+            body = response.json()
+            if since and body["epoch"] != self.get_meta("epoch"):
+                self.reset()
+                since = 0
+                continue
+            changes = body["data"]
+            with self.conn:
+                self.conn.executemany(
+                    "DELETE FROM tasks WHERE task_id = ?",
+                    [(c["task_id"],) for c in changes if c["deleted"]])
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)",
+                    [(c["task_id"], c["name"], c["description"],
+                      c["completed"], c["updated_at"])
+                     for c in changes if not c["deleted"]])
+                self.set_meta(api_url=API_URL, epoch=body["epoch"],
+                              since=body["next_since"])
+            applied += len(changes)
+            since = body["next_since"]
+            if not body["has_more"]:
+                return applied
+
+    def fetch_page(self, after, offset, limit):
+        rows = self.conn.execute(
+            "SELECT task_id, name, description, completed FROM tasks "
+            "WHERE task_id > ? ORDER BY task_id LIMIT ? OFFSET ?",
+            (-1 if after is None else after, limit + 1, offset)).fetchall()
+        tasks = [{"task_id": row[0], "name": row[1],
+                  "description": row[2] or "", "completed": row[3]}
+                 for row in rows[:limit]]
+        return tasks, len(rows) > limit
+
+    def close(self):
+        self.conn.close()
+
+
+def fetch_server_page(after, offset, limit):
+    params = {"limit": limit}
+    if after is not None:
+        params["after"] = after
+    if offset:
+        params["offset"] = offset
+    response = api_request("GET", "/tasks", params=params)
+    response.raise_for_status()
+    body = response.json()
+    return body.get("data", []), body.get("next_cursor") is not None
+
+
+class TaskPager:
+    """Shows a task list one screen at a time.
+
+    ``fetch(after, offset, limit)`` returns ``(tasks, has_more)`` for one
+    page; only that page is rendered, and the next one is fetched in the
+    background while the current one is on screen. Pages are addressed by
+    the task id they start after, so "Next" and "Jump to task ID" are
+    keyset seeks and only "Jump to page" needs an offset.
+    """
+
+    def __init__(self, fetch, page_size=None):
+        self.fetch = fetch
+        self.page_size = page_size or max(console.size.height - 10, 10)
+        self.pages = OrderedDict()
+        self.prefetcher = ThreadPoolExecutor(max_workers=1)
+
+    def _load(self, key):
+        if key in self.pages:
+            self.pages.move_to_end(key)
+            return self.pages[key]
+        after, offset = key
+        page = self.prefetcher.submit(self.fetch, after, offset,
+                                      self.page_size)
+        self.pages[key] = page
+        while len(self.pages) > PAGER_CACHE_PAGES:
+            self.pages.popitem(last=False)
+        return page
+
+    def run(self):
+        # Each history entry is (after, offset, page number or None)
+        history = [(None, 0, 1)]
+        try:
+            while True:
+                after, offset, number = history[-1]
+                try:
+                    tasks, has_more = self._load((after, offset)).result()
+                except requests.exceptions.RequestException as e:
+                    self.pages.pop((after, offset), None)
+                    console.print(f"[red]Request failed: {e}[/red]")
+                    return
+                if has_more and tasks:
+                    self._load((tasks[-1]["task_id"], 0))
+                if number is not None:
+                    title = f"Tasks - page {number}"
+                elif tasks:
+                    title = f"Tasks from #{tasks[0]['task_id']}"
+                else:
+                    title = "Tasks"
+                console.print(format_tasks(tasks, title))
+                choices = []
+                if has_more and tasks:
+                    choices.append("Next page")
+                if len(history) > 1:
+                    choices.append("Previous page")
+                choices += ["Jump to page", "Jump to task ID",
+                            "Back to menu"]
+                action = questionary.select(
+                    "Navigate:", choices=choices).ask()
+                if action == "Next page":
+                    history.append((tasks[-1]["task_id"], 0,
+                                    number + 1 if number else None))
+                elif action == "Previous page":
+                    history.pop()
+                elif action == "Jump to page":
+                    page = questionary.text("Page number:").ask()
+                    if page and page.isdigit() and int(page) > 0:
+                        offset = (int(page) - 1) * self.page_size
+                        history = [(None, offset, int(page))]
+                    else:
+                        console.print("[red]Invalid page number[/red]")
+                elif action == "Jump to task ID":
+                    task_id = questionary.text("Task ID:").ask()
+                    if task_id and task_id.isdigit():
+                        history = [(int(task_id) - 1, 0, None)]
+                    else:
+                        console.print("[red]Invalid task ID[/red]")
+                else:
+                    return
+        finally:
+            self.prefetcher.shutdown(wait=False, cancel_futures=True)
+
+
+def file_format(path):
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def import_tasks(path, keep_ids=False):
+    """Stream a local NDJSON/CSV file to POST /tasks/import.
+
+    requests sends a file object in blocks, so the file is never read
+    into memory; the server commits it in batches as it arrives.
+    """
+    fmt = file_format(path)
+    content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    with open(path, "rb") as f:
+        response = api_request(
+            "POST", "/tasks/import",
+            params={"keep_ids": "true"} if keep_ids else None,
+            data=f, headers={"Content-Type": content_type},
+            # No read timeout: the reply only comes once every row is in
+            timeout=(REQUEST_TIMEOUT, None))
+    response.raise_for_status()
+    return response.json()
+
+
+def export_tasks(path):
+    """Stream GET /tasks/export into a local file chunk by chunk."""
+    written = 0
+    response = api_request("GET", "/tasks/export",
+                           params={"format": file_format(path)},
+                           stream=True, timeout=(REQUEST_TIMEOUT, None))
+    with response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(EXPORT_CHUNK_SIZE):
+                f.write(chunk)
+                written += len(chunk)
+    return written
+
+
 def format_task(task):
     table = Table(title=f"Task {task['task_id']}")
     table.add_column("Field", style="cyan")
@@ -48,7 +313,6 @@ def start_flask():
              "FLASK_ENV": "development"},
         cwd=project_root
     )
-    time.sleep(3)
     return proc
 
 
@@ -60,10 +324,44 @@ def stop_flask(proc):
         proc.kill()
 
 
-def check_flask_health():
+def port_is_open(host, port, timeout):
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def wait_for_flask(proc, deadline=READY_TIMEOUT):
+    """Probe until the server answers /health, or the deadline passes.
+
+    A cheap TCP connect is tried first and /health only once the port is
+    open. The delay between probes starts at 25 ms and doubles up to
+    READY_MAX_DELAY, so a server that is up in 200 ms is used right away.
+    """
+    url = urlparse(API_URL)
+    host, port = url.hostname, url.port or 80
+    give_up = time.monotonic() + deadline
+    delay = 0.025
+    while True:
+        remaining = give_up - time.monotonic()
+        if remaining <= 0:
+            return False
+        if proc.poll() is not None:
+            console.print(
+                f"[red]Flask exited with code {proc.returncode}[/red]")
+            return False
+        if port_is_open(host, port, min(remaining, 0.5)) and \
+                check_flask_health(timeout=min(remaining, 2)):
+            return True
+        time.sleep(min(delay, max(give_up - time.monotonic(), 0)))
+        delay = min(delay * 2, READY_MAX_DELAY)
+
+
+def check_flask_health(timeout=5):
     """Check if Flask server is responding"""
     try:
-        response = requests.get(f"{API_URL}/health", timeout=5)
+        response = api_request("GET", "/health", timeout=timeout)
         console.print(
             f"[dim]Health check response: {response.status_code}[/dim]")
         if response.status_code == 200:
@@ -81,21 +379,18 @@ def main():
     console.print("[yellow]Starting Flask server...[/yellow]")
     flask_proc = start_flask()
 
-    max_retries = 15
-    for i in range(max_retries):
-        if check_flask_health():
-            console.print("[green]Flask server is ready![/green]")
-            break
+    started = time.monotonic()
+    if wait_for_flask(flask_proc):
         console.print(
-            f"[yellow]Waiting for Flask server... ({i+1}/{max_retries})[/yellow]")
-        time.sleep(2)
+            f"[green]Flask server is ready! "
+            f"({time.monotonic() - started:.2f}s)[/green]")
     else:
         console.print("[red]Failed to start Flask server.[/red]")
         console.print(
             "[yellow]Checking if server is accessible directly...[/yellow]")
 
         try:
-            response = requests.get(f"{API_URL}/", timeout=5)
+            response = api_request("GET", "/", timeout=5)
             console.print(
                 f"[yellow]Direct connection test - Status: {response.status_code}[/yellow]")
             console.print(
@@ -112,34 +407,37 @@ def main():
             stop_flask(flask_proc)
             return
 
+    task_cache = TaskCache()
     try:
         while True:
             action = questionary.select(
                 "What would you like to do?",
                 choices=[
                     "View all tasks",
+                    "View cached tasks (sync changes)",
                     "View a task",
                     "Create a task",
                     "Update a task",
                     "Delete a task",
+                    "Import tasks from file",
+                    "Export tasks to file",
                     "Health check",
                     "Exit"
                 ]
             ).ask()
 
             if action == "View all tasks":
+                TaskPager(fetch_server_page).run()
+
+            elif action == "View cached tasks (sync changes)":
                 try:
-                    url = API_URL + "/tasks"
-                    response = requests.get(url)
-                    if response.status_code == 200:
-                        data = response.json().get("data", [])
-                        table = format_tasks(data)
-                        console.print(table)
-                    else:
-                        console.print(
-                            f"[red]Error: {response.status_code} - {response.text}[/red]")
+                    applied = task_cache.sync()
                 except requests.exceptions.RequestException as e:
-                    console.print(f"[red]Request failed: {e}[/red]")
+                    console.print(f"[red]Sync failed: {e}[/red]")
+                    continue
+                console.print(
+                    f"[dim]Synced {applied} change(s) from the server[/dim]")
+                TaskPager(task_cache.fetch_page).run()
 
             elif action == "View a task":
                 task_id = questionary.text("Enter task ID:").ask()
@@ -147,8 +445,7 @@ def main():
                     console.print("[red]Invalid task ID[/red]")
                     continue
                 try:
-                    url = f"{API_URL}/tasks/{task_id}"
-                    response = requests.get(url)
+                    response = api_request("GET", f"/tasks/{task_id}")
                     if response.status_code != 200:
                         console.print(
                             f"[red]Task not found (ID: {task_id})[/red]")
@@ -172,7 +469,7 @@ def main():
                     "Task description (optional):").ask()
                 payload = {"name": name, "description": description}
                 try:
-                    response = requests.post(f"{API_URL}/tasks", json=payload)
+                    response = api_request("POST", "/tasks", json=payload)
                     if response.status_code == 201:
                         task_id = response.json().get("task_id")
                         console.print(
@@ -207,8 +504,8 @@ def main():
                     console.print("[yellow]No fields to update.[/yellow]")
                     continue
                 try:
-                    response = requests.put(
-                        f"{API_URL}/tasks/{task_id}", json=payload)
+                    response = api_request(
+                        "PUT", f"/tasks/{task_id}", json=payload)
                     if response.status_code == 200:
                         console.print(
                             f"[green]Task {task_id} updated successfully.[/green]")
@@ -228,7 +525,7 @@ def main():
                 if not confirm:
                     continue
                 try:
-                    response = requests.delete(f"{API_URL}/tasks/{task_id}")
+                    response = api_request("DELETE", f"/tasks/{task_id}")
                     if response.status_code == 200:
                         console.print(
                             f"[green]Task {task_id} deleted successfully.[/green]")
@@ -238,9 +535,46 @@ def main():
                 except requests.exceptions.RequestException as e:
                     console.print(f"[red]Request failed: {e}[/red]")
 
+            elif action == "Import tasks from file":
+                path = questionary.text(
+                    "File to import (.ndjson or .csv):").ask()
+                if not path or not os.path.isfile(path):
+                    console.print("[red]File not found[/red]")
+                    continue
+                keep_ids = questionary.confirm(
+                    "Keep task IDs from the file (replacing existing "
+                    "tasks with the same ID)?", default=False).ask()
+                try:
+                    started = time.monotonic()
+                    report = import_tasks(path, keep_ids)
+                    console.print(
+                        f"[green]Imported {report['imported']} task(s) in "
+                        f"{time.monotonic() - started:.1f}s, "
+                        f"{report['failed']} failed[/green]")
+                    for error in report["errors"][:10]:
+                        console.print(
+                            f"[red]Line {error['line']}: "
+                            f"{error['message']}[/red]")
+                except requests.exceptions.RequestException as e:
+                    console.print(f"[red]Import failed: {e}[/red]")
+
+            elif action == "Export tasks to file":
+                path = questionary.text(
+                    "Export to (.ndjson or .csv):").ask()
+                if not path:
+                    continue
+                try:
+                    started = time.monotonic()
+                    written = export_tasks(path)
+                    console.print(
+                        f"[green]Exported {written} bytes to {path} in "
+                        f"{time.monotonic() - started:.1f}s[/green]")
+                except (requests.exceptions.RequestException, OSError) as e:
+                    console.print(f"[red]Export failed: {e}[/red]")
+
             elif action == "Health check":
                 try:
-                    response = requests.get(f"{API_URL}/health")
+                    response = api_request("GET", "/health")
                     if response.status_code == 200 and response.json().get("status") == "ok":
                         console.print("[green]API is healthy![/green]")
                     else:
@@ -253,6 +587,8 @@ def main():
                 break
     finally:
         console.print("[yellow]Stopping Flask server...[/yellow]")
+        task_cache.close()
+        session.close()
         stop_flask(flask_proc)
         console.print("[green]Goodbye![/green]")
 
@@ -0,0 +1,388 @@
+"""Online, compressed snapshots of the task database in S3.
+
+A snapshot is taken with SQLite's backup API a few pages per step while a
+read transaction pins one consistent version of the database; in WAL mode
+that never blocks writers, and their commits cannot force the copy to
+restart. The copy is compressed as it is read and uploaded with multipart
+transfers through the S3 tool in ../aws-S3-script, sharing its client.
+
+Snapshot keys sort by the time they were taken and carry the database's
+sync epoch, revision and schema version, so an unchanged database is not
+uploaded again and a restore can pick the latest snapshot at or before
+any point in time:
+
+    <prefix>20261018T120000.000000Z-<epoch>-r<revision>-v<schema>.db.gz
+
+Point S3_ENDPOINT_URL (or endpoint_url) at a local S3 stand-in such as
+``python -m moto.server`` to try it without AWS.
+"""
+
+from datetime import datetime, timezone
+import os
+import re
+import secrets
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+
+from .migrations import get_schema_version
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(PACKAGE_DIR))
+S3_SCRIPT_DIR = os.environ.get(
+    "S3_SCRIPT_DIR",
+    os.path.join(REPO_DIR, "aws-S3-script"),
+)
+PAGES_PER_STEP = 1024
+EXTENSIONS = {"gzip": "gz", "zstd": "zst"}
+STAMP_FORMAT = "%Y%m%dT%H%M%S.%fZ"
+SNAPSHOT_KEY = re.compile(
+    r"(?P<stamp>\d{8}T\d{6}\.\d{6}Z)-(?P<epoch>[0-9a-f]+)"
+    r"-r(?P<revision>\d+)-v(?P<schema>\d+)\.db\.(?P<ext>gz|zst)"
+)
+
+
+def load_s3_operations():
+    """Imports the S3 tool lazily, so the API runs without boto3."""
+    if S3_SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, S3_SCRIPT_DIR)
+    try:
+        import s3_operations
+    except ImportError as e:
+        raise RuntimeError(
+            f"Backups need the S3 tool in {S3_SCRIPT_DIR} and its "
+            f"requirements ({e})"
+        ) from e
+    return s3_operations
+
+
+def configure_s3(endpoint_url=None):
+    s3_operations = load_s3_operations()
+    if endpoint_url:
+        s3_operations.configure_s3_client(endpoint_url=endpoint_url)
+    return s3_operations
+
+
+def parse_timestamp(value):
+    """Parses an ISO 8601 time; naive times are taken as UTC."""
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def snapshot_key(prefix, taken_at, epoch, revision, schema, compression):
+    stamp = taken_at.strftime(STAMP_FORMAT)
+    return (
+        f"{prefix}{stamp}-{epoch}-r{revision}-v{schema}"
+        f".db.{EXTENSIONS[compression]}"
+    )
+
+
+def parse_snapshot_key(key, prefix=None):
+    if prefix is None:
+        prefix = key[: key.rfind("/") + 1]
+    if not key.startswith(prefix):
+        return None
+    match = SNAPSHOT_KEY.fullmatch(key.removeprefix(prefix))
+    if match is None:
+        return None
+    return {
+        "key": key,
+        "taken_at": datetime.strptime(match["stamp"], STAMP_FORMAT).replace(
+            tzinfo=timezone.utc
+        ),
+        "epoch": match["epoch"],
+        "revision": int(match["revision"]),
+        "schema": int(match["schema"]),
+        "compression": "gzip" if match["ext"] == "gz" else "zstd",
+    }
+
+
+def list_snapshots(bucket, prefix="todo-db/"):
+    """Returns the snapshots under a prefix, oldest first."""
+    s3_operations = load_s3_operations()
+    snapshots = []
+    entries = s3_operations.iter_objects(bucket, prefix, include_metadata=True)
+    for entry in entries:
+        info = parse_snapshot_key(entry["Key"], prefix)
+        if info is not None:
+            info["size"] = entry["Size"]
+            snapshots.append(info)
+    snapshots.sort(key=lambda info: info["taken_at"])
+    return snapshots
+
+
+def find_snapshot(snapshots, at=None):
+    """Returns the latest snapshot taken at or before ``at`` (or at all)."""
+    if at is not None:
+        at = parse_timestamp(at)
+        snapshots = [info for info in snapshots if info["taken_at"] <= at]
+    return snapshots[-1] if snapshots else None
+
+
+def copy_pages(source, target, pages=PAGES_PER_STEP, pause=0.0):
+    """Copies ``source`` into ``target`` with the backup API, ``pages``
+    pages per step and ``pause`` seconds between steps. Returns the number
+    of pages copied.
+    """
+    totals = {"pages": 0}
+
+    def progress(status, remaining, total):
+        totals["pages"] = total
+        if pause and remaining:
+            time.sleep(pause)
+
+    source.backup(target, pages=pages, progress=progress)
+    return totals["pages"]
+
+
+def take_snapshot(
+    database,
+    bucket,
+    prefix="todo-db/",
+    compression="gzip",
+    pages=PAGES_PER_STEP,
+    pause=0.0,
+    spool_dir=None,
+    force=False,
+    last=None,
+):
+    """Snapshots ``database`` into ``bucket`` under ``prefix``.
+
+    The copy is spooled to a temporary file (in ``spool_dir``) and then
+    compressed while it is uploaded. Unless ``force`` is set nothing is
+    uploaded when the latest snapshot (``last``, or looked up in the
+    bucket) already has the same epoch, revision and schema version.
+    Returns a report with the key, sizes and timings; ``skipped`` is True
+    when the database was unchanged.
+    """
+    s3_operations = load_s3_operations()
+    if compression == "zstd" and s3_operations.zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package")
+    started = time.perf_counter()
+    source = sqlite3.connect(database, isolation_level=None)
+    try:
+        # In WAL mode a read transaction held across every backup step
+        # pins one version of the database: writers keep committing to the
+        # WAL and their commits do not restart the copy. Other journal
+        # modes would block writers for the whole copy, so there each step
+        # reads on its own and SQLite restarts the copy after a write.
+        wal = source.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        if wal:
+            source.execute("BEGIN")
+        # The transaction's first read fixes the version that is copied
+        taken_at = datetime.now(timezone.utc)
+        revision, epoch = source.execute(
+            "SELECT revision, epoch FROM sync_state"
+        ).fetchone()
+        schema = get_schema_version(source)
+        if last is None and not force:
+            last = find_snapshot(list_snapshots(bucket, prefix))
+        if (
+            not force
+            and last is not None
+            and (last["epoch"], last["revision"], last["schema"])
+            == (epoch, revision, schema)
+        ):
+            return {
+                "key": last["key"],
+                "skipped": True,
+                "revision": revision,
+                "epoch": epoch,
+            }
+        fd, spool_path = tempfile.mkstemp(suffix=".db", dir=spool_dir)
+        os.close(fd)
+        try:
+            target = sqlite3.connect(spool_path)
+            try:
+                page_count = copy_pages(source, target, pages, pause)
+            finally:
+                target.close()
+        except Exception:
+            os.remove(spool_path)
+            raise
+        if wal:
+            source.execute("COMMIT")
+    finally:
+        source.close()
+
+    try:
+        copied = time.perf_counter()
+        key = snapshot_key(
+            prefix,
+            taken_at,
+            epoch,
+            revision,
+            schema,
+            compression,
+        )
+        with open(spool_path, "rb") as f:
+            reader = s3_operations.CompressingReader(f, compression)
+            encoding = s3_operations.COMPRESSIONS[compression][0]
+            try:
+                s3_operations.create_s3_connection().upload_fileobj(
+                    reader,
+                    bucket,
+                    key,
+                    ExtraArgs={
+                        "ContentType": "application/vnd.sqlite3",
+                        "ContentEncoding": encoding,
+                    },
+                    Config=s3_operations.build_transfer_config(),
+                )
+            except Exception as e:
+                s3_operations.log_operation(
+                    "backup_db",
+                    started,
+                    bucket,
+                    key,
+                    error=e,
+                )
+                raise
+        s3_operations.log_operation(
+            "backup_db", started, bucket, key, reader.bytes_written
+        )
+    finally:
+        os.remove(spool_path)
+    finished = time.perf_counter()
+    return {
+        "key": key,
+        "skipped": False,
+        "revision": revision,
+        "epoch": epoch,
+        "taken_at": taken_at.isoformat(),
+        "pages": page_count,
+        "database_bytes": reader.bytes_read,
+        "uploaded_bytes": reader.bytes_written,
+        "copy_seconds": round(copied - started, 3),
+        "upload_seconds": round(finished - copied, 3),
+    }
+
+
+def prune_snapshots(bucket, prefix="todo-db/", keep=48):
+    """Deletes all but the ``keep`` newest snapshots; returns the keys."""
+    snapshots = list_snapshots(bucket, prefix)
+    count = max(len(snapshots) - keep, 0)
+    stale = [info["key"] for info in snapshots[:count]]
+    s3 = load_s3_operations().create_s3_connection()
+    for start in range(0, len(stale), 1000):
+        end = start + 1000
+        batch = stale[start:end]
+        response = s3.delete_objects(
+            Bucket=bucket,
+            Delete={
+                "Objects": [{"Key": key} for key in batch],
+                "Quiet": True,
+            },
+        )
+        if response.get("Errors"):
+            error = response["Errors"][0]
+            raise RuntimeError(
+                f"Could not delete {error['Key']}: {error.get('Message')}"
+            )
+    return stale
+
+
+def decompressor(compression):
+    if compression == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    s3_operations = load_s3_operations()
+    if s3_operations.zstandard is None:
+        raise RuntimeError("zstd snapshots require the zstandard package")
+    return s3_operations.zstandard.ZstdDecompressor().decompressobj()
+
+
+def restore_snapshot(database, bucket, prefix="todo-db/", at=None, key=None):
+    """Restores ``database`` from the snapshot ``key``, or from the latest
+    one taken at or before ``at`` (the latest overall by default).
+
+    The snapshot is streamed from S3 and decompressed into a temporary
+    file next to ``database`` and checked with ``PRAGMA quick_check``
+    before it replaces the contents of ``database`` in one transaction;
+    a running server's open connections read the restored data from
+    their next transaction on. The restored database gets a new sync
+    epoch, which makes clients that cached tasks from the old revisions
+    start over and makes running servers drop their cached responses
+    within RESPONSE_CACHE_EPOCH_CHECK_SECONDS.
+    """
+    s3_operations = load_s3_operations()
+    if key is None:
+        info = find_snapshot(list_snapshots(bucket, prefix), at)
+        if info is None:
+            raise LookupError(
+                f"No snapshot in s3://{bucket}/{prefix}"
+                + (
+                    f" at or before {parse_timestamp(at).isoformat()}"
+                    if at is not None
+                    else ""
+                )
+            )
+    else:
+        info = parse_snapshot_key(key)
+        if info is None:
+            raise ValueError(f"Not a snapshot key: {key}")
+    started = time.perf_counter()
+    directory = os.path.dirname(os.path.abspath(database))
+    fd, spool_path = tempfile.mkstemp(suffix=".db", dir=directory)
+    try:
+        stream = decompressor(info["compression"])
+        downloaded = 0
+        response = s3_operations.create_s3_connection().get_object(
+            Bucket=bucket, Key=info["key"]
+        )
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response["Body"].iter_chunks(s3_operations.MB):
+                downloaded += len(chunk)
+                f.write(stream.decompress(chunk))
+            f.write(stream.flush())
+        snapshot = sqlite3.connect(spool_path, isolation_level=None)
+        try:
+            check = snapshot.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise sqlite3.DatabaseError(
+                    f"Snapshot {info['key']} is corrupt: {check}"
+                )
+            epoch = secrets.token_hex(8)
+            snapshot.execute("UPDATE sync_state SET epoch = ?", (epoch,))
+            target = sqlite3.connect(database)
+            try:
+                # One step: the target is replaced in a single transaction
+                snapshot.backup(target)
+            finally:
+                target.close()
+        finally:
+            snapshot.close()
+    except Exception as e:
+        s3_operations.log_operation(
+            "restore_db",
+            started,
+            bucket,
+            info["key"],
+            error=e,
+        )
+        raise
+    finally:
+        for path in (spool_path, spool_path + "-wal", spool_path + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    s3_operations.log_operation(
+        "restore_db",
+        started,
+        bucket,
+        info["key"],
+        downloaded,
+    )
+    return {
+        "key": info["key"],
+        "taken_at": info["taken_at"].isoformat(),
+        "revision": info["revision"],
+        "epoch": epoch,
+        "downloaded_bytes": downloaded,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
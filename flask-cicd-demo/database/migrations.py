@@ -0,0 +1,204 @@
+import sqlite3
+
+from .setup_db import create_table
+
+# Each step carries a frozen copy of the DDL it was released with. SCHEMA
+# in schema.py describes the current database; editing it never changes
+# what a released step does, so every schema change also needs a new step
+# here (tests/test_migrations.py checks that the two agree).
+
+TASKS_V1 = {
+    "columns": {
+        "task_id": "INTEGER PRIMARY KEY",
+        "name": "TEXT NOT NULL",
+        "description": "TEXT",
+        "completed": "TEXT CHECK(completed IN ('incomplete', 'complete'))",
+    },
+    "indexes": {
+        "idx_tasks_completed": {
+            "columns": ["completed", "task_id"],
+        },
+        "idx_tasks_name": {
+            "columns": ["name"],
+        },
+        "idx_tasks_incomplete_name": {
+            "columns": ["name"],
+            "where": "completed = 'incomplete'",
+        },
+    },
+}
+
+TASKS_FTS_V1 = {
+    "using": "fts5",
+    "columns": ["name", "description"],
+    "options": {"content": "tasks", "content_rowid": "task_id"},
+    "triggers": {
+        "tasks_fts_insert": """
+        AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, name, description)
+            VALUES (new.task_id, new.name, new.description);
+        END
+        """,
+        "tasks_fts_delete": """
+        AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+            VALUES ('delete', old.task_id, old.name, old.description);
+        END
+        """,
+        "tasks_fts_update": """
+        AFTER UPDATE OF name, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+            VALUES ('delete', old.task_id, old.name, old.description);
+            INSERT INTO tasks_fts (rowid, name, description)
+            VALUES (new.task_id, new.name, new.description);
+        END
+        """,
+    },
+}
+
+TASKS_V2 = {
+    "columns": {
+        "updated_at": "TEXT",
+        "revision": "INTEGER NOT NULL DEFAULT 0",
+    },
+    "indexes": {
+        "idx_tasks_revision": {
+            "columns": ["revision"],
+        },
+    },
+}
+
+SYNC_STATE_V2 = {
+    "columns": {
+        "id": "INTEGER PRIMARY KEY CHECK (id = 0)",
+        "revision": "INTEGER NOT NULL",
+        "epoch": "TEXT NOT NULL",
+    },
+}
+
+TASK_TOMBSTONES_V2 = {
+    "columns": {
+        "task_id": "INTEGER PRIMARY KEY",
+        "revision": "INTEGER NOT NULL",
+        "deleted_at": "TEXT NOT NULL",
+    },
+    "indexes": {
+        "idx_task_tombstones_revision": {
+            "columns": ["revision"],
+        },
+    },
+    "triggers": {
+        "tasks_track_insert": """
+        AFTER INSERT ON tasks BEGIN
+            UPDATE sync_state SET revision = revision + 1;
+            UPDATE tasks
+            SET revision = coalesce((SELECT revision FROM sync_state), 0),
+                updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+            WHERE task_id = new.task_id;
+            DELETE FROM task_tombstones WHERE task_id = new.task_id;
+        END
+        """,
+        "tasks_track_update": """
+        AFTER UPDATE OF name, description, completed ON tasks
+        WHEN old.name IS NOT new.name
+            OR old.description IS NOT new.description
+            OR old.completed IS NOT new.completed
+        BEGIN
+            UPDATE sync_state SET revision = revision + 1;
+            UPDATE tasks
+            SET revision = coalesce((SELECT revision FROM sync_state), 0),
+                updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+            WHERE task_id = new.task_id;
+        END
+        """,
+        "tasks_track_delete": """
+        AFTER DELETE ON tasks BEGIN
+            UPDATE sync_state SET revision = revision + 1;
+            INSERT OR REPLACE INTO task_tombstones
+                (task_id, revision, deleted_at)
+            VALUES (old.task_id,
+                    coalesce((SELECT revision FROM sync_state), 0),
+                    strftime('%Y-%m-%dT%H:%M:%fZ', 'now'));
+        END
+        """,
+    },
+}
+
+
+def create_tasks(cursor):
+    create_table(cursor, "tasks", TASKS_V1)
+    create_table(cursor, "tasks_fts", TASKS_FTS_V1)
+
+
+def track_changes(cursor):
+    # tasks exists by now, so only its new columns and index are added
+    create_table(cursor, "tasks", TASKS_V2)
+    create_table(cursor, "sync_state", SYNC_STATE_V2)
+    create_table(cursor, "task_tombstones", TASK_TOMBSTONES_V2)
+    cursor.execute(
+        "INSERT OR IGNORE INTO sync_state (id, revision, epoch) "
+        "VALUES (0, 0, lower(hex(randomblob(8))))"
+    )
+    # Existing rows get distinct revisions (task ids are unique) above the
+    # current one, so a client starting from 0 can page through them.
+    cursor.execute(
+        """
+    UPDATE tasks
+    SET revision = task_id + (SELECT revision FROM sync_state),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+    WHERE revision = 0
+    """
+    )
+    cursor.execute(
+        """
+    UPDATE sync_state
+    SET revision = max(revision, (SELECT coalesce(max(revision), 0)
+                                  FROM tasks))
+    """
+    )
+
+
+# Each step upgrades the database by one version and must be safe to run
+# against a pre-migration database whose tables were created by an older
+# create_tables, so never edit or reorder a released step; append a new one.
+MIGRATIONS = [
+    # 1: tasks table, secondary indexes and the tasks_fts search index
+    create_tasks,
+    # 2: updated_at/revision tracking, tombstones and the sync counter
+    track_changes,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def check_schema_version(version):
+    if version > SCHEMA_VERSION:
+        raise sqlite3.DatabaseError(
+            f"database schema version {version} is newer than this "
+            f"application's ({SCHEMA_VERSION}); upgrade the application"
+        )
+
+
+def migrate(conn):
+    version = get_schema_version(conn)
+    check_schema_version(version)
+    if version == SCHEMA_VERSION:
+        return False
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        # Another process may have migrated while we waited for the lock.
+        version = get_schema_version(conn)
+        check_schema_version(version)
+        for step in MIGRATIONS[version:]:
+            step(cursor)
+        if version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return version < SCHEMA_VERSION
@@ -0,0 +1,104 @@
+import queue
+import sqlite3
+import threading
+from .setup_db import validate_connection
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,
+    "mmap_size": 268435456,
+}
+
+
+class ConnectionPool:
+    """Bounded pool of reusable SQLite connections.
+
+    Connections are created lazily up to ``max_size``, configured once with
+    ``pragmas`` and validated with ``validate_connection`` every time they
+    are handed out, so a broken connection is replaced instead of reused.
+    """
+
+    def __init__(
+        self,
+        database="todo.db",
+        max_size=8,
+        timeout=5.0,
+        pragmas=None,
+        factory=sqlite3.Connection,
+    ):
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self.factory = factory
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            check_same_thread=False,
+            factory=self.factory,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                return True
+            return False
+
+    def _free_slot(self):
+        with self._lock:
+            self._created -= 1
+
+    def acquire(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve_slot():
+                    try:
+                        return self._connect()
+                    except Exception:
+                        self._free_slot()
+                        raise
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        "timed out waiting for a database connection"
+                    )
+            if validate_connection(conn):
+                return conn
+            self.discard(conn)
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self.discard(conn)
+            return
+        self._idle.put_nowait(conn)
+
+    def discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._free_slot()
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(conn)
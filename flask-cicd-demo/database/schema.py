@@ -5,6 +5,108 @@ SCHEMA = {
             "name": "TEXT NOT NULL",
             "description": "TEXT",
             "completed": "TEXT CHECK(completed IN ('incomplete', 'complete'))",
+            "updated_at": "TEXT",
+            "revision": "INTEGER NOT NULL DEFAULT 0",
+        },
+        "indexes": {
+            "idx_tasks_completed": {
+                "columns": ["completed", "task_id"],
+            },
+            "idx_tasks_name": {
+                "columns": ["name"],
+            },
+            "idx_tasks_incomplete_name": {
+                "columns": ["name"],
+                "where": "completed = 'incomplete'",
+            },
+            "idx_tasks_revision": {
+                "columns": ["revision"],
+            },
+        },
+    },
+    "tasks_fts": {
+        "using": "fts5",
+        "columns": ["name", "description"],
+        "options": {"content": "tasks", "content_rowid": "task_id"},
+        "triggers": {
+            "tasks_fts_insert": """
+            AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, name, description)
+                VALUES (new.task_id, new.name, new.description);
+            END
+            """,
+            "tasks_fts_delete": """
+            AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+                VALUES ('delete', old.task_id, old.name, old.description);
+            END
+            """,
+            "tasks_fts_update": """
+            AFTER UPDATE OF name, description ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+                VALUES ('delete', old.task_id, old.name, old.description);
+                INSERT INTO tasks_fts (rowid, name, description)
+                VALUES (new.task_id, new.name, new.description);
+            END
+            """,
+        },
+    },
+    # Single row holding the last revision handed out. Every insert,
+    # update and delete of a task takes the next revision, which is the
+    # sync token of GET /tasks/changes; epoch changes when the database is
+    # recreated, so clients know their token no longer applies.
+    "sync_state": {
+        "columns": {
+            "id": "INTEGER PRIMARY KEY CHECK (id = 0)",
+            "revision": "INTEGER NOT NULL",
+            "epoch": "TEXT NOT NULL",
+        },
+    },
+    "task_tombstones": {
+        "columns": {
+            "task_id": "INTEGER PRIMARY KEY",
+            "revision": "INTEGER NOT NULL",
+            "deleted_at": "TEXT NOT NULL",
+        },
+        "indexes": {
+            "idx_task_tombstones_revision": {
+                "columns": ["revision"],
+            },
+        },
+        "triggers": {
+            "tasks_track_insert": """
+            AFTER INSERT ON tasks BEGIN
+                UPDATE sync_state SET revision = revision + 1;
+                UPDATE tasks
+                SET revision = coalesce((SELECT revision FROM sync_state), 0),
+                    updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+                WHERE task_id = new.task_id;
+                DELETE FROM task_tombstones WHERE task_id = new.task_id;
+            END
+            """,
+            "tasks_track_update": """
+            AFTER UPDATE OF name, description, completed ON tasks
+            WHEN old.name IS NOT new.name
+                OR old.description IS NOT new.description
+                OR old.completed IS NOT new.completed
+            BEGIN
+                UPDATE sync_state SET revision = revision + 1;
+                UPDATE tasks
+                SET revision = coalesce((SELECT revision FROM sync_state), 0),
+                    updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')
+                WHERE task_id = new.task_id;
+            END
+            """,
+            "tasks_track_delete": """
+            AFTER DELETE ON tasks BEGIN
+                UPDATE sync_state SET revision = revision + 1;
+                INSERT OR REPLACE INTO task_tombstones
+                    (task_id, revision, deleted_at)
+                VALUES (old.task_id,
+                        coalesce((SELECT revision FROM sync_state), 0),
+                        strftime('%Y-%m-%dT%H:%M:%fZ', 'now'));
+            END
+            """,
         },
     },
 }
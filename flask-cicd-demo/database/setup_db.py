@@ -2,8 +2,8 @@ import sqlite3
 from .schema import SCHEMA
 
 
-def create_connection():
-    conn = sqlite3.connect("todo.db")
+def create_connection(database="todo.db"):
+    conn = sqlite3.connect(database)
     cursor = conn.cursor()
     return conn, cursor
 
@@ -22,8 +22,56 @@ def format_foreign_keys(info):
     return s
 
 
-def create_tables(conn, cursor):
-    for table, info in SCHEMA.items():
+def format_indexes(table, info):
+    queries = []
+    for name, index in info.get("indexes", {}).items():
+        unique = "UNIQUE " if index.get("unique") else ""
+        columns = ", ".join(index["columns"])
+        query = (f"CREATE {unique}INDEX IF NOT EXISTS {name} "
+                 f"ON {table} ({columns})")
+        if "where" in index:
+            query += f" WHERE {index['where']}"
+        queries.append(query)
+    return queries
+
+
+def format_virtual_table(table, info):
+    args = list(info["columns"])
+    for key, val in info.get("options", {}).items():
+        args.append(f"{key}='{val}'")
+    return f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {table}
+    USING {info["using"]}({', '.join(args)})
+    """
+
+
+def format_triggers(info):
+    queries = []
+    for name, body in info.get("triggers", {}).items():
+        queries.append(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    return queries
+
+
+def table_exists(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table,))
+    return cursor.fetchone() is not None
+
+
+def add_missing_columns(cursor, table, info):
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+    for key, val in info["columns"].items():
+        if key not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {key} {val}")
+
+
+def create_table(cursor, table, info):
+    existed = table_exists(cursor, table)
+    if "using" in info:
+        query = format_virtual_table(table, info)
+    else:
         columns = convert_to_sql_columns(info["columns"])
         foreign_keys = ""
         if "foreign_keys" in info:
@@ -32,8 +80,21 @@ def create_tables(conn, cursor):
         CREATE TABLE IF NOT EXISTS {table}
         ({columns}{foreign_keys})
         """
+    cursor.execute(query)
+    if existed and "using" not in info:
+        add_missing_columns(cursor, table, info)
+    for index_query in format_indexes(table, info):
+        cursor.execute(index_query)
+    for trigger_query in format_triggers(info):
+        cursor.execute(trigger_query)
+    if info.get("using") == "fts5" and not existed:
+        cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
+
+def create_tables(conn, cursor):
+    for table, info in SCHEMA.items():
         try:
-            cursor.execute(query)
+            create_table(cursor, table, info)
             conn.commit()
         except Exception as e:
             print(f"Exception: {e}")
@@ -58,10 +119,11 @@ def to_dict(task):
     }
 
 
-def main():
-    conn, cursor = create_connection()
+def main(database="todo.db"):
+    from .migrations import migrate
+    conn, cursor = create_connection(database)
     if validate_connection(conn):
-        create_tables(conn, cursor)
+        migrate(conn)
     else:
         print("Failed to connect to the database")
     conn.close()
@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+
+from app import app
+from app.routes import response_cache
+
+V0_TASKS_TABLE = """
+CREATE TABLE tasks (
+    task_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    completed TEXT CHECK(completed IN ('incomplete', 'complete'))
+)
+"""
+V0_TASKS = [
+    (1, "write report", "quarterly numbers", "incomplete"),
+    (2, "water plants", None, "complete"),
+    (5, "call plumber", "kitchen sink", "incomplete"),
+]
+
+
+def close_app_pool():
+    pool = app.extensions.pop("db_pool", None)
+    if pool is not None:
+        pool.close_all()
+
+
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / "todo.db")
+
+
+@pytest.fixture
+def v0_database(database):
+    """A database as the pre-migration create_tables left it."""
+    conn = sqlite3.connect(database)
+    conn.execute(V0_TASKS_TABLE)
+    conn.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?)", V0_TASKS)
+    conn.commit()
+    conn.close()
+    return database
+
+
+@pytest.fixture
+def client(database):
+    """Test client serving a fresh database, migrated on first request."""
+    saved = dict(app.config)
+    close_app_pool()
+    app.config.update(TESTING=True, DATABASE=database)
+    response_cache.bump()
+    yield app.test_client()
+    close_app_pool()
+    app.config.update(saved)
+    response_cache.bump()
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta, timezone
+import sqlite3
+
+import pytest
+
+from app import app
+from database.backup import (
+    configure_s3,
+    find_snapshot,
+    list_snapshots,
+    parse_snapshot_key,
+    prune_snapshots,
+    restore_snapshot,
+    snapshot_key,
+    take_snapshot,
+)
+
+BUCKET = "todo-backups"
+PREFIX = "todo-db/"
+NOON = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+
+
+def snapshots_at(*hours):
+    keys = [
+        snapshot_key(PREFIX, NOON + timedelta(hours=h), "ab12", h, 3, "gzip")
+        for h in hours
+    ]
+    return [parse_snapshot_key(key) for key in keys]
+
+
+def test_snapshot_key_round_trip():
+    key = snapshot_key(PREFIX, NOON, "0f3a", 42, 3, "zstd")
+    assert key == "todo-db/20261018T120000.000000Z-0f3a-r42-v3.db.zst"
+    assert parse_snapshot_key(key) == {
+        "key": key,
+        "taken_at": NOON,
+        "epoch": "0f3a",
+        "revision": 42,
+        "schema": 3,
+        "compression": "zstd",
+    }
+
+
+@pytest.mark.parametrize(
+    "key, prefix",
+    [
+        ("todo-db/20261018T120000.000000Z-0f3a-r42-v3.db.gz", "other/"),
+        ("todo-db/notes.txt", None),
+        ("todo-db/20261018T120000Z-0f3a-r42-v3.db.gz", None),
+    ],
+)
+def test_parse_snapshot_key_ignores_other_objects(key, prefix):
+    assert parse_snapshot_key(key, prefix) is None
+
+
+def test_find_snapshot_picks_latest_at_or_before():
+    snapshots = snapshots_at(0, 1, 2)
+    assert find_snapshot(snapshots) == snapshots[2]
+    assert find_snapshot(snapshots, "2026-10-18T13:30:00Z") == snapshots[1]
+    assert find_snapshot(snapshots, "2026-10-18T13:00:00") == snapshots[1]
+    assert find_snapshot(snapshots, "2026-10-18T13:30:00+02:00") is None
+    assert find_snapshot([], None) is None
+    with pytest.raises(ValueError):
+        find_snapshot(snapshots, "yesterday")
+
+
+@pytest.fixture
+def s3(tmp_path, monkeypatch):
+    """An empty bucket in moto's in-process S3."""
+    pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+    s3_operations = configure_s3()
+    monkeypatch.setattr(s3_operations, "S3_LOG_PATH", str(tmp_path / "log"))
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    saved = dict(s3_operations.S3_CLIENT_OPTIONS)
+    with moto.mock_aws():
+        s3_operations.configure_s3_client(
+            endpoint_url=None,
+            region_name="us-east-1",
+        )
+        s3_operations.create_s3_connection().create_bucket(Bucket=BUCKET)
+        yield s3_operations
+        s3_operations.stop_logging()
+    s3_operations.configure_s3_client(**saved)
+
+
+@pytest.fixture
+def tasks(client, database):
+    for name in ("write report", "water plants"):
+        client.post("/tasks", json={"name": name})
+    return database
+
+
+def read_tasks(database):
+    conn = sqlite3.connect(database)
+    try:
+        query = "SELECT task_id, name FROM tasks ORDER BY task_id"
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+def test_snapshot_and_restore(s3, tasks, tmp_path):
+    report = take_snapshot(tasks, BUCKET, PREFIX, pages=1)
+    assert not report["skipped"]
+    assert report["uploaded_bytes"] < report["database_bytes"]
+    info = parse_snapshot_key(report["key"], PREFIX)
+    assert info["revision"] == report["revision"]
+    assert list_snapshots(BUCKET, PREFIX)[0]["key"] == report["key"]
+
+    target = str(tmp_path / "restored.db")
+    restored = restore_snapshot(target, BUCKET, PREFIX)
+    assert restored["key"] == report["key"]
+    assert restored["epoch"] != report["epoch"]
+    assert read_tasks(target) == read_tasks(tasks)
+
+
+def test_unchanged_database_is_not_uploaded_again(s3, tasks, client):
+    first = take_snapshot(tasks, BUCKET, PREFIX)
+    again = take_snapshot(tasks, BUCKET, PREFIX)
+    assert again["skipped"]
+    assert again["key"] == first["key"]
+    client.post("/tasks", json={"name": "call plumber"})
+    changed = take_snapshot(tasks, BUCKET, PREFIX)
+    assert not changed["skipped"]
+    assert changed["revision"] > first["revision"]
+    keys = [info["key"] for info in list_snapshots(BUCKET, PREFIX)]
+    assert keys == [first["key"], changed["key"]]
+
+
+def test_restore_picks_snapshot_by_time(s3, tasks, client, tmp_path):
+    first = take_snapshot(tasks, BUCKET, PREFIX)
+    client.delete("/tasks/1")
+    take_snapshot(tasks, BUCKET, PREFIX)
+    target = str(tmp_path / "restored.db")
+    restored = restore_snapshot(target, BUCKET, PREFIX, at=first["taken_at"])
+    assert restored["key"] == first["key"]
+    assert [name for _, name in read_tasks(target)] == [
+        "write report",
+        "water plants",
+    ]
+    with pytest.raises(LookupError):
+        restore_snapshot(target, BUCKET, PREFIX, at="2000-01-01")
+
+
+def test_prune_keeps_newest_snapshots(s3, tasks, client):
+    keys = []
+    for name in ("a", "b", "c"):
+        client.post("/tasks", json={"name": name})
+        keys.append(take_snapshot(tasks, BUCKET, PREFIX)["key"])
+    assert prune_snapshots(BUCKET, PREFIX, keep=1) == keys[:2]
+    remaining = [info["key"] for info in list_snapshots(BUCKET, PREFIX)]
+    assert remaining == keys[2:]
+
+
+def test_backup_and_restore_commands(s3, tasks, client, tmp_path):
+    runner = app.test_cli_runner()
+    args = ["--bucket", BUCKET, "--prefix", PREFIX]
+    result = runner.invoke(args=["backup-db", *args])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith(f"Snapshot s3://{BUCKET}/{PREFIX}")
+    result = runner.invoke(args=["backup-db", *args])
+    assert result.output.startswith("Unchanged since")
+
+    result = runner.invoke(args=["list-backups", *args])
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 1
+
+    target = str(tmp_path / "restored.db")
+    result = runner.invoke(
+        args=["restore-db", *args, "--to", target, "--yes"],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith(f"Restored {target} to revision")
+    assert read_tasks(target) == read_tasks(tasks)
+
+    result = runner.invoke(args=["restore-db", *args, "--at", "soon"])
+    assert result.exit_code == 2
+    assert "--at" in result.output
@@ -0,0 +1,85 @@
+import pytest
+
+
+def bulk(client, method, items):
+    response = client.open("/tasks/bulk", method=method, json=items)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def statuses(body):
+    return [result["status"] for result in body["results"]]
+
+
+def all_tasks(client):
+    return client.get("/tasks").get_json()["data"]
+
+
+def test_bulk_create_reports_each_item(client):
+    body = bulk(
+        client,
+        "POST",
+        [{"name": "first"}, {"description": "no name"}, {"name": "second"}],
+    )
+    assert statuses(body) == [201, 400, 201]
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    first, invalid, second = body["results"]
+    assert invalid["index"] == 1
+    assert invalid["message"]
+    tasks = {task["task_id"]: task["name"] for task in all_tasks(client)}
+    assert tasks == {first["task_id"]: "first", second["task_id"]: "second"}
+
+
+def test_bulk_create_rejects_non_string_names(client):
+    body = bulk(client, "POST", [{"name": 5}, "task"])
+    assert statuses(body) == [400, 400]
+    assert all_tasks(client) == []
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+def test_bulk_body_must_be_a_list(client, method):
+    response = client.open("/tasks/bulk", method=method, json={"name": "x"})
+    assert response.status_code == 400
+    assert "expected a JSON array" in response.get_json()["message"]
+
+
+def test_bulk_update_reports_each_item(client):
+    created = bulk(client, "POST", [{"name": "a"}, {"name": "b"}])
+    first, second = (r["task_id"] for r in created["results"])
+    body = bulk(
+        client,
+        "PATCH",
+        [
+            {"task_id": first, "completed": "complete"},
+            {"completed": "complete"},
+            {"task_id": second, "completed": "done"},
+            {"task_id": 999, "name": "ghost"},
+            {"task_id": second, "name": "renamed"},
+            {"task_id": second},
+        ],
+    )
+    assert statuses(body) == [200, 400, 400, 404, 200, 400]
+    assert body["results"][1]["message"] == "task_id is required"
+    assert "completed must be one of" in body["results"][2]["message"]
+    assert body["results"][3]["message"] == "task could not be found"
+    assert (body["succeeded"], body["failed"]) == (2, 4)
+    tasks = {task["task_id"]: task for task in all_tasks(client)}
+    assert tasks[first]["completed"] == "complete"
+    assert tasks[second]["name"] == "renamed"
+    assert tasks[second]["completed"] == "incomplete"
+
+
+def test_bulk_delete_reports_each_item(client):
+    created = bulk(client, "POST", [{"name": "a"}, {"name": "b"}])
+    first, second = (r["task_id"] for r in created["results"])
+    body = bulk(client, "DELETE", [first, "2", 999, first, True])
+    assert statuses(body) == [200, 400, 404, 404, 400]
+    assert body["results"][1]["message"] == "task_id must be an integer"
+    assert body["results"][2]["message"] == "task could not be found"
+    assert [task["task_id"] for task in all_tasks(client)] == [second]
+
+
+def test_bulk_writes_refresh_cached_listing(client):
+    assert all_tasks(client) == []
+    bulk(client, "POST", [{"name": "fresh"}])
+    assert [task["name"] for task in all_tasks(client)] == ["fresh"]
@@ -0,0 +1,101 @@
+import sqlite3
+
+from app.cache import ResponseCache
+from app.routes import response_cache
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = ResponseCache(max_entries=10, max_bytes=100, max_entry_bytes=60)
+    cache.put("a", 0, "a", 40)
+    cache.put("b", 0, "b", 40)
+    assert cache.get("a", 0) == "a"
+    # "b" is now the least recently used, so it goes first
+    cache.put("c", 0, "c", 40)
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) == "a"
+    assert cache.size == 80
+
+
+def test_cache_skips_large_entries():
+    cache = ResponseCache(max_entry_bytes=10)
+    cache.put("big", 0, "x" * 11, 11)
+    assert cache.get("big", 0) is None
+    assert cache.size == 0
+
+
+def test_cache_replaces_entry_size():
+    cache = ResponseCache()
+    cache.put("a", 0, "a", 40)
+    cache.put("a", 0, "aa", 50)
+    assert cache.size == 50
+    cache.bump()
+    assert cache.size == 0
+
+
+def test_large_listing_is_not_cached(client, monkeypatch):
+    monkeypatch.setattr(response_cache, "max_entry_bytes", 200)
+    for i in range(10):
+        client.post("/tasks", json={"name": f"task {i}"})
+    response = client.get("/tasks")
+    assert len(response.get_data()) > 200
+    assert response_cache.get("/tasks?", response_cache.version) is None
+    client.get("/tasks?limit=1")
+    assert response_cache.size > 0
+
+
+def test_listing_carries_an_etag(client):
+    response = client.get("/tasks")
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
+    etag = response.get_etag()[0]
+    assert etag == response_cache.etag(response_cache.version)
+    assert client.get("/tasks").get_etag()[0] == etag
+
+
+def test_matching_etag_gets_not_modified(client):
+    client.post("/tasks", json={"name": "cached"})
+    etag = client.get("/tasks/1").get_etag()[0]
+    response = client.get("/tasks/1", headers={"If-None-Match": f'"{etag}"'})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    stale = client.get("/tasks/1", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+def test_writes_change_the_etag_and_data(client):
+    first = client.get("/tasks")
+    etag = first.get_etag()[0]
+    assert first.get_json()["data"] == []
+    client.post("/tasks", json={"name": "new"})
+    response = client.get("/tasks", headers={"If-None-Match": f'"{etag}"'})
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+    assert [task["name"] for task in response.get_json()["data"]] == ["new"]
+    client.put("/tasks/1", json={"name": "renamed"})
+    assert client.get("/tasks/1").get_json()["data"][0]["name"] == "renamed"
+    client.delete("/tasks/1")
+    assert client.get("/tasks").get_json()["data"] == []
+
+
+def test_failed_writes_keep_the_cache(client):
+    client.get("/tasks")
+    version = response_cache.version
+    assert client.post("/tasks", json={}).status_code == 400
+    assert client.delete("/tasks/99").status_code == 404
+    assert response_cache.version == version
+    assert response_cache.get("/tasks?", version) is not None
+
+
+def test_new_epoch_drops_cached_responses(client, database):
+    client.application.config["RESPONSE_CACHE_EPOCH_CHECK_SECONDS"] = 0
+    client.post("/tasks", json={"name": "before restore"})
+    etag = client.get("/tasks").get_etag()[0]
+    # What a restore-db run by another process leaves behind
+    conn = sqlite3.connect(database)
+    conn.execute("UPDATE tasks SET name = 'after restore'")
+    conn.execute("UPDATE sync_state SET epoch = 'restored'")
+    conn.commit()
+    conn.close()
+    response = client.get("/tasks")
+    assert response.get_etag()[0] != etag
+    assert response.get_json()["data"][0]["name"] == "after restore"
@@ -0,0 +1,182 @@
+import sqlite3
+
+import pytest
+
+from app.routes import response_cache
+from database.migrations import migrate
+from tests.conftest import V0_TASKS
+
+
+@pytest.fixture
+def conn(database):
+    conn = sqlite3.connect(database)
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def revision_of(conn, task_id):
+    query = "SELECT revision, updated_at FROM tasks WHERE task_id = ?"
+    return conn.execute(query, (task_id,)).fetchone()
+
+
+def sync_revision(conn):
+    return conn.execute("SELECT revision FROM sync_state").fetchone()[0]
+
+
+def tombstones(conn):
+    query = "SELECT task_id, revision FROM task_tombstones ORDER BY task_id"
+    return conn.execute(query).fetchall()
+
+
+def create(client, name):
+    response = client.post("/tasks", json={"name": name})
+    assert response.status_code == 201
+    return response.get_json()["task_id"]
+
+
+def changes(client, since=0, limit=None):
+    url = f"/tasks/changes?since={since}"
+    if limit is not None:
+        url += f"&limit={limit}"
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def read_feed(client, since=0, limit=None):
+    """Follows next_since until has_more is false."""
+    entries = []
+    while True:
+        page = changes(client, since, limit)
+        entries.extend(page["data"])
+        since = page["next_since"]
+        if not page["has_more"]:
+            return entries, since
+
+
+def summary(entries):
+    keys = ("task_id", "deleted", "revision")
+    return [tuple(entry[key] for key in keys) for entry in entries]
+
+
+def test_writes_take_the_next_revision(conn):
+    conn.execute("INSERT INTO tasks (name) VALUES ('a')")
+    conn.execute("INSERT INTO tasks (name) VALUES ('b')")
+    assert revision_of(conn, 1)[0] == 1
+    assert revision_of(conn, 2)[0] == 2
+    assert revision_of(conn, 1)[1] is not None
+
+    conn.execute("UPDATE tasks SET name = 'a2' WHERE task_id = 1")
+    assert revision_of(conn, 1)[0] == 3
+    conn.execute("UPDATE tasks SET completed = 'complete' WHERE task_id = 1")
+    assert revision_of(conn, 1)[0] == 4
+    assert sync_revision(conn) == 4
+
+
+def test_update_without_change_keeps_revision(conn):
+    conn.execute("INSERT INTO tasks (name, description) VALUES ('a', 'x')")
+    conn.execute("UPDATE tasks SET name = 'a', description = 'x'")
+    assert revision_of(conn, 1)[0] == 1
+    assert sync_revision(conn) == 1
+
+
+def test_delete_leaves_tombstone_until_reinsert(conn):
+    conn.execute("INSERT INTO tasks (name) VALUES ('a')")
+    conn.execute("INSERT INTO tasks (name) VALUES ('b')")
+    conn.execute("DELETE FROM tasks WHERE task_id = 2")
+    assert tombstones(conn) == [(2, 3)]
+    assert sync_revision(conn) == 3
+
+    conn.execute("INSERT INTO tasks (task_id, name) VALUES (2, 'b')")
+    assert tombstones(conn) == []
+    assert revision_of(conn, 2)[0] == 4
+
+
+def test_feed_merges_tasks_and_tombstones(client):
+    for name in ("a", "b", "c"):
+        create(client, name)
+    start = changes(client)["next_since"]
+    client.delete("/tasks/2")
+    create(client, "d")
+    client.delete("/tasks/1")
+    client.put("/tasks/3", json={"completed": "complete"})
+
+    page = changes(client, start)
+    assert summary(page["data"]) == [
+        (2, True, 4),
+        (4, False, 5),
+        (1, True, 6),
+        (3, False, 7),
+    ]
+    assert page["has_more"] is False
+    assert page["next_since"] == 7
+    assert page["data"][3]["completed"] == "complete"
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_feed_pages_across_limit(client, limit):
+    for name in ("a", "b", "c", "d", "e"):
+        create(client, name)
+    client.delete("/tasks/2")
+    client.put("/tasks/1", json={"name": "a2"})
+    client.delete("/tasks/4")
+    client.put("/tasks/5", json={"name": "e2"})
+
+    full, token = read_feed(client)
+    paged, paged_token = read_feed(client, limit=limit)
+    assert summary(paged) == summary(full)
+    assert paged_token == token == 9
+    revisions = [entry["revision"] for entry in paged]
+    assert revisions == sorted(set(revisions))
+    assert sorted(entry["task_id"] for entry in paged) == [1, 2, 3, 4, 5]
+
+    first = changes(client, limit=limit)
+    assert first["has_more"] is True
+    assert first["next_since"] == first["data"][-1]["revision"]
+
+
+def test_feed_after_delete_and_reinsert(client, database):
+    task_id = create(client, "a")
+    before_delete = changes(client)["next_since"]
+    client.delete(f"/tasks/{task_id}")
+    after_delete = changes(client)["next_since"]
+    assert summary(changes(client, before_delete)["data"]) == [
+        (task_id, True, after_delete)
+    ]
+
+    # Restores and imports can bring an id back
+    conn = sqlite3.connect(database)
+    query = "INSERT INTO tasks (task_id, name) VALUES (?, 'a')"
+    conn.execute(query, (task_id,))
+    conn.commit()
+    conn.close()
+    response_cache.bump()
+
+    expected = [(task_id, False, after_delete + 1)]
+    assert summary(changes(client, before_delete)["data"]) == expected
+    assert summary(changes(client, after_delete)["data"]) == expected
+
+
+def test_feed_without_changes(client):
+    create(client, "a")
+    page = changes(client)
+    idle = changes(client, page["next_since"])
+    assert idle["data"] == []
+    assert idle["has_more"] is False
+    assert idle["next_since"] == page["next_since"]
+    assert idle["epoch"] == page["epoch"]
+
+
+def test_feed_of_migrated_v0_database(client, v0_database):
+    entries, token = read_feed(client, limit=2)
+    assert [entry["task_id"] for entry in entries] == [
+        task_id for task_id, *_ in V0_TASKS
+    ]
+    assert not any(entry["deleted"] for entry in entries)
+    assert all(entry["updated_at"] for entry in entries)
+    assert token == entries[-1]["revision"]
+
+    task_id = create(client, "new")
+    page = changes(client, token)
+    assert summary(page["data"]) == [(task_id, False, token + 1)]
@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+from app import app
+from app.routes import build_task_query, name_prefix_bound
+from database.migrations import migrate
+
+
+@pytest.fixture
+def tasks(client):
+    client.post(
+        "/tasks/bulk",
+        json=[
+            {"name": "apple pie"},
+            {"name": "apricot jam"},
+            {"name": "banana bread"},
+            {"name": "Apple sauce"},
+        ],
+    )
+    client.patch(
+        "/tasks/bulk",
+        json=[{"task_id": 2, "completed": "complete"}],
+    )
+    return client
+
+
+def names(client, query):
+    response = client.get(f"/tasks?{query}")
+    assert response.status_code == 200
+    return [task["name"] for task in response.get_json()["data"]]
+
+
+def test_filter_by_completed(tasks):
+    assert names(tasks, "completed=complete") == ["apricot jam"]
+    assert names(tasks, "completed=incomplete") == [
+        "apple pie",
+        "banana bread",
+        "Apple sauce",
+    ]
+
+
+def test_filter_by_name_prefix(tasks):
+    assert names(tasks, "name_prefix=ap") == ["apple pie", "apricot jam"]
+    assert names(tasks, "name_prefix=App") == ["Apple sauce"]
+    assert names(tasks, "name_prefix=zz") == []
+
+
+def test_filters_combine_with_paging(tasks):
+    query = "name_prefix=ap&completed=incomplete&limit=5"
+    assert names(tasks, query) == ["apple pie"]
+    body = tasks.get("/tasks?completed=incomplete&limit=2").get_json()
+    assert body["next_cursor"] == 3
+    after = "completed=incomplete&limit=2&after=3"
+    assert names(tasks, after) == ["Apple sauce"]
+
+
+def test_filters_apply_to_streams(tasks):
+    response = tasks.get("/tasks?stream=ndjson&completed=complete")
+    assert response.get_data(as_text=True).count("\n") == 1
+
+
+def test_unknown_completed_value_is_rejected(client):
+    response = client.get("/tasks?completed=done")
+    assert response.status_code == 400
+    assert "completed must be one of" in response.get_json()["message"]
+
+
+def test_name_prefix_bound():
+    assert name_prefix_bound("ab") == "ac"
+    assert name_prefix_bound("a\U0010ffff") is None
+
+
+@pytest.fixture
+def conn(database):
+    conn = sqlite3.connect(database)
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def query_plan(conn, url, after=None):
+    with app.test_request_context(url):
+        query, params = build_task_query(after)
+    rows = conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+    return " ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "url, after",
+    [
+        ("/tasks?completed=complete", None),
+        ("/tasks?completed=incomplete", 10),
+        ("/tasks?completed=incomplete&order=desc", 10),
+    ],
+)
+def test_completed_filter_pages_through_its_index(conn, url, after):
+    plan = query_plan(conn, url, after)
+    assert "USING INDEX idx_tasks_completed" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_name_prefix_searches_the_name_index(conn):
+    plan = query_plan(conn, "/tasks?name_prefix=ap")
+    assert "USING INDEX idx_tasks_name (name>? AND name<?)" in plan
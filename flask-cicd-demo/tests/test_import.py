@@ -0,0 +1,170 @@
+import json
+
+import pytest
+
+NDJSON = "application/x-ndjson"
+
+
+def post_import(client, body, content_type=NDJSON, query=""):
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    response = client.post(
+        f"/tasks/import{query}",
+        data=body,
+        content_type=content_type,
+    )
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def all_tasks(client):
+    return client.get("/tasks").get_json()["data"]
+
+
+def ndjson(*items):
+    return "".join(json.dumps(item) + "\n" for item in items)
+
+
+def test_ndjson_import_creates_tasks(client):
+    body = ndjson(
+        {"name": "one"},
+        {"name": "two", "description": "second", "completed": "complete"},
+    )
+    report = post_import(client, body)
+    assert report["message"] == "processed task import"
+    assert (report["imported"], report["failed"]) == (2, 0)
+    assert all_tasks(client) == [
+        {
+            "task_id": 1,
+            "name": "one",
+            "description": "",
+            "completed": "incomplete",
+        },
+        {
+            "task_id": 2,
+            "name": "two",
+            "description": "second",
+            "completed": "complete",
+        },
+    ]
+
+
+def test_ndjson_import_reports_bad_lines(client):
+    body = (
+        ndjson({"name": "good"})
+        + "{not json\n"
+        + "\n"
+        + ndjson({"description": "no name"})
+        + ndjson({"name": "x", "completed": "done"})
+        + ndjson({"name": "also good"})
+    )
+    report = post_import(client, body)
+    assert (report["imported"], report["failed"]) == (2, 3)
+    lines = [error["line"] for error in report["errors"]]
+    assert lines == [2, 4, 5]
+    messages = [error["message"] for error in report["errors"]]
+    assert messages[0].startswith("invalid JSON: ")
+    assert "completed must be one of" in messages[2]
+    assert [task["name"] for task in all_tasks(client)] == [
+        "good",
+        "also good",
+    ]
+
+
+def test_ndjson_import_reports_invalid_utf8(client):
+    body = ndjson({"name": "fine"}).encode() + b'{"name": "\xff"}\n'
+    report = post_import(client, body)
+    assert (report["imported"], report["failed"]) == (1, 1)
+    assert report["errors"] == [{"line": 2, "message": "invalid UTF-8"}]
+
+
+def test_csv_import_reports_bad_records(client):
+    body = (
+        "name,description,completed\r\n"
+        "first,plain,complete\r\n"
+        ',"no name",\r\n'
+        'second,"spans\r\ntwo lines",\r\n'
+        "third,,maybe\r\n"
+    )
+    report = post_import(client, body, "text/csv")
+    assert (report["imported"], report["failed"]) == (2, 2)
+    assert [error["line"] for error in report["errors"]] == [3, 6]
+    tasks = all_tasks(client)
+    assert [task["name"] for task in tasks] == ["first", "second"]
+    assert tasks[1]["description"] == "spans\r\ntwo lines"
+
+
+def test_csv_import_reports_invalid_utf8(client):
+    body = b"name\r\nok\r\nbad \xfe\r\nfine\r\n"
+    report = post_import(client, body, "text/csv")
+    assert (report["imported"], report["failed"]) == (2, 1)
+    assert report["errors"] == [{"line": 3, "message": "invalid UTF-8"}]
+
+
+def test_empty_csv_imports_nothing(client):
+    report = post_import(client, b"", "text/csv")
+    assert (report["imported"], report["failed"]) == (0, 0)
+
+
+def test_format_argument_overrides_content_type(client):
+    body = "name\r\nfrom query\r\n"
+    report = post_import(client, body, "text/plain", "?format=csv")
+    assert report["imported"] == 1
+
+
+def test_import_needs_a_known_format(client):
+    response = client.post(
+        "/tasks/import",
+        data=b'{"name": "x"}\n',
+        content_type="application/json",
+    )
+    assert response.status_code == 415
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_then_import_keeps_ids(client, fmt):
+    tasks = [{"name": "a"}, {"name": "b", "description": "x,y"}, {"name": "c"}]
+    client.post("/tasks/bulk", json=tasks)
+    client.delete("/tasks/2")
+    client.put("/tasks/3", json={"completed": "complete"})
+    exported = client.get(f"/tasks/export?format={fmt}")
+    disposition = exported.headers["Content-Disposition"]
+    assert disposition == f"attachment; filename=tasks.{fmt}"
+    before = all_tasks(client)
+
+    client.put("/tasks/1", json={"name": "changed"})
+    client.post("/tasks", json={"name": "extra"})
+    content_type = exported.mimetype
+    report = post_import(
+        client,
+        exported.get_data(),
+        content_type,
+        "?keep_ids=1",
+    )
+    assert (report["imported"], report["failed"]) == (2, 0)
+    # Exported rows replace their task; tasks added since are kept
+    after = all_tasks(client)
+    assert after[:2] == before
+    assert [task["name"] for task in after[2:]] == ["extra"]
+
+
+def test_keep_ids_requires_positive_ids(client):
+    body = ndjson(
+        {"task_id": 7, "name": "kept"},
+        {"name": "no id"},
+        {"task_id": 0, "name": "zero"},
+        {"task_id": "8", "name": "string id"},
+    )
+    report = post_import(client, body, query="?keep_ids=true")
+    assert (report["imported"], report["failed"]) == (2, 2)
+    message = "task_id must be a positive integer"
+    assert report["errors"] == [
+        {"line": 2, "message": message},
+        {"line": 3, "message": message},
+    ]
+    assert [task["task_id"] for task in all_tasks(client)] == [7, 8]
+
+
+def test_unknown_export_format_is_rejected(client):
+    response = client.get("/tasks/export?format=xml")
+    assert response.status_code == 400
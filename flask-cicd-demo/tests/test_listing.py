@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def task_ids(client):
+    response = client.post(
+        "/tasks/bulk",
+        json=[{"name": f"task {i}"} for i in range(7)],
+    )
+    assert response.status_code == 200
+    return [result["task_id"] for result in response.get_json()["results"]]
+
+
+def page_ids(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    body = response.get_json()
+    return [task["task_id"] for task in body["data"]], body["next_cursor"]
+
+
+def test_unpaginated_listing_has_no_cursor(client, task_ids):
+    body = client.get("/tasks").get_json()
+    assert [task["task_id"] for task in body["data"]] == task_ids
+    assert "next_cursor" not in body
+    assert client.get("/").get_json() == body
+
+
+def test_cursor_pages_cover_every_task_once(client, task_ids):
+    seen = []
+    ids, cursor = page_ids(client, "/tasks?limit=3")
+    seen.extend(ids)
+    while cursor is not None:
+        ids, cursor = page_ids(client, f"/tasks?limit=3&after={cursor}")
+        seen.extend(ids)
+    assert seen == task_ids
+
+
+def test_cursor_is_last_id_of_a_full_page(client, task_ids):
+    ids, cursor = page_ids(client, "/tasks?limit=7")
+    assert ids == task_ids
+    assert cursor is None
+    ids, cursor = page_ids(client, "/tasks?limit=2")
+    assert cursor == ids[-1] == task_ids[1]
+
+
+def test_descending_cursor_walks_backwards(client, task_ids):
+    last = task_ids[-1]
+    ids, cursor = page_ids(client, f"/tasks?order=desc&limit=2&after={last}")
+    assert ids == [task_ids[-2], task_ids[-3]]
+    assert cursor == task_ids[-3]
+
+
+def test_offset_jumps_to_a_page(client, task_ids):
+    ids, _ = page_ids(client, "/tasks?limit=2&offset=4")
+    assert ids == task_ids[4:6]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["after=x", "limit=0", "offset=-1", "order=sideways"],
+)
+def test_bad_listing_arguments_are_rejected(client, query):
+    response = client.get(f"/tasks?{query}")
+    assert response.status_code == 400
+    assert response.get_json()["message"]
+
+
+def test_stream_json_is_one_array(client, task_ids):
+    response = client.get("/tasks?stream=json")
+    assert response.mimetype == "application/json"
+    tasks = json.loads(response.get_data(as_text=True))
+    assert [task["task_id"] for task in tasks] == task_ids
+
+
+def test_stream_json_of_no_tasks_is_empty(client):
+    response = client.get("/tasks?stream=json")
+    assert json.loads(response.get_data(as_text=True)) == []
+
+
+def test_stream_ndjson_is_one_task_per_line(client, task_ids):
+    response = client.get("/tasks?stream=ndjson&after=2")
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    tasks = [json.loads(line) for line in lines]
+    assert [task["task_id"] for task in tasks] == task_ids[2:]
+    assert tasks[0] == {
+        "task_id": task_ids[2],
+        "name": "task 2",
+        "description": "",
+        "completed": "incomplete",
+    }
+
+
+def test_stream_csv_has_header_and_rows(client, task_ids):
+    response = client.get("/tasks?stream=csv&order=desc")
+    assert response.mimetype == "text/csv"
+    text = response.get_data(as_text=True)
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [int(row["task_id"]) for row in rows] == task_ids[::-1]
+    assert rows[0]["name"] == "task 6"
+
+
+def test_unknown_stream_format_is_rejected(client):
+    response = client.get("/tasks?stream=xml")
+    assert response.status_code == 400
+    assert "stream must be one of" in response.get_json()["message"]
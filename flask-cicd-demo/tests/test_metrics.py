@@ -0,0 +1,126 @@
+import logging
+import sqlite3
+
+import pytest
+
+from app.metrics import (
+    MetricsRegistry,
+    connection_factory,
+    format_labels,
+    statement_template,
+)
+
+
+def sample(text, name, **labels):
+    """Value of one series in rendered metrics, or None if absent."""
+    prefix = name + format_labels(tuple(sorted(labels.items()))) + " "
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return response.get_data(as_text=True)
+
+
+def test_statement_template_collapses_placeholder_lists():
+    sql = "SELECT task_id FROM tasks\n   WHERE task_id IN (?, ?,?)"
+    assert statement_template(sql) == (
+        "SELECT task_id FROM tasks WHERE task_id IN (?, ...)"
+    )
+
+
+def test_format_labels_escapes_values():
+    labels = (("route", 'a"b\\c\nd'),)
+    assert format_labels(labels) == '{route="a\\"b\\\\c\\nd"}'
+    assert format_labels(()) == ""
+
+
+def test_registry_renders_counters_and_histograms():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.inc("todo_http_requests_total", status="200")
+    registry.inc("todo_http_requests_total", 2, status="200")
+    registry.observe("todo_db_connection_acquire_seconds", 0.05)
+    registry.observe("todo_db_connection_acquire_seconds", 0.5)
+    registry.observe("todo_db_connection_acquire_seconds", 5)
+    text = registry.render()
+    assert "# TYPE todo_http_requests_total counter" in text
+    assert sample(text, "todo_http_requests_total", status="200") == 3
+    name = "todo_db_connection_acquire_seconds"
+    assert f"# TYPE {name} histogram" in text
+    assert sample(text, f"{name}_bucket", le="0.1") == 1
+    assert sample(text, f"{name}_bucket", le="1.0") == 2
+    assert sample(text, f"{name}_bucket", le="+Inf") == 3
+    assert sample(text, f"{name}_count") == 3
+    assert sample(text, f"{name}_sum") == pytest.approx(5.55)
+
+
+def test_metrics_endpoint_counts_requests_by_route(client):
+    labels = {"method": "GET", "route": "/tasks/<int:task_id>"}
+    name = "todo_http_requests_total"
+    before = sample(scrape(client), name, status="404", **labels) or 0
+    assert client.get("/tasks/41").status_code == 404
+    assert client.get("/tasks/42").status_code == 404
+    response = client.get("/metrics")
+    assert response.mimetype == "text/plain"
+    assert response.mimetype_params["version"] == "0.0.4"
+    text = response.get_data(as_text=True)
+    assert sample(text, name, status="404", **labels) == before + 2
+    duration = "todo_http_request_duration_seconds"
+    assert f"# TYPE {duration} histogram" in text
+    assert sample(text, f"{duration}_count", **labels) >= 2
+
+
+def test_metrics_endpoint_reports_database_timings(client):
+    client.post("/tasks", json={"name": "measured"})
+    client.get("/tasks")
+    text = scrape(client)
+    statement = "SELECT * FROM tasks ORDER BY task_id ASC"
+    name = "todo_db_query_duration_seconds"
+    assert sample(text, f"{name}_count", statement=statement) >= 1
+    rows = sample(text, "todo_db_query_rows_total", statement=statement)
+    assert rows >= 1
+    assert sample(text, "todo_db_connection_acquire_seconds_count") >= 1
+
+
+@pytest.fixture
+def instrumented():
+    registry = MetricsRegistry()
+    logger = logging.getLogger("tests.metrics")
+    factory = connection_factory(registry, logger, slow_query_ms=0)
+    conn = sqlite3.connect(":memory:", factory=factory)
+    cursor = conn.cursor()
+    cursor.execute("CREATE TABLE t (x INTEGER)")
+    yield cursor, registry
+    conn.close()
+
+
+def test_connection_counts_rows_and_errors(instrumented):
+    cursor, registry = instrumented
+    insert = "INSERT INTO t VALUES (?)"
+    cursor.executemany(insert, [(1,), (2,), (3,)])
+    cursor.execute("SELECT x FROM t").fetchall()
+    with pytest.raises(sqlite3.OperationalError):
+        cursor.execute("SELECT y FROM t")
+    text = registry.render()
+    assert sample(text, "todo_db_query_rows_total", statement=insert) == 3
+    select = "SELECT x FROM t"
+    assert sample(text, "todo_db_query_rows_total", statement=select) == 3
+    errors = sample(
+        text,
+        "todo_db_query_errors_total",
+        error="OperationalError",
+        statement="SELECT y FROM t",
+    )
+    assert errors == 1
+
+
+def test_connection_logs_slow_queries(instrumented, caplog):
+    cursor, _ = instrumented
+    with caplog.at_level(logging.WARNING, logger="tests.metrics"):
+        cursor.execute("SELECT count(*) FROM t")
+    assert "slow query" in caplog.text
+    assert "SELECT count(*) FROM t" in caplog.text
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from database import migrations
+from database.migrations import SCHEMA_VERSION, get_schema_version, migrate
+from database.schema import SCHEMA
+from database.setup_db import create_table
+from tests.conftest import V0_TASKS
+
+
+def table_names(conn):
+    query = "SELECT name FROM sqlite_master WHERE type = 'table'"
+    return {row[0] for row in conn.execute(query)}
+
+
+def test_migrates_a_new_database(database):
+    conn = sqlite3.connect(database)
+    assert migrate(conn) is True
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert set(SCHEMA) <= table_names(conn)
+    conn.close()
+
+
+def test_current_database_runs_no_ddl(database):
+    conn = sqlite3.connect(database)
+    migrate(conn)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    assert migrate(conn) is False
+    assert statements == ["PRAGMA user_version"]
+    conn.close()
+
+
+def test_migrates_a_v0_database(v0_database):
+    conn = sqlite3.connect(v0_database)
+    assert get_schema_version(conn) == 0
+    assert migrate(conn) is True
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    query = "SELECT task_id, name, description, completed FROM tasks"
+    rows = conn.execute(query + " ORDER BY task_id").fetchall()
+    assert rows == V0_TASKS
+    # Rows that predate the search index are searchable after the rebuild
+    matches = conn.execute(
+        "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'plumber'"
+    ).fetchall()
+    assert matches == [(5,)]
+    conn.close()
+
+
+def test_failed_step_rolls_back(database, monkeypatch):
+    def fail(cursor):
+        raise RuntimeError("step failed")
+
+    steps = migrations.MIGRATIONS + [fail]
+    monkeypatch.setattr(migrations, "MIGRATIONS", steps)
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", SCHEMA_VERSION + 1)
+    conn = sqlite3.connect(database)
+    with pytest.raises(RuntimeError):
+        migrate(conn)
+    assert get_schema_version(conn) == 0
+    assert table_names(conn) == set()
+    conn.close()
+
+
+def test_applies_only_pending_steps(database, monkeypatch):
+    applied = []
+    steps = migrations.MIGRATIONS + [applied.append]
+    monkeypatch.setattr(migrations, "MIGRATIONS", steps)
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", SCHEMA_VERSION + 1)
+    conn = sqlite3.connect(database)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    assert migrate(conn) is True
+    assert len(applied) == 1
+    assert get_schema_version(conn) == SCHEMA_VERSION + 1
+    # Earlier steps were skipped, so no tables were created
+    assert table_names(conn) == set()
+    conn.close()
+
+
+def test_app_migrates_on_first_request(client, database):
+    assert client.get("/health").status_code == 200
+    assert client.get("/tasks").status_code == 200
+    conn = sqlite3.connect(database)
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    conn.close()
+
+
+def schema_objects(conn):
+    query = "SELECT type, name, tbl_name FROM sqlite_master"
+    objects = set(conn.execute(query))
+    for kind, name, _ in list(objects):
+        if kind == "table":
+            columns = conn.execute(f"PRAGMA table_info({name})")
+            objects |= {("column", name, row[1]) for row in columns}
+    return objects
+
+
+def test_migrations_build_the_current_schema(database, tmp_path):
+    migrated = sqlite3.connect(database)
+    migrate(migrated)
+    expected = sqlite3.connect(str(tmp_path / "expected.db"))
+    for table, info in SCHEMA.items():
+        create_table(expected.cursor(), table, info)
+    assert schema_objects(migrated) == schema_objects(expected)
+    migrated.close()
+    expected.close()
+
+
+def test_refuses_a_newer_database(database):
+    conn = sqlite3.connect(database)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    with pytest.raises(sqlite3.DatabaseError, match="newer"):
+        migrate(conn)
+    assert table_names(conn) == set()
+    conn.close()
@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app import app
+from database.pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(database):
+    pool = ConnectionPool(database, max_size=2, timeout=0.2)
+    yield pool
+    pool.close_all()
+
+
+def test_released_connection_is_reused(pool):
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+
+def test_pragmas_are_applied(pool):
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    # NORMAL
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+    pool.release(conn)
+
+
+def test_custom_pragmas(database):
+    pool = ConnectionPool(database, pragmas={"synchronous": "FULL"})
+    conn = pool.acquire()
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    pool.release(conn)
+    pool.close_all()
+
+
+def test_acquire_times_out_when_exhausted(pool):
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(sqlite3.OperationalError, match="timed out"):
+        pool.acquire()
+    for conn in held:
+        pool.release(conn)
+
+
+def test_waiting_acquire_gets_released_connection(pool):
+    held = [pool.acquire(), pool.acquire()]
+    timer = threading.Timer(0.05, pool.release, args=(held[0],))
+    timer.start()
+    assert pool.acquire() is held[0]
+    timer.join()
+    pool.release(held[0])
+    pool.release(held[1])
+
+
+def test_broken_connection_is_replaced(pool):
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone() == (1,)
+    pool.release(replacement)
+
+
+def test_release_rolls_back_open_transaction(pool):
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    conn.commit()
+    conn.execute("INSERT INTO items (id) VALUES (1)")
+    assert conn.in_transaction
+    pool.release(conn)
+    assert not conn.in_transaction
+    assert conn.execute("SELECT count(*) FROM items").fetchone()[0] == 0
+
+
+def test_discard_frees_a_slot(pool):
+    held = [pool.acquire(), pool.acquire()]
+    pool.discard(held.pop())
+    held.append(pool.acquire())
+    for conn in held:
+        pool.release(conn)
+
+
+def test_requests_return_their_connection(client):
+    # With a single connection, a request that kept it would make the
+    # next one time out.
+    app.config.update(DB_POOL_SIZE=1, DB_TIMEOUT=0.2)
+    for _ in range(3):
+        assert client.get("/tasks").status_code == 200
+        assert client.post("/tasks", json={"name": "a"}).status_code == 201
@@ -0,0 +1,97 @@
+import pytest
+
+from app.routes import build_match_query
+
+
+@pytest.fixture
+def tasks(client):
+    client.post(
+        "/tasks/bulk",
+        json=[
+            {"name": "paint fence", "description": "garden"},
+            {"name": "garden party", "description": "garden garden garden"},
+            {"name": "buy paint", "description": "red, not blue"},
+            {"name": "fix gate", "description": 'the "old" gate'},
+        ],
+    )
+    return client
+
+
+def search(client, query):
+    response = client.get("/tasks/search", query_string={"q": query})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def names(client, query):
+    return [task["name"] for task in search(client, query)["data"]]
+
+
+@pytest.mark.parametrize(
+    "text, match",
+    [
+        ("paint", '"paint"'),
+        ("pai*", '"pai"*'),
+        ('say "hi"', '"say" """hi"""'),
+        ("a OR b", '"a" "OR" "b"'),
+        ("* **", ""),
+    ],
+)
+def test_build_match_query_quotes_each_term(text, match):
+    assert build_match_query(text) == match
+
+
+def test_search_matches_name_and_description(tasks):
+    assert sorted(names(tasks, "paint")) == ["buy paint", "paint fence"]
+    assert names(tasks, "blue") == ["buy paint"]
+
+
+def test_search_ranks_better_matches_first(tasks):
+    assert names(tasks, "garden") == ["garden party", "paint fence"]
+
+
+def test_search_terms_must_all_match(tasks):
+    assert names(tasks, "paint garden") == ["paint fence"]
+
+
+def test_search_prefix_term(tasks):
+    assert sorted(names(tasks, "gar*")) == ["garden party", "paint fence"]
+    assert names(tasks, "gar") == []
+
+
+@pytest.mark.parametrize(
+    "query",
+    ['"old', "NOT", "paint OR", "-paint", "name:fence", "a AND (b", "NEAR("],
+)
+def test_search_syntax_is_taken_literally(tasks, query):
+    search(tasks, query)
+
+
+def test_search_quoted_words(tasks):
+    assert names(tasks, '"old"') == ["fix gate"]
+
+
+def test_search_pages_by_offset(tasks):
+    page = tasks.get("/tasks/search?q=garden&limit=1").get_json()
+    assert [task["name"] for task in page["data"]] == ["garden party"]
+    assert page["next_offset"] == 1
+    url = f"/tasks/search?q=garden&limit=1&offset={page['next_offset']}"
+    page = tasks.get(url).get_json()
+    assert [task["name"] for task in page["data"]] == ["paint fence"]
+    assert page["next_offset"] is None
+
+
+def test_search_sees_updates(tasks):
+    assert names(tasks, "fence") == ["paint fence"]
+    tasks.put("/tasks/1", json={"name": "paint shed"})
+    assert names(tasks, "fence") == []
+    assert names(tasks, "shed") == ["paint shed"]
+    tasks.delete("/tasks/1")
+    assert names(tasks, "shed") == []
+
+
+@pytest.mark.parametrize("query", ["", "q=", "q=%20*%20"])
+def test_search_requires_a_query(client, query):
+    response = client.get(f"/tasks/search?{query}")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "q is required"